@@ -1,19 +1,639 @@
 # Made by Frank Lochtenberg
 # Version 8
 
+import argparse
+import array
+import bisect
+import collections
+import concurrent.futures
+import cProfile
+import functools
+import gzip
+import hashlib
+import io
+import itertools
+import json
+import mmap
+import multiprocessing
+import os
+import platform
+import pstats
+import queue
+import random
 import re
-import matplotlib.pyplot as plt
-import tkinter
-from tkinter import messagebox
+import shutil
+import signal
+import socket
+import struct
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zlib
 
+# tkinter and matplotlib are only imported when the GUI or a diagram is
+# used, see _import_tkinter() and _import_pyplot(), so the headless mode
+# also works on computers without a display.
+tkinter = None
+plt = None
 
-def read_fasta():
+VERSION = "8"
+
+FASTA_FILE = "Caenorhabditis_elegans.cds_pep.all.fa"
+GFF3_FILE = "Caenorhabditis_elegans.gff3"
+
+# Size of the read buffer, so the files are read in large chunks
+# instead of many small reads.
+READ_BUFFER_SIZE = 1024 * 1024
+
+# Gff3 files smaller than this are counted in this process, because
+# starting the worker processes would take longer than the counting.
+PARALLEL_MIN_SIZE = 8 * 1024 * 1024
+
+# The zinc finger consensus, compiled once for every scan.
+ZINC_FINGER_PATTERN = re.compile(r"C[A-Z]{2}C[A-Z]{2}C[A-Z]{5}C[A-Z]{2}"
+                                 r"C[A-Z]{2}C")
+
+# The zinc finger consensus for sequences stored as bytes.
+ZINC_FINGER_PATTERN_BYTES = re.compile(
+    ZINC_FINGER_PATTERN.pattern.encode())
+
+# The number of sequences sent to a worker process at once.
+CONSENSUS_BATCH_SIZE = 2000
+
+# The number of lines or records between two progress reports, and the
+# number of milliseconds between two updates of the progress in the GUI.
+PROGRESS_EVERY = 10000
+PROGRESS_INTERVAL = 100
+
+# The directory with the cached parse results, the version of the
+# cache format and the first bytes of a cache file. Caches with another
+# version are ignored.
+CACHE_DIR = ".parse_cache"
+CACHE_VERSION = 3
+CACHE_MAGIC = b"PARSEC01"
+
+# The size of the blocks from the start, middle and end of a file that
+# are hashed to notice changes in the content of the file.
+FINGERPRINT_BLOCK_SIZE = 1024 * 1024
+
+# The highest number of sequences in the memo of the consensus scans,
+# see ScanMemo.
+SCAN_MEMO_SIZE = 200000
+
+# The size of the random blocks of the sampling mode, the number of
+# blocks of its first estimate, the size of its reservoir sample of a
+# compressed file and the number of standard errors of its confidence
+# intervals (95%).
+SAMPLE_BLOCK_SIZE = 64 * 1024
+SAMPLE_REPORT_BLOCKS = 16
+SAMPLE_RESERVOIR_SIZE = 100000
+SAMPLE_Z = 1.96
+
+# The TCP port of the GenomeServer when no Unix socket is given.
+SERVER_PORT = 8765
+
+# The first bytes of the columns file of a gff3 file, see Gff3Columns.
+COLUMNS_MAGIC = b"GFF3COL1"
+
+# The first bytes of a gzip file, and the number of BGZF blocks per
+# decompression thread that are read ahead.
+GZIP_MAGIC = b"\x1f\x8b"
+BGZF_READ_AHEAD = 4
+
+# The sizes of the synthetic genomes for the benchmark, as the number
+# of genes: about a worm, a human and ten times a human.
+BENCHMARK_SCALES = {"tiny": 500, "worm": 20000, "human": 40000,
+                    "10x-human": 400000}
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+CHROMOSOMES = ["I", "II", "III", "IV", "V", "X"]
+
+# One element of a PROSITE pattern, like C, x(2,4), [LIVM] or {P}(3).
+PROSITE_ELEMENT = re.compile(r"^([A-Zx]|\[[A-Z]+\]|\{[A-Z]+\})"
+                             r"(?:\((\d+)(?:,(\d+))?\))?$")
+
+# One occurrence of a motif in an amino acid sequence, start and end
+# are 0-based and end is exclusive.
+MotifHit = collections.namedtuple("MotifHit",
+                                  ["name", "start", "end", "peptide"])
+
+# One feature of the gff3 file, start and end are 1-based and end is
+# inclusive like in the gff3 file. The name is the ID or else the
+# Parent of the feature.
+GffFeature = collections.namedtuple("GffFeature",
+                                    ["seqid", "start", "end", "type",
+                                     "strand", "name"])
+
+# A motif hit mapped to the genome. start and end are the 0-based,
+# end exclusive amino acid range in the protein, blocks is the list of
+# the 1-based, inclusive genomic (start, end) of every CDS part of the
+# hit, from low to high.
+GenomicHit = collections.namedtuple("GenomicHit",
+                                    ["protein", "motif", "start", "end",
+                                     "peptide", "seqid", "strand",
+                                     "blocks"])
+
+# A region like "III:1,200,000-1,350,000" or "chrIII:1200000-1350000".
+REGION_PATTERN = re.compile(r"^(.+):([\d,]+)-([\d,]+)$")
+
+# The average masses of the amino acid residues in Dalton, in the order
+# of AMINO_ACIDS, the mass of the water of a whole protein and the
+# hydrophobic amino acids.
+RESIDUE_MASSES = (71.0788, 103.1388, 115.0886, 129.1155, 147.1766,
+                  57.0519, 137.1411, 113.1594, 128.1741, 113.1594,
+                  131.1926, 114.1038, 97.1167, 128.1307, 156.1875,
+                  87.0782, 101.1051, 99.1326, 186.2132, 163.1760)
+WATER_MASS = 18.01528
+HYDROPHOBIC_AMINO_ACIDS = "AILMFVW"
+
+# The number of residues which are counted or scored at once in
+# sequence_statistics() and scan_pssm(), this limits the size of the
+# temporary arrays.
+STATISTICS_BATCH_SIZE = 4 * 1024 * 1024
+
+# The zinc finger consensus for the scoring matrix of scan_pssm(), x is
+# any amino acid. The threshold allows one of the six cysteines to be
+# another amino acid.
+ZINC_FINGER_CONSENSUS = "CxxCxxCxxxxxCxxCxxC"
+PSSM_THRESHOLD = 5.0
+
+# The longest peptide k-mers which are counted, the counts of all 20^5
+# k-mers of this length take 25 MB.
+KMER_MAX_K = 5
+
+# One window of a protein which scored at least the threshold in
+# scan_pssm(), record is the number of the protein in the
+# SequenceStore and start is 0-based.
+PssmHit = collections.namedtuple("PssmHit",
+                                 ["record", "start", "score", "peptide"])
+
+
+# The instrumentation of the running program, None when it is disabled.
+# It is enabled with enable_instrumentation().
+_instrumentation = None
+
+
+def peak_rss():
+    """ Returns the highest resident memory of this process so far.
+
+    :return: the peak resident memory in bytes, or None when the
+    resource-module is not there, like on Windows.
+    """
+    try:
+        import resource
+    except ModuleNotFoundError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux gives kilobytes, macOS gives bytes
+    if platform.system() == "Darwin":
+        return peak
+    return peak * 1024
+
+
+class _Stage:
+    """One running stage of the Instrumentation, which records its
+    times when it stops. The number of items the stage handled can be
+    set on the object.
+
+    """
+
+    def __init__(self, instrumentation, name):
+        """ Converting the instrumentation and the name of the stage
+        into an object.
+
+        :param instrumentation: the Instrumentation the stage belongs
+        to.
+        :param name: the name of the stage, like "read_fasta".
+        """
+        self.instrumentation = instrumentation
+        self.name = name
+        self.items = None
+        self.profile = None
+        self.trace_memory = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """ Starts the clocks of the stage, and cProfile or tracemalloc
+        when this is the stage to profile.
+
+        :return: nothing
+        """
+        instrumentation = self.instrumentation
+        if self.name == instrumentation.profile_stage and \
+                not instrumentation.profiling:
+            instrumentation.profiling = True
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        if self.name == instrumentation.memory_stage and \
+                not tracemalloc.is_tracing():
+            self.trace_memory = True
+            tracemalloc.start()
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+
+    def stop(self):
+        """ Stops the clocks of the stage and records the results in the
+        instrumentation.
+
+        :return: nothing
+        """
+        ended = time.perf_counter()
+        record = {"stage": self.name,
+                  "start_seconds": self.started -
+                  self.instrumentation.started,
+                  "wall_seconds": ended - self.started,
+                  "cpu_seconds": time.process_time() - self.cpu_started,
+                  "peak_rss_bytes": peak_rss(),
+                  "items": self.items,
+                  "pid": os.getpid(),
+                  "thread": threading.get_ident()}
+        if self.profile is not None:
+            self.profile.disable()
+            self.instrumentation.profiling = False
+            record["profile"] = _profile_table(self.profile)
+        if self.trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            record["traced_peak_bytes"] = \
+                tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            record["allocations"] = [
+                {"line": str(statistic.traceback),
+                 "bytes": statistic.size,
+                 "blocks": statistic.count}
+                for statistic in snapshot.statistics("lineno")[:10]]
+        self.instrumentation.add(record)
+
+
+def _profile_table(profile, limit=25):
+    """ Turns the cProfile results of a stage into a list which can be
+    written as JSON.
+
+    :param profile: a disabled cProfile.Profile object.
+    :param limit: the number of functions to keep.
+    :return: list of dictionaries of the functions with the highest
+    cumulative time.
+    """
+    statistics = pstats.Stats(profile)
+    functions = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in \
+            statistics.stats.items():
+        functions.append({"function": "%s:%d(%s)" % (
+                              os.path.basename(filename), line, function),
+                          "calls": calls,
+                          "own_seconds": own,
+                          "cumulative_seconds": cumulative})
+    functions.sort(key=lambda function: function["cumulative_seconds"],
+                   reverse=True)
+    return functions[:limit]
+
+
+class Instrumentation:
+    """Records the wall time, CPU time, peak resident memory and number
+    of items of every stage of the program, to find out where the time
+    of a slow run goes. The CPU time is the time of the whole process,
+    the worker processes are not counted. The stages of another process,
+    like the gff3 process of load_genome(), are added with merge().
+
+    """
+
+    def __init__(self, profile_stage=None, memory_stage=None):
+        """ Makes an instrumentation without stages.
+
+        :param profile_stage: the name of a stage which is run with
+        cProfile, default is none.
+        :param memory_stage: the name of a stage which is run with
+        tracemalloc, default is none.
+        """
+        self.profile_stage = profile_stage
+        self.memory_stage = memory_stage
+        self.profiling = False
+        self.started = time.perf_counter()
+        # The clock time of the start, to line up the stages of other
+        # processes
+        self.epoch = time.time()
+        self.stages = []
+        self.lock = threading.Lock()
+
+    def stage(self, name):
+        """ Makes a stage, which is started with start() or a with
+        statement.
+
+        :param name: the name of the stage.
+        :return: a _Stage object.
+        """
+        return _Stage(self, name)
+
+    def add(self, record):
+        """ Adds the results of a finished stage.
+
+        :param record: dictionary with the results of the stage.
+        :return: nothing
+        """
+        with self.lock:
+            self.stages.append(record)
+
+    def merge(self, report):
+        """ Adds the stages of the instrumentation of another process.
+
+        :param report: the report() of the other process.
+        :return: nothing
+        """
+        shift = report["epoch"] - self.epoch
+        with self.lock:
+            for record in report["stages"]:
+                record = dict(record)
+                record["start_seconds"] += shift
+                self.stages.append(record)
+
+    def report(self):
+        """ Returns the results of all finished stages.
+
+        :return: dictionary which can be written as JSON.
+        """
+        with self.lock:
+            stages = sorted(self.stages,
+                            key=lambda stage: stage["start_seconds"])
+        return {"version": VERSION,
+                "python": platform.python_version(),
+                "pid": os.getpid(),
+                "epoch": self.epoch,
+                "wall_seconds": time.perf_counter() - self.started,
+                "peak_rss_bytes": peak_rss(),
+                "stages": stages}
+
+    def write_report(self, filename):
+        """ Writes the results as a JSON file.
+
+        :param filename: name of the JSON file.
+        :return: nothing
+        """
+        with open(filename, "w") as output:
+            json.dump(self.report(), output, indent=2)
+
+    def write_trace(self, filename):
+        """ Writes the stages as a trace file in the Chrome trace event
+        format, which can be opened in chrome://tracing or Perfetto.
+
+        :param filename: name of the trace file.
+        :return: nothing
+        """
+        report = self.report()
+        events = []
+        for stage in report["stages"]:
+            events.append({"name": stage["stage"],
+                           "ph": "X",
+                           "ts": stage["start_seconds"] * 1e6,
+                           "dur": stage["wall_seconds"] * 1e6,
+                           "pid": stage.get("pid", report["pid"]),
+                           "tid": stage["thread"],
+                           "args": {"cpu_seconds": stage["cpu_seconds"],
+                                    "peak_rss_bytes":
+                                        stage["peak_rss_bytes"],
+                                    "items": stage["items"]}})
+        with open(filename, "w") as output:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"},
+                      output)
+
+
+class _NoStage:
+    """The stage which is used when the instrumentation is disabled, it
+    does nothing.
+
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+_NO_STAGE = _NoStage()
+
+
+def enable_instrumentation(profile_stage=None, memory_stage=None):
+    """ Starts recording the stages of the program.
+
+    :param profile_stage: the name of a stage which is run with
+    cProfile, default is none.
+    :param memory_stage: the name of a stage which is run with
+    tracemalloc, default is none.
+    :return: the Instrumentation object.
+    """
+    global _instrumentation
+    _instrumentation = Instrumentation(profile_stage, memory_stage)
+    return _instrumentation
+
+
+def disable_instrumentation():
+    """ Stops recording the stages of the program.
+
+    :return: the Instrumentation object with the recorded stages, or
+    None when it was not enabled.
+    """
+    global _instrumentation
+    instrumentation = _instrumentation
+    _instrumentation = None
+    return instrumentation
+
+
+def stage(name):
+    """ Returns a stage of the instrumentation, for a with statement
+    around a part of a function. When the instrumentation is disabled
+    the same stage which does nothing is returned every time.
+
+    :param name: the name of the stage.
+    :return: a _Stage or _NoStage object.
+    """
+    if _instrumentation is None:
+        return _NO_STAGE
+    return _instrumentation.stage(name)
+
+
+def instrumented(name, items=None):
+    """ Makes a decorator which records every call of a function as a
+    stage. When the instrumentation is disabled the function is called
+    directly.
+
+    :param name: the name of the stage.
+    :param items: function which gets the result of the function and
+    returns the number of items, default is no number.
+    :return: the decorator.
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _instrumentation is None:
+                return function(*args, **kwargs)
+            with _instrumentation.stage(name) as record:
+                result = function(*args, **kwargs)
+                if items is not None and result is not None:
+                    record.items = items(result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _is_bgzf(header):
+    """ Checks if the first bytes of a gzip file are the header of a
+    BGZF block, which is a gzip member with a "BC" extra field.
+
+    :param header: the first 18 bytes of the file.
+    :return: True when the file is BGZF, otherwise False.
+    """
+    return (len(header) >= 18 and header[:2] == GZIP_MAGIC and
+            header[3] & 4 and header[12:14] == b"BC")
+
+
+def is_compressed(filename):
+    """ Checks if a file is compressed with gzip or bgzip.
+
+    :param filename: name of the file.
+    :return: True when the file is compressed, otherwise False.
+    """
+    with open(filename, "rb") as handle:
+        return handle.read(2) == GZIP_MAGIC
+
+
+def _iter_bgzf_blocks(handle):
+    """ Reads the BGZF blocks of a file one by one, without
+    decompressing them.
+
+    :param handle: the BGZF file opened in binary mode.
+    :return: generator of the raw deflate data of every block.
+    """
+    while True:
+        header = handle.read(12)
+        if not header:
+            return
+        if len(header) < 12 or header[:2] != GZIP_MAGIC:
+            raise ValueError("The file is not a valid BGZF file.")
+        extra_length = struct.unpack("<H", header[10:12])[0]
+        extra = handle.read(extra_length)
+        block_size = None
+        position = 0
+        while position + 4 <= len(extra):
+            field_id = extra[position:position + 2]
+            field_length = struct.unpack(
+                "<H", extra[position + 2:position + 4])[0]
+            if field_id == b"BC":
+                block_size = struct.unpack(
+                    "<H", extra[position + 4:position + 6])[0] + 1
+            position += 4 + field_length
+        if block_size is None:
+            raise ValueError("A block of the BGZF file has no size.")
+        rest = handle.read(block_size - 12 - extra_length)
+        # The last 8 bytes are the CRC32 and the uncompressed size
+        yield rest[:-8]
+
+
+def iter_bgzf_chunks(filename, workers=None):
+    """ Decompresses a BGZF file with several threads. The blocks of a
+    BGZF file are independent, so they are decompressed at the same
+    time and returned in the original order. zlib releases the GIL
+    while it decompresses, so the threads really run in parallel.
+
+    :param filename: name of the BGZF file.
+    :param workers: the number of threads, default is the number of
+    CPUs.
+    :return: generator of decompressed chunks of bytes.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    with open(filename, "rb", buffering=READ_BUFFER_SIZE) as handle:
+        with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+            pending = collections.deque()
+            for block in _iter_bgzf_blocks(handle):
+                pending.append(pool.submit(zlib.decompress, block, -15))
+                if len(pending) >= workers * BGZF_READ_AHEAD:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+
+class _ChunkReader(io.RawIOBase):
+    """A read-only file object on top of a generator of chunks of bytes,
+    so the decompressed BGZF chunks can be read like a normal file.
+
+    """
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.chunk = b""
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while self.position >= len(self.chunk):
+            self.chunk = next(self.chunks, None)
+            self.position = 0
+            if self.chunk is None:
+                self.chunk = b""
+                return 0
+        size = min(len(buffer), len(self.chunk) - self.position)
+        buffer[:size] = self.chunk[self.position:self.position + size]
+        self.position += size
+        return size
+
+    def close(self):
+        self.chunks.close()
+        super().close()
+
+
+def open_input(filename, mode="r", workers=None):
+    """ Opens an input file for reading, plain text, gzip or bgzip. A
+    compressed file is decompressed while it is read, BGZF files with
+    several threads, so there is never a decompressed copy on disk.
+
+    :param filename: name of the file.
+    :param mode: "r" for text or "rb" for bytes.
+    :param workers: the number of threads for BGZF files, default is
+    the number of CPUs.
+    :return: a file object.
+    """
+    with open(filename, "rb") as handle:
+        header = handle.read(18)
+    if header[:2] != GZIP_MAGIC:
+        return open(filename, mode, buffering=READ_BUFFER_SIZE)
+    if _is_bgzf(header):
+        binary = io.BufferedReader(
+            _ChunkReader(iter_bgzf_chunks(filename, workers)),
+            READ_BUFFER_SIZE)
+    else:
+        binary = io.BufferedReader(gzip.open(filename, "rb"),
+                                   READ_BUFFER_SIZE)
+    if "b" in mode:
+        return binary
+    return io.TextIOWrapper(binary)
+
+
+@instrumented("read_fasta", len)
+def read_fasta(filename=FASTA_FILE):
     """ Reads the fasta file and puts the lines from the file in a list.
 
+        :param filename: name of the fasta file, may be compressed.
         :return: list of lines from the fasta file.
         """
     try:
-        fasta = open("Caenorhabditis_elegans.cds_pep.all.fa", "r")
+        fasta = open_input(filename)
         fasta_list = []
         for line in fasta:
             fasta_list.append(line)
@@ -22,13 +642,15 @@ def read_fasta():
         print("The fasta file was not found in read_fasta().")
 
 
-def read_gff3():
+@instrumented("read_gff3", len)
+def read_gff3(filename=GFF3_FILE):
     """ Reads the gff3 file and puts the lines from the file in a list.
 
+    :param filename: name of the gff3 file, may be compressed.
     :return: list of lines from the gff3 file.
     """
     try:
-        gff3 = open("Caenorhabditis_elegans.gff3", "r")
+        gff3 = open_input(filename)
         gff3_list = []
         for line in gff3:
             gff3_list.append(line)
@@ -37,6 +659,64 @@ def read_gff3():
         print("The gff3 file was not found in read_gff3().")
 
 
+def iter_fasta_offsets(filename=FASTA_FILE, progress=None):
+    """ Reads the fasta file once in large buffered chunks and yields
+    the records one at a time, together with the byte offset of the
+    header line of the record in the file.
+
+    :param filename: name of the fasta file.
+    :param progress: function which is called with the number of bytes
+    and records read every PROGRESS_EVERY records and at the end.
+    :return: generator of (offset, header, sequence) tuples, the header
+    without the ">" and the trailing newline.
+    """
+    try:
+        with open_input(filename, "rb") as fasta:
+            offset = 0
+            header_offset = 0
+            header = None
+            t_seq = []
+            records = 0
+            for line in fasta:
+                if line.startswith(b">"):
+                    if header is not None:
+                        yield (header_offset, header,
+                               b"".join(t_seq).decode())
+                        records += 1
+                        if progress is not None and \
+                                records % PROGRESS_EVERY == 0:
+                            progress(offset, records)
+                    header_offset = offset
+                    header = line[1:].strip().decode()
+                    t_seq = []
+                else:
+                    residues = line.strip()
+                    if residues:
+                        t_seq.append(residues)
+                offset += len(line)
+            if header is not None:
+                yield header_offset, header, b"".join(t_seq).decode()
+                records += 1
+            if progress is not None:
+                progress(offset, records)
+    except FileNotFoundError:
+        print("The fasta file was not found in iter_fasta_offsets().")
+
+
+def iter_fasta(filename=FASTA_FILE):
+    """ Reads the fasta file once in large buffered chunks and yields
+    the records one at a time, so only the current record is kept in
+    memory.
+
+    :param filename: name of the fasta file.
+    :return: generator of (header, sequence) tuples, the header without
+    the ">" and the trailing newline.
+    """
+    for _, header, seq in iter_fasta_offsets(filename):
+        yield header, seq
+
+
+@instrumented("fasta_header", len)
 def fasta_header(fasta_list):
     """ Puts the amino acids headers from the fasta file in a list.
 
@@ -53,6 +733,7 @@ def fasta_header(fasta_list):
         print("There was a Syntax Error in fasta_header()")
 
 
+@instrumented("fasta_seq", len)
 def fasta_seq(fasta_list):
     """ Puts the amino acid sequences from the fasta file in a list.
 
@@ -76,150 +757,2146 @@ def fasta_seq(fasta_list):
         print("There was a Syntax Error in fasta_seq()")
 
 
-def counting_exons(gff3_list):
-    """Counts the frequency of exons from the gff3 list.
+def build_fasta_index(filename=FASTA_FILE, index_filename=None):
+    """ Makes a samtools-style index (.fai) of the fasta file. For every
+    record the index has the ID (the first word of the header), the
+    length of the sequence, the byte offset of the first amino acid
+    and the number of amino acids and bytes per line.
 
-    :param gff3_list: list of lines from the gff3 file.
-    :return: An integer which is the frequency of exons in the gff3 file
+    :param filename: name of the fasta file.
+    :param index_filename: name of the index file, default is the name
+    of the fasta file with ".fai" after it.
+    :return: dictionary with the ID as key and a tuple of (length,
+    offset, line_bases, line_width) as value.
     """
-    try:
-        exon_count = 0
-        for line in gff3_list:
-            if "x" in line[11:14]:
-                exon_count += 1
-        return exon_count
-    except IndexError:
-        print("There was an Index Error in counting_exons()")
+    if is_compressed(filename):
+        raise ValueError("The fasta index needs an uncompressed fasta "
+                         "file, because it seeks to byte offsets.")
+    if index_filename is None:
+        index_filename = filename + ".fai"
+    index = {}
+    with open(filename, "rb", buffering=READ_BUFFER_SIZE) as fasta:
+        name = None
+        offset = 0
+        for line in fasta:
+            if line.startswith(b">"):
+                name = line[1:].split(None, 1)[0].decode()
+                if name in index:
+                    raise ValueError("The ID " + name + " is in the "
+                                     "fasta file more than once.")
+                index[name] = [0, offset + len(line), 0, 0, False, False]
+            elif name is not None and not line.strip():
+                # Empty lines may only come after the sequence
+                index[name][5] = True
+            elif name is not None:
+                entry = index[name]
+                if entry[5]:
+                    raise ValueError("The sequence of " + name + " in the "
+                                     "fasta file has an empty line.")
+                bases = len(line.rstrip(b"\r\n"))
+                if entry[2] == 0:
+                    entry[2] = bases
+                    entry[3] = len(line)
+                elif entry[4] or bases > entry[2] or \
+                        (bases == entry[2] and len(line) != entry[3]):
+                    # Only the last line of a record may be shorter
+                    raise ValueError("The lines of " + name + " in the "
+                                     "fasta file are not all equally "
+                                     "long.")
+                if bases < entry[2]:
+                    entry[4] = True
+                entry[0] += bases
+            offset += len(line)
+    with open(index_filename, "w") as fai:
+        for name, entry in index.items():
+            index[name] = tuple(entry[:4])
+            fai.write(name + "\t" + "\t".join(str(value) for value
+                                              in index[name]) + "\n")
+    return index
 
 
-def counting_cds(gff3_list):
-    """Counts the frequency CDS from the gff3 list.
+class FastaIndex:
+    """Gets single amino acid sequences from the fasta file by ID with
+    the .fai index, without reading the rest of the file.
 
-    :param gff3_list: list of lines from the gff3 file.
-    :return: An integer which is the frequency of CDS in the gff3 file.
     """
-    try:
-        cds_count = 0
-        for line in gff3_list:
-            if "D" in line[11:14]:
-                cds_count += 1
-        return cds_count
-    except IndexError:
-        print("There was an Index Error in counting_cds()")
 
+    def __init__(self, filename=FASTA_FILE, index_filename=None):
+        """ Loads the index of the fasta file. The index is made first
+        when it is missing or older than the fasta file.
 
-def counting_mrna(gff3_list):
-    """Counts the frequency of mRNA from the gff3 list.
+        :param filename: name of the fasta file.
+        :param index_filename: name of the index file, default is the
+        name of the fasta file with ".fai" after it.
+        """
+        if is_compressed(filename):
+            raise ValueError("The fasta index needs an uncompressed "
+                             "fasta file, because it seeks to byte "
+                             "offsets.")
+        if index_filename is None:
+            index_filename = filename + ".fai"
+        if not os.path.exists(index_filename) or \
+                os.path.getmtime(index_filename) < \
+                os.path.getmtime(filename):
+            self.index = build_fasta_index(filename, index_filename)
+        else:
+            self.index = {}
+            with open(index_filename, "r") as fai:
+                for line in fai:
+                    columns = line.rstrip("\n").split("\t")
+                    self.index[columns[0]] = tuple(
+                        int(value) for value in columns[1:5])
+        self.fasta = open(filename, "rb")
 
-    :param gff3_list: list of lines from the gff3 file.
-    :return: An integer which is the frequency of mRNA in the gff3 file.
-    """
-    try:
-        mrna_count = 0
-        for line in gff3_list:
-            if "m" in line[11:14]:
-                mrna_count += 1
-        return mrna_count
-    except IndexError:
-        print("There was an Index Error in counting_mrna()")
+    def __contains__(self, name):
+        return name in self.index
 
+    def __len__(self):
+        return len(self.index)
 
-def counting_total(gff3_list):
-    """Counts the total lines from the gff3 list.
+    def __enter__(self):
+        return self
 
-    :param gff3_list: list of lines from the gff3 file.
-    :return: An integer which is the total of lines in the gff3 file.
-    """
-    try:
-        total_count = 0
-        for line in gff3_list:
-            if line != "":
-                total_count += 1
-        return total_count
-    except IndexError:
-        print("There was an Attribute Error in counting_total()")
+    def __exit__(self, *exc_info):
+        self.close()
 
+    def close(self):
+        """ Closes the fasta file.
 
-def calculating_other(exon_count, cds_count, mrna_count, total_count):
-    """ Calculates the frequency of other items than exons, CDS & mRNA
-    in the gff3 file.
+        :return: nothing
+        """
+        self.fasta.close()
 
-    :param exon_count: An integer which is the frequency of exons in
-    the gff3 file.
-    :param cds_count: An integer which is the frequency of CDS in
-    the gff3 file.
-    :param mrna_count: An integer which is the frequency of mRNA in
-    the gff3 file.
-    :param total_count: An integer which is the total of lines in
-    the gff3 file.
-    :return: An integer which is the frequency of other items than exons
-    , CDS & mRNA in the gff3 file.
+    def get_ids(self):
+        """ Returns the IDs of the records in the fasta file.
+
+        :return: list of IDs in the order of the fasta file.
+        """
+        return list(self.index)
+
+    def get_length(self, name):
+        """ Returns the length of one amino acid sequence.
+
+        :param name: the ID of the record.
+        :return: An integer which is the length of the sequence.
+        """
+        return self.index[name][0]
+
+    def fetch(self, name, start=0, end=None):
+        """ Gets (a part of) one amino acid sequence by seeking directly
+        to it in the fasta file.
+
+        :param name: the ID of the record.
+        :param start: 0-based position of the first amino acid.
+        :param end: position after the last amino acid, default is the
+        end of the sequence.
+        :return: the amino acid sequence as a string.
+        """
+        length, offset, line_bases, line_width = self.index[name]
+        if end is None or end > length:
+            end = length
+        start = max(0, start)
+        if start >= end:
+            return ""
+        first = offset + start // line_bases * line_width + \
+            start % line_bases
+        last = offset + (end - 1) // line_bases * line_width + \
+            (end - 1) % line_bases
+        self.fasta.seek(first)
+        block = self.fasta.read(last - first + 1)
+        return block.replace(b"\n", b"").replace(b"\r", b"").decode()
+
+
+def parse_header(header):
+    """ Splits an Ensembl fasta header into its fields, like
+    "T19C3.1.1 pep chromosome:WBcel235:III:... gene:WBGene00011000
+    transcript:T19C3.1.1 gene_biotype:protein_coding ...".
+
+    :param header: the header without the ">".
+    :return: dictionary with "id", "type" and the key:value fields of
+    the header, the "chromosome" or "scaffold" field is also put under
+    "location" and the free text after "description:" under
+    "description".
     """
-    try:
-        other_count = total_count - exon_count - cds_count - mrna_count
-        return other_count
-    except TypeError:
-        print("There was a Type Error in calculating_other()")
+    fields = {}
+    header, _, description = header.partition(" description:")
+    words = header.split()
+    if words:
+        fields["id"] = words[0]
+    for word in words[1:]:
+        key, colon, value = word.partition(":")
+        if not colon:
+            fields.setdefault("type", word)
+            continue
+        fields[key] = value
+        if key in ("chromosome", "scaffold"):
+            fields["location"] = value
+    if description:
+        fields["description"] = description
+    return fields
 
 
-class ConsensusCheck:
-    """Checks if the is a consensus pattern in the amino acids sequences
+class SequenceRecord:
+    """A view on one record of a SequenceStore, which keeps no copy of
+    the header or the amino acids itself.
 
     """
+    __slots__ = ("store", "index")
 
-    def __init__(self, headers, seq):
-        """ Converting the parameters into an object.
-        Checking with the given parameters if there is a concencus
-        pattern in the amino acids sequences.
+    def __init__(self, store, index):
+        """ Converting the store and the number of the record into an
+        object.
 
-        :param headers: list of headers of amino acids.
-        :param seq: list of amino acids sequences.
+        :param store: the SequenceStore the record is in.
+        :param index: the number of the record in the store.
         """
-        try:
-            self.set_headers(headers)
-            self.set_aa_seq(seq)
-            self.set_consensus()
-        except AttributeError:
-            print("There was an Attribute Error in Class ConsensusCheck"
-                  " in the init()")
+        self.store = store
+        self.index = index
 
-    def set_headers(self, headers):
-        """ Converting the headers list into an object.
+    @property
+    def header(self):
+        """ The header of the record, without ">" and newline. """
+        return self.store.headers[self.index]
 
-        :param headers: list of headers of amino acids.
-        :return: nothing
+    @property
+    def id(self):
+        """ The ID of the record, the first word of the header. """
+        return self.header.split(None, 1)[0]
+
+    @property
+    def fields(self):
+        """ The parsed fields of the header, see parse_header(). """
+        return parse_header(self.header)
+
+    @property
+    def sequence(self):
+        """ The amino acids of the record as a memoryview. """
+        return self.store.sequence(self.index)
+
+    def __len__(self):
+        return self.store.offsets[self.index + 1] - \
+            self.store.offsets[self.index]
+
+    def __str__(self):
+        return self.store.sequence(self.index).tobytes().decode()
+
+
+class SequenceStore:
+    """Keeps all amino acid sequences in one contiguous buffer with an
+    array of offsets, instead of a separate string object for every
+    sequence.
+
+    """
+
+    def __init__(self):
+        """ Makes an empty store.
         """
-        try:
-            self.headers = headers
-        except AttributeError:
-            print("There was an Attribute Error in Class ConsensusCheck"
-                  " set_headers()")
+        self.headers = []
+        self.residues = bytearray()
+        self.offsets = array.array("Q", [0])
 
-    def get_headers(self):
-        """ Returns the headers list object.
+    @classmethod
+    @instrumented("SequenceStore.from_fasta", len)
+    def from_fasta(cls, filename=FASTA_FILE):
+        """ Reads the fasta file into a store, the amino acid lines are
+        added to the buffer as bytes without making strings of them.
 
-        :return: An headers list object
+        :param filename: name of the fasta file.
+        :return: a SequenceStore object.
         """
+        store = cls()
         try:
-            return self.headers
-        except AttributeError:
-            print("There was an Attribute Error in Class ConsensusCheck"
-                  " in get_headers()")
+            with open_input(filename, "rb") as fasta:
+                for line in fasta:
+                    if line.startswith(b">"):
+                        if store.headers:
+                            store.offsets.append(len(store.residues))
+                        store.headers.append(line[1:].strip().decode())
+                    elif store.headers:
+                        store.residues += line.strip()
+                if store.headers:
+                    store.offsets.append(len(store.residues))
+        except FileNotFoundError:
+            print("The fasta file was not found in "
+                  "SequenceStore.from_fasta().")
+        return store
 
-    def set_aa_seq(self, seq):
-        """ Converting the amino acid sequences list into an
-        object.
+    def add(self, header, aa_seq):
+        """ Adds one record to the store. Records can only be added as
+        long as there are no memoryviews of the buffer.
 
-        :param seq: an amino acid sequences list object
+        :param header: the header without the ">".
+        :param aa_seq: the amino acid sequence as string or bytes.
         :return: nothing
         """
-        try:
-            self.aa_seq = seq
-        except AttributeError:
-            print("There was an Attribute Error in Class ConsensusCheck"
-                  " in set_aa_seq()")
+        if isinstance(aa_seq, str):
+            aa_seq = aa_seq.encode()
+        self.headers.append(header)
+        self.residues += aa_seq
+        self.offsets.append(len(self.residues))
 
-    def get_aa_seq(self):
+    def __len__(self):
+        return len(self.headers)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("SequenceStore index out of range")
+        return SequenceRecord(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield SequenceRecord(self, index)
+
+    def sequence(self, index):
+        """ Returns the amino acids of one record as a zero-copy
+        memoryview of the buffer.
+
+        :param index: the number of the record.
+        :return: memoryview of the amino acids.
+        """
+        return memoryview(self.residues)[self.offsets[index]:
+                                         self.offsets[index + 1]]
+
+    def iter_sequences(self):
+        """ Returns the amino acids of every record as memoryviews.
+
+        :return: generator of memoryviews of the amino acids.
+        """
+        view = memoryview(self.residues)
+        offsets = self.offsets
+        for index in range(len(self.headers)):
+            yield view[offsets[index]:offsets[index + 1]]
+
+
+def _residue_lookup(numpy):
+    """ Makes the table which turns the bytes of amino acids into the
+    number of the amino acid in AMINO_ACIDS. Lower case amino acids get
+    the same number, every other byte gets len(AMINO_ACIDS).
+
+    :param numpy: the numpy-module.
+    :return: NumPy uint8 array of 256 numbers.
+    """
+    lookup = numpy.full(256, len(AMINO_ACIDS), dtype=numpy.uint8)
+    for code, amino_acid in enumerate(AMINO_ACIDS):
+        lookup[ord(amino_acid)] = code
+        lookup[ord(amino_acid.lower())] = code
+    return lookup
+
+
+def _record_batches(numpy, offsets):
+    """ Splits the records of a SequenceStore into batches of about
+    STATISTICS_BATCH_SIZE residues, a record larger than that is a
+    batch on its own.
+
+    :param numpy: the numpy-module.
+    :param offsets: NumPy array with the offsets of the store.
+    :return: generator of (first record, record after the last record)
+    tuples.
+    """
+    records = len(offsets) - 1
+    first = 0
+    while first < records:
+        last = int(numpy.searchsorted(
+            offsets, offsets[first] + STATISTICS_BATCH_SIZE,
+            side="right")) - 1
+        last = min(max(last, first + 1), records)
+        yield first, last
+        first = last
+
+
+@instrumented("sequence_statistics", lambda table: len(table["id"]))
+def sequence_statistics(store):
+    """ Calculates the length, the amino acid composition and other
+    properties of every protein in a SequenceStore with NumPy. The
+    buffer of the store is used as an uint8 array, a lookup table turns
+    every residue into a number and bincount counts the numbers of all
+    proteins of a batch at once, so there is no Python loop over the
+    residues.
+
+    :param store: a SequenceStore object.
+    :return: dictionary with the name of the column as key and a list
+    or NumPy array with one value per protein as value, or None when
+    NumPy is not installed.
+    """
+    try:
+        import numpy
+    except ModuleNotFoundError:
+        print("The numpy-module could not be found in "
+              "sequence_statistics()")
+        return None
+    symbols = len(AMINO_ACIDS) + 1
+    lookup = _residue_lookup(numpy)
+    residues = numpy.frombuffer(store.residues, dtype=numpy.uint8)
+    offsets = numpy.frombuffer(store.offsets,
+                               dtype=numpy.uint64).astype(numpy.int64)
+    lengths = numpy.diff(offsets)
+    records = len(store)
+    counts = numpy.zeros((records, symbols), dtype=numpy.int64)
+    for first, last in _record_batches(numpy, offsets):
+        codes = lookup[residues[offsets[first]:offsets[last]]]
+        owners = numpy.repeat(numpy.arange(last - first),
+                              lengths[first:last])
+        counts[first:last] = numpy.bincount(
+            owners * symbols + codes,
+            minlength=(last - first) * symbols).reshape(-1, symbols)
+    del residues
+    divisor = numpy.maximum(lengths, 1)
+    cysteines = counts[:, AMINO_ACIDS.index("C")]
+    histidines = counts[:, AMINO_ACIDS.index("H")]
+    table = {"id": [header.split(None, 1)[0]
+                    for header in store.headers],
+             "length": lengths}
+    for code, amino_acid in enumerate(AMINO_ACIDS):
+        table["count_" + amino_acid] = counts[:, code]
+    table["count_other"] = counts[:, -1]
+    table["cysteine_fraction"] = cysteines / divisor
+    table["histidine_fraction"] = histidines / divisor
+    table["ch_density"] = (cysteines + histidines) * 100 / divisor
+    table["hydrophobic_fraction"] = counts[:, [
+        AMINO_ACIDS.index(amino_acid)
+        for amino_acid in HYDROPHOBIC_AMINO_ACIDS]].sum(axis=1) / divisor
+    table["net_charge"] = (counts[:, AMINO_ACIDS.index("K")] +
+                           counts[:, AMINO_ACIDS.index("R")] -
+                           counts[:, AMINO_ACIDS.index("D")] -
+                           counts[:, AMINO_ACIDS.index("E")])
+    table["molecular_weight"] = \
+        counts[:, :-1] @ numpy.array(RESIDUE_MASSES) + \
+        WATER_MASS * (lengths > 0)
+    return table
+
+
+def write_statistics(table, filename):
+    """ Writes the table of sequence_statistics() as a TSV file.
+
+    :param table: dictionary from sequence_statistics().
+    :param filename: name of the TSV file.
+    :return: nothing
+    """
+    columns = list(table)
+    with open(filename, "w") as output:
+        output.write("\t".join(columns) + "\n")
+        for row in zip(*(table[column] for column in columns)):
+            output.write("\t".join(
+                "%.4f" % value if isinstance(value, float) else
+                str(value) for value in row) + "\n")
+
+
+def pssm_from_consensus(consensus=ZINC_FINGER_CONSENSUS, match=1.0):
+    """ Makes a position-specific scoring matrix from a consensus like
+    "CxxCxxCxxxxxCxxCxxC", where x is any amino acid. Every position
+    with an amino acid scores match for that amino acid and 0 for the
+    others, the x positions score 0.
+
+    :param consensus: the consensus, with x for any amino acid.
+    :param match: the score of a matching amino acid.
+    :return: NumPy array with a row per position of the consensus and a
+    column per amino acid of AMINO_ACIDS, plus a last column for any
+    other residue.
+    """
+    import numpy
+    pssm = numpy.zeros((len(consensus), len(AMINO_ACIDS) + 1),
+                       dtype=numpy.float32)
+    for position, amino_acid in enumerate(consensus.upper()):
+        if amino_acid != "X":
+            pssm[position, AMINO_ACIDS.index(amino_acid)] = match
+    return pssm
+
+
+@instrumented("scan_pssm", len)
+def scan_pssm(store, pssm=None, threshold=PSSM_THRESHOLD):
+    """ Scores every window of every protein in a SequenceStore with a
+    position-specific scoring matrix. The whole buffer of a batch of
+    proteins is scored at once: for every position of the matrix the
+    scores of the residues at that offset are looked up for all windows
+    together and added up, positions which score 0 for every amino acid
+    are skipped. A position which scores only one or two amino acids,
+    like the cysteines of the consensus, is added with comparisons,
+    which are much faster than a lookup. A matrix of whole numbers is
+    added up in int16 instead of float32. Windows which run over the end
+    of a protein are thrown away afterwards.
+
+    :param store: a SequenceStore object.
+    :param pssm: the scoring matrix, like from pssm_from_consensus(),
+    default is the zinc finger consensus.
+    :param threshold: the lowest score of a hit, the default allows one
+    substitution in the zinc finger consensus.
+    :return: list of PssmHit objects, ordered by protein and position,
+    or None when NumPy is not installed.
+    """
+    try:
+        import numpy
+    except ModuleNotFoundError:
+        print("The numpy-module could not be found in scan_pssm()")
+        return None
+    if pssm is None:
+        pssm = pssm_from_consensus()
+    pssm = numpy.asarray(pssm, dtype=numpy.float32)
+    width = len(pssm)
+    dtype = numpy.float32
+    if (pssm == numpy.round(pssm)).all() and \
+            numpy.abs(pssm).max(axis=1).sum() < 32767:
+        dtype = numpy.int16
+    pssm = pssm.astype(dtype)
+    # Per position the amino acids with a score, or None to look the
+    # scores up
+    columns = []
+    for position in range(width):
+        scored = numpy.flatnonzero(pssm[position])
+        if len(scored) == 0:
+            continue
+        if len(scored) <= 2:
+            columns.append((position, [(code, pssm[position, code])
+                                       for code in scored.tolist()]))
+        else:
+            columns.append((position, None))
+    lookup = _residue_lookup(numpy)
+    residues = numpy.frombuffer(store.residues, dtype=numpy.uint8)
+    offsets = numpy.frombuffer(store.offsets,
+                               dtype=numpy.uint64).astype(numpy.int64)
+    hits = []
+    for first, last in _record_batches(numpy, offsets):
+        codes = lookup[residues[offsets[first]:offsets[last]]]
+        windows = len(codes) - width + 1
+        if windows <= 0:
+            continue
+        scores = numpy.zeros(windows, dtype=dtype)
+        for position, scored in columns:
+            window_codes = codes[position:position + windows]
+            if scored is None:
+                scores += pssm[position].take(window_codes)
+                continue
+            for code, score in scored:
+                if score == 1:
+                    scores += window_codes == code
+                else:
+                    scores += (window_codes == code) * score
+        starts = numpy.flatnonzero(scores >= threshold) + offsets[first]
+        records = numpy.searchsorted(offsets, starts, side="right") - 1
+        inside = starts + width <= offsets[records + 1]
+        for start, record in zip(starts[inside].tolist(),
+                                 records[inside].tolist()):
+            hits.append(PssmHit(
+                record, start - int(offsets[record]),
+                float(scores[start - offsets[first]]),
+                store.residues[start:start + width].decode()))
+    return hits
+
+
+def pssm_consensus(store, pssm=None, threshold=PSSM_THRESHOLD):
+    """ Searches for the zinc finger consensus with scan_pssm() and
+    keeps the best window of every protein, in the form of
+    scan_consensus().
+
+    :param store: a SequenceStore object.
+    :param pssm: the scoring matrix, default is the zinc finger
+    consensus.
+    :param threshold: the lowest score of a hit.
+    :return: tuple of the list of found consensus sequences, the number
+    of sequences without the consensus and the list of the numbers of
+    the sequences with the consensus, or None when NumPy is not
+    installed.
+    """
+    hits = scan_pssm(store, pssm, threshold)
+    if hits is None:
+        return None
+    best = {}
+    for hit in hits:
+        if hit.record not in best or hit.score > best[hit.record].score:
+            best[hit.record] = hit
+    css_numbers = sorted(best)
+    return ([best[number].peptide for number in css_numbers],
+            len(store) - len(css_numbers), css_numbers)
+
+
+def _count_kmer_chunk(residues, offsets, ks):
+    """ Counts the k-mers of a part of a SequenceStore, in a worker
+    process or in this process. Every residue becomes a number from 0
+    to 19, the number of a k-mer is built from the number of the
+    (k - 1)-mer before it as number * 20 + residue, for all windows of
+    a batch at once. Windows with another residue than the 20 amino
+    acids, or which run over the end of a protein, are left out, and
+    bincount counts the rest in an array with a place for every k-mer.
+
+    :param residues: the residues of the part, bytes-like.
+    :param offsets: the offsets of the proteins in the residues,
+    starting with 0.
+    :param ks: list of the lengths of the k-mers.
+    :return: dictionary with k as key and a NumPy array with the count
+    of every k-mer as value.
+    """
+    import numpy
+    residues = numpy.frombuffer(residues, dtype=numpy.uint8)
+    offsets = numpy.asarray(offsets, dtype=numpy.int64)
+    lookup = _residue_lookup(numpy)
+    base = len(AMINO_ACIDS)
+    counts = {k: numpy.zeros(base ** k, dtype=numpy.int64) for k in ks}
+    for first, last in _record_batches(numpy, offsets):
+        codes = lookup[residues[offsets[first]:offsets[last]]]
+        # A separator between the proteins, so no window runs over the
+        # end of a protein
+        codes = numpy.insert(codes, offsets[first + 1:last] -
+                             offsets[first], base)
+        # The number of separators and other residues before every
+        # position
+        others = numpy.zeros(len(codes) + 1, dtype=numpy.int32)
+        numpy.cumsum(codes == base, out=others[1:])
+        kmers = codes.astype(numpy.int32)
+        for k in range(1, max(ks) + 1):
+            if k > 1:
+                kmers = kmers[:-1] * base + codes[k - 1:]
+            if k in counts and len(kmers):
+                counts[k] += numpy.bincount(
+                    kmers[others[k:] == others[:-k]], minlength=base ** k)
+    return counts
+
+
+class KmerSpectrum:
+    """Keeps the number of times every peptide k-mer occurs, for one or
+    more lengths k, in an array with a place for every possible k-mer.
+    The number of a k-mer is its amino acids as the digits of a base 20
+    number, in the order of AMINO_ACIDS.
+
+    """
+
+    def __init__(self, counts=None):
+        """ Converting the counts into an object.
+
+        :param counts: dictionary with k as key and a NumPy array with
+        the count of every k-mer as value, default is no counts.
+        """
+        self.counts = {}
+        if counts is not None:
+            self.add(counts)
+
+    def add(self, counts):
+        """ Adds counts, like the partial counts of a worker process or
+        the spectrum of another genome, to the spectrum.
+
+        :param counts: dictionary with k as key and a NumPy array with
+        the count of every k-mer as value.
+        :return: nothing
+        """
+        for k, kmer_counts in counts.items():
+            if k in self.counts:
+                self.counts[k] += kmer_counts
+            else:
+                self.counts[k] = kmer_counts.copy()
+
+    def get_ks(self):
+        """ Returns the lengths of the counted k-mers.
+
+        :return: sorted list of k.
+        """
+        return sorted(self.counts)
+
+    def total(self, k):
+        """ Returns the number of counted k-mers of one length.
+
+        :param k: the length of the k-mers.
+        :return: An integer which is the number of windows.
+        """
+        return int(self.counts[k].sum())
+
+    @staticmethod
+    def decode(number, k):
+        """ Turns the number of a k-mer back into amino acids.
+
+        :param number: the number of the k-mer.
+        :param k: the length of the k-mer.
+        :return: the k-mer as a string.
+        """
+        kmer = []
+        for _ in range(k):
+            number, code = divmod(number, len(AMINO_ACIDS))
+            kmer.append(AMINO_ACIDS[code])
+        return "".join(reversed(kmer))
+
+    def top(self, k, number=20):
+        """ Returns the most frequent k-mers of one length.
+
+        :param k: the length of the k-mers.
+        :param number: the number of k-mers.
+        :return: list of (k-mer, count) tuples, the most frequent
+        first.
+        """
+        import numpy
+        kmer_counts = self.counts[k]
+        number = min(number, len(kmer_counts))
+        best = numpy.argpartition(kmer_counts, -number)[-number:]
+        best = best[numpy.argsort(-kmer_counts[best], kind="stable")]
+        return [(self.decode(int(code), k), int(kmer_counts[code]))
+                for code in best if kmer_counts[code]]
+
+    def spectrum(self, k):
+        """ Returns every k-mer of one length which occurs at least
+        once.
+
+        :param k: the length of the k-mers.
+        :return: list of (k-mer, count) tuples, in the order of the
+        numbers of the k-mers.
+        """
+        import numpy
+        kmer_counts = self.counts[k]
+        return [(self.decode(code, k), int(kmer_counts[code]))
+                for code in numpy.flatnonzero(kmer_counts).tolist()]
+
+    def write(self, filename, top=None):
+        """ Writes the spectrum as a TSV file with the count and the
+        frequency of every k-mer.
+
+        :param filename: name of the TSV file.
+        :param top: only the most frequent k-mers per length, default is
+        every k-mer which occurs.
+        :return: nothing
+        """
+        with open(filename, "w") as output:
+            output.write("k\tkmer\tcount\tfrequency\n")
+            for k in self.get_ks():
+                total = self.total(k) or 1
+                kmers = self.spectrum(k) if top is None else \
+                    self.top(k, top)
+                for kmer, count in kmers:
+                    output.write("%d\t%s\t%d\t%.8f\n"
+                                 % (k, kmer, count, count / total))
+
+
+@instrumented("count_kmers")
+def count_kmers(store, ks=(2, 3, 4, 5), workers=1):
+    """ Counts the peptide k-mers of every protein in a SequenceStore.
+    With more than one worker the proteins are split into one part per
+    worker process, and the partial counts are added up.
+
+    :param store: a SequenceStore object.
+    :param ks: the lengths of the k-mers, at most KMER_MAX_K.
+    :param workers: the number of worker processes, 1 counts in this
+    process.
+    :return: a KmerSpectrum object, or None when NumPy is not
+    installed.
+    """
+    try:
+        import numpy
+    except ModuleNotFoundError:
+        print("The numpy-module could not be found in count_kmers()")
+        return None
+    ks = sorted(set(ks))
+    if not ks or ks[0] < 1 or ks[-1] > KMER_MAX_K:
+        raise ValueError("The k-mer lengths must be from 1 to " +
+                         str(KMER_MAX_K) + ".")
+    offsets = numpy.frombuffer(store.offsets,
+                               dtype=numpy.uint64).astype(numpy.int64)
+    spectrum = KmerSpectrum()
+    if workers <= 1 or len(store) < 2:
+        spectrum.add(_count_kmer_chunk(store.residues, offsets, ks))
+        return spectrum
+    # The first protein of every part, so the parts have about the same
+    # number of residues
+    bounds = numpy.unique(numpy.searchsorted(
+        offsets, numpy.linspace(0, offsets[-1], workers + 1)[:-1]))
+    bounds = bounds[bounds < len(store)].tolist() + [len(store)]
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_count_kmer_chunk,
+                               bytes(store.residues[offsets[first]:
+                                                    offsets[last]]),
+                               offsets[first:last + 1] - offsets[first],
+                               ks)
+                   for first, last in zip(bounds, bounds[1:])]
+        for future in concurrent.futures.as_completed(futures):
+            spectrum.add(future.result())
+    return spectrum
+
+
+def _report_lines(lines, progress):
+    """ Passes on the lines and reports how far the reading is.
+
+    :param lines: iterable of lines.
+    :param progress: function which is called with the number of
+    characters and lines read every PROGRESS_EVERY lines and at the
+    end.
+    :return: generator of the same lines.
+    """
+    characters = 0
+    number = 0
+    for number, line in enumerate(lines, 1):
+        characters += len(line)
+        if number % PROGRESS_EVERY == 0:
+            progress(characters, number)
+        yield line
+    progress(characters, number)
+
+
+def tally_feature_types(gff3_lines, progress=None):
+    """ Counts every feature type in one pass over the gff3 lines. The
+    feature type is taken from the third column, so every type (exon,
+    CDS, mRNA, gene, UTRs, ncRNA, ...) gets its own count.
+
+    :param gff3_lines: iterable of lines from the gff3 file, like an
+    open gff3 file or the list from read_gff3().
+    :param progress: function which is called with the number of
+    characters and lines read every PROGRESS_EVERY lines and at the
+    end.
+    :return: Counter with the feature type as key and the frequency of
+    that feature type in the gff3 file as value.
+    """
+    feature_counts = collections.Counter()
+    if progress is not None:
+        gff3_lines = _report_lines(gff3_lines, progress)
+    for line in gff3_lines:
+        if line.startswith("#"):
+            continue
+        columns = line.split("\t", 3)
+        if len(columns) < 4:
+            continue
+        feature_counts[columns[2]] += 1
+    return feature_counts
+
+
+@instrumented("count_feature_types",
+              lambda counts: sum(counts.values()))
+def count_feature_types(filename=GFF3_FILE, progress=None):
+    """ Counts every feature type of the gff3 file while the file is
+    read, so the lines are never all kept in memory.
+
+    :param filename: name of the gff3 file.
+    :param progress: function which is called with the number of
+    characters and lines read, see tally_feature_types().
+    :return: Counter with the feature type as key and the frequency of
+    that feature type in the gff3 file as value.
+    """
+    try:
+        with open_input(filename) as gff3:
+            return tally_feature_types(gff3, progress)
+    except FileNotFoundError:
+        print("The gff3 file was not found in count_feature_types().")
+
+
+def process_context():
+    """ Returns the multiprocessing context of the process pools which
+    can be started from a thread, like the worker thread of the GUI.
+    Forking a process with more threads, like the thread of Tk, can
+    deadlock the child, so the workers are started by a forkserver, or
+    with spawn where there is no forkserver, like on Windows.
+
+    :return: a multiprocessing context.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _feature_chunk_ranges(mapped, chunks):
+    """ Splits the memory-mapped gff3 file into byte ranges which
+    start and end on a line boundary.
+
+    :param mapped: memory-mapped gff3 file.
+    :param chunks: the number of ranges to split the file into.
+    :return: list of (start, end) byte offsets.
+    """
+    size = len(mapped)
+    bounds = [0]
+    for i in range(1, chunks):
+        newline = mapped.find(b"\n", max(size * i // chunks, bounds[-1]))
+        if newline == -1:
+            break
+        if newline + 1 > bounds[-1]:
+            bounds.append(newline + 1)
+    if bounds[-1] < size:
+        bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _count_feature_range(filename, start, end):
+    """ Counts the feature types in one byte range of the gff3 file.
+    Runs in a worker process, which maps the file itself so only the
+    offsets have to be sent to it.
+
+    :param filename: name of the gff3 file.
+    :param start: byte offset of the first line of the range.
+    :param end: byte offset after the last line of the range.
+    :return: tuple of the Counter with the feature type as key and the
+    frequency of that feature type in the range as value, and the number
+    of lines in the range.
+    """
+    with open(filename, "rb") as gff3:
+        with mmap.mmap(gff3.fileno(), 0, access=mmap.ACCESS_READ) \
+                as mapped:
+            feature_counts = collections.Counter()
+            lines = mapped[start:end].split(b"\n")
+            # The last line of the file may not end with a newline
+            if lines[-1] == b"":
+                lines.pop()
+            for line in lines:
+                if line.startswith(b"#"):
+                    continue
+                columns = line.split(b"\t", 3)
+                if len(columns) < 4:
+                    continue
+                feature_counts[columns[2]] += 1
+    return collections.Counter({feature_type.decode(): count
+                                for feature_type, count
+                                in feature_counts.items()}), len(lines)
+
+
+@instrumented("count_feature_types_parallel",
+              lambda counts: sum(counts.values()))
+def count_feature_types_parallel(filename=GFF3_FILE, workers=None,
+                                 progress=None):
+    """ Counts every feature type of the gff3 file with several worker
+    processes. The file is memory-mapped and split into line-aligned
+    byte ranges, every worker counts its own ranges and the partial
+    tables are added together. The result is the same as the one from
+    count_feature_types().
+
+    :param filename: name of the gff3 file.
+    :param workers: the number of worker processes, default is the
+    number of CPUs.
+    :param progress: function which is called with the number of bytes
+    and lines counted after every range, or with the number of
+    characters and lines when the file is counted in this process.
+    :return: Counter with the feature type as key and the frequency of
+    that feature type in the gff3 file as value.
+    """
+    try:
+        if workers is None:
+            workers = os.cpu_count() or 1
+        # A compressed file can not be split into byte ranges
+        if workers <= 1 or os.path.getsize(filename) < PARALLEL_MIN_SIZE \
+                or is_compressed(filename):
+            return count_feature_types(filename, progress)
+        with open(filename, "rb") as gff3:
+            with mmap.mmap(gff3.fileno(), 0, access=mmap.ACCESS_READ) \
+                    as mapped:
+                ranges = _feature_chunk_ranges(mapped, workers * 4)
+        feature_counts = collections.Counter()
+        with concurrent.futures.ProcessPoolExecutor(
+                workers, mp_context=process_context()) as pool:
+            futures = [pool.submit(_count_feature_range, filename,
+                                   start, end)
+                       for start, end in ranges]
+            counted = 0
+            lines = 0
+            for (start, end), future in zip(ranges, futures):
+                range_counts, range_lines = future.result()
+                feature_counts.update(range_counts)
+                counted += end - start
+                lines += range_lines
+                if progress is not None:
+                    progress(counted, lines)
+        return feature_counts
+    except FileNotFoundError:
+        print("The gff3 file was not found in "
+              "count_feature_types_parallel().")
+
+
+def _attribute(attributes, key):
+    """ Gets the value of one key from the attributes column of a gff3
+    line, without splitting the whole column.
+
+    :param attributes: the ninth column of a gff3 line.
+    :param key: the key of the attribute, like "ID" or "Parent".
+    :return: the value as a string, or None when the key is not there.
+    """
+    position = attributes.find(key + "=")
+    while position > 0 and attributes[position - 1] != ";":
+        position = attributes.find(key + "=", position + 1)
+    if position == -1:
+        return None
+    position += len(key) + 1
+    end = attributes.find(";", position)
+    if end == -1:
+        return attributes[position:].rstrip()
+    return attributes[position:end]
+
+
+def parse_region(region):
+    """ Reads a region like "III:1,200,000-1,350,000".
+
+    :param region: the region as a string.
+    :return: tuple of the seqid, the 1-based start and the inclusive
+    end.
+    """
+    found = REGION_PATTERN.match(region.strip())
+    if found is None:
+        raise ValueError("The region " + region + " is not like "
+                         "seqid:start-end.")
+    return (found.group(1), int(found.group(2).replace(",", "")),
+            int(found.group(3).replace(",", "")))
+
+
+class FeatureIntervalIndex:
+    """Keeps the features of the gff3 file per seqid in arrays sorted
+    by position, so the features and the feature counts of a region are
+    found with binary search instead of a scan over the whole file.
+
+    """
+
+    def __init__(self):
+        """ Makes an empty index.
+        """
+        self.types = []
+        self.seqids = {}
+
+    @classmethod
+    @instrumented("FeatureIntervalIndex.from_gff3",
+                  lambda index: sum(len(data["starts"])
+                                    for data in index.seqids.values()))
+    def from_gff3(cls, filename=GFF3_FILE, feature_types=None):
+        """ Reads the gff3 file once into an index.
+
+        :param filename: name of the gff3 file, may be compressed.
+        :param feature_types: set of feature types to keep, default is
+        every feature type.
+        :return: a FeatureIntervalIndex object.
+        """
+        index = cls()
+        type_codes = {}
+        features = collections.defaultdict(list)
+        try:
+            with open_input(filename) as gff3:
+                for line in gff3:
+                    if line.startswith("#"):
+                        continue
+                    columns = line.rstrip("\r\n").split("\t")
+                    if len(columns) < 9:
+                        continue
+                    feature_type = columns[2]
+                    if feature_types is not None and \
+                            feature_type not in feature_types:
+                        continue
+                    if feature_type not in type_codes:
+                        type_codes[feature_type] = len(index.types)
+                        index.types.append(feature_type)
+                    name = _attribute(columns[8], "ID")
+                    if name is None:
+                        name = _attribute(columns[8], "Parent")
+                    features[columns[0]].append(
+                        (int(columns[3]), int(columns[4]),
+                         type_codes[feature_type], columns[6], name))
+        except FileNotFoundError:
+            print("The gff3 file was not found in "
+                  "FeatureIntervalIndex.from_gff3().")
+        for seqid, seqid_features in features.items():
+            index._add_seqid(seqid, seqid_features)
+        return index
+
+    def _add_seqid(self, seqid, features):
+        """ Sorts the features of one seqid and puts them in arrays.
+        Next to the features sorted by start, every feature type gets a
+        sorted array of starts and a sorted array of ends, which are
+        used to count overlapping features in logarithmic time. For
+        query() the features are also put in length classes: class c
+        has the features with a length from 2 ** (c - 1) + 1 up to
+        2 ** c, with the starts and the numbers of its features, so one
+        long feature like a chromosome only widens the search in its own
+        class.
+
+        :param seqid: the seqid, like a chromosome name.
+        :param features: list of (start, end, type code, strand, name)
+        tuples.
+        :return: nothing
+        """
+        features.sort(key=lambda feature: (feature[0], feature[1]))
+        per_type = collections.defaultdict(lambda: (array.array("q"),
+                                                    array.array("q")))
+        for start, end, code, _, _ in features:
+            per_type[code][0].append(start)
+            per_type[code][1].append(end)
+        for code, (starts, ends) in per_type.items():
+            per_type[code] = (starts, array.array("q", sorted(ends)))
+        classes = {}
+        for number, (start, end, _, _, _) in enumerate(features):
+            length = end - start + 1
+            length_class = (length - 1).bit_length()
+            if length_class not in classes:
+                classes[length_class] = {"starts": array.array("q"),
+                                         "numbers": array.array("q"),
+                                         "longest": 0}
+            classes[length_class]["starts"].append(start)
+            classes[length_class]["numbers"].append(number)
+            classes[length_class]["longest"] = max(
+                classes[length_class]["longest"], length)
+        self.seqids[seqid] = {
+            "starts": array.array("q", (feature[0]
+                                        for feature in features)),
+            "ends": array.array("q", (feature[1] for feature in features)),
+            "codes": array.array("H", (feature[2]
+                                       for feature in features)),
+            "strands": "".join(feature[3] for feature in features),
+            "names": [feature[4] for feature in features],
+            "classes": classes,
+            "per_type": dict(per_type)}
+
+    def get_seqids(self):
+        """ Returns the seqids in the index.
+
+        :return: list of seqids.
+        """
+        return list(self.seqids)
+
+    def get_length(self, seqid):
+        """ Returns the last position with a feature on a seqid.
+
+        :param seqid: the seqid.
+        :return: An integer which is the highest end of the features.
+        """
+        return max(self.seqids[seqid]["ends"])
+
+    def query(self, seqid, start, end, feature_types=None):
+        """ Finds the features which overlap a region. In every length
+        class only the features which start at most the length of the
+        longest feature of that class before the region are looked at,
+        found with binary search.
+
+        :param seqid: the seqid of the region.
+        :param start: the 1-based start of the region.
+        :param end: the inclusive end of the region.
+        :param feature_types: set of feature types to return, default
+        is every feature type.
+        :return: list of GffFeature objects, sorted by start.
+        """
+        data = self.seqids.get(seqid)
+        if data is None:
+            return []
+        starts = data["starts"]
+        numbers = []
+        for length_class in data["classes"].values():
+            class_starts = length_class["starts"]
+            first = bisect.bisect_left(class_starts,
+                                       start - length_class["longest"] + 1)
+            last = bisect.bisect_right(class_starts, end)
+            for number in length_class["numbers"][first:last]:
+                if data["ends"][number] >= start:
+                    numbers.append(number)
+        # The numbers follow the order of the starts
+        numbers.sort()
+        found = []
+        for number in numbers:
+            feature_type = self.types[data["codes"][number]]
+            if feature_types is not None and \
+                    feature_type not in feature_types:
+                continue
+            found.append(GffFeature(seqid, starts[number],
+                                    data["ends"][number], feature_type,
+                                    data["strands"][number],
+                                    data["names"][number]))
+        return found
+
+    def count(self, seqid, start, end, feature_type):
+        """ Counts the features of one type which overlap a region in
+        logarithmic time: the features which start before the end of the
+        region, minus the features which already ended before its start.
+
+        :param seqid: the seqid of the region.
+        :param start: the 1-based start of the region.
+        :param end: the inclusive end of the region.
+        :param feature_type: the feature type, like "exon".
+        :return: An integer which is the number of features.
+        """
+        data = self.seqids.get(seqid)
+        if data is None or feature_type not in self.types:
+            return 0
+        arrays = data["per_type"].get(self.types.index(feature_type))
+        if arrays is None:
+            return 0
+        starts, ends = arrays
+        return bisect.bisect_right(starts, end) - \
+            bisect.bisect_left(ends, start)
+
+    def count_by_type(self, seqid, start, end):
+        """ Counts the features of every type which overlap a region.
+
+        :param seqid: the seqid of the region.
+        :param start: the 1-based start of the region.
+        :param end: the inclusive end of the region.
+        :return: Counter with the feature type as key and the number of
+        overlapping features as value.
+        """
+        feature_counts = collections.Counter()
+        for feature_type in self.types:
+            number = self.count(seqid, start, end, feature_type)
+            if number:
+                feature_counts[feature_type] = number
+        return feature_counts
+
+    def count_types(self):
+        """ Counts the features of every type in the whole index, like
+        count_feature_types() does for a gff3 file with 9 columns on
+        every feature line.
+
+        :return: Counter with the feature type as key and the frequency
+        of that feature type as value.
+        """
+        feature_counts = collections.Counter()
+        for data in self.seqids.values():
+            for code, (starts, _) in data["per_type"].items():
+                feature_counts[self.types[code]] += len(starts)
+        return feature_counts
+
+    def density_track(self, feature_type, window=100000, seqid=None):
+        """ Counts the features of one type in windows over the genome,
+        every window with two binary searches.
+
+        :param feature_type: the feature type, like "exon".
+        :param window: the size of the windows.
+        :param seqid: only this seqid, default is every seqid.
+        :return: dictionary with the seqid as key and a list of the
+        number of overlapping features per window as value.
+        """
+        track = {}
+        for name in ([seqid] if seqid is not None else self.seqids):
+            track[name] = [
+                self.count(name, first, first + window - 1, feature_type)
+                for first in range(1, self.get_length(name) + 1, window)]
+        return track
+
+
+def _strip_prefix(identifier):
+    """ Removes the Ensembl prefix of an ID of the gff3 file, so
+    "transcript:T19C3.1.1" becomes "T19C3.1.1" like in the fasta
+    headers.
+
+    :param identifier: the ID or Parent value.
+    :return: the ID without the prefix.
+    """
+    return identifier.partition(":")[2] or identifier
+
+
+@instrumented("parse_gene_models", lambda models: len(models[1]))
+def parse_gene_models(filename=GFF3_FILE):
+    """ Reads the gene -> mRNA -> exon/CDS hierarchy of the gff3 file
+    in one pass over the lines, using the ID and Parent attributes. The
+    exons and CDS parts are counted per transcript in dictionaries, so
+    the order of the lines does not matter.
+
+    :param filename: name of the gff3 file, may be compressed.
+    :return: tuple of two dictionaries: the genes with the gene ID as
+    key and the transcripts with the transcript ID as key. Every value
+    is a dictionary with the fields of the feature, the transcripts
+    also have "gene", "exons" and "cds_length". None when the file is
+    not found.
+    """
+    genes = {}
+    transcripts = {}
+    exons = collections.Counter()
+    cds_lengths = collections.Counter()
+    try:
+        with open_input(filename) as gff3:
+            for line in gff3:
+                if line.startswith("#"):
+                    continue
+                columns = line.rstrip("\r\n").split("\t")
+                if len(columns) < 9:
+                    continue
+                feature_type = columns[2]
+                parent = _attribute(columns[8], "Parent")
+                if feature_type in ("exon", "CDS"):
+                    if parent is None:
+                        continue
+                    for transcript in parent.split(","):
+                        transcript = _strip_prefix(transcript)
+                        if feature_type == "exon":
+                            exons[transcript] += 1
+                        else:
+                            cds_lengths[transcript] += \
+                                int(columns[4]) - int(columns[3]) + 1
+                    continue
+                feature_id = _attribute(columns[8], "ID")
+                if feature_id is None:
+                    continue
+                feature = {"type": feature_type,
+                           "seqid": columns[0],
+                           "start": int(columns[3]),
+                           "end": int(columns[4]),
+                           "strand": columns[6],
+                           "name": _attribute(columns[8], "Name")}
+                if parent is None:
+                    genes[_strip_prefix(feature_id)] = feature
+                else:
+                    feature["gene"] = _strip_prefix(
+                        parent.split(",", 1)[0])
+                    transcripts[_strip_prefix(feature_id)] = feature
+    except FileNotFoundError:
+        print("The gff3 file was not found in parse_gene_models().")
+        return None
+    for transcript, feature in transcripts.items():
+        feature["exons"] = exons[transcript]
+        feature["cds_length"] = cds_lengths[transcript]
+    return genes, transcripts
+
+
+@instrumented("protein_motif_hits", len)
+def protein_motif_hits(filename=FASTA_FILE, scanner=None):
+    """ Scans every protein of the fasta file for motifs and keeps the
+    results under the transcript of the header, which is the key the
+    gff3 transcripts are joined on.
+
+    :param filename: name of the fasta file, may be compressed.
+    :param scanner: a MotifScanner object, default scans for the
+    ZINC_FINGER_MOTIFS.
+    :return: dictionary with the transcript ID as key and a dictionary
+    with "protein", "length", "hits" and "motifs" as value, or None when
+    the file is not found.
+    """
+    if scanner is None:
+        scanner = MotifScanner()
+    proteins = {}
+    try:
+        for header, aa_seq in iter_fasta(filename):
+            fields = parse_header(header)
+            hits = scanner.scan(aa_seq)
+            proteins[fields.get("transcript", fields.get("id"))] = {
+                "protein": fields.get("id"),
+                "length": len(aa_seq),
+                "hits": len(hits),
+                "motifs": sorted({hit.name for hit in hits})}
+    except FileNotFoundError:
+        print("The fasta file was not found in protein_motif_hits().")
+        return None
+    return proteins
+
+
+@instrumented("gene_table", len)
+def gene_table(gene_models, proteins):
+    """ Joins the transcripts of the gff3 file with the proteins of the
+    fasta file on the transcript ID and adds them up per gene. Every
+    transcript is looked up once in the proteins dictionary and its gene
+    once in the table, so the join takes one pass over the transcripts.
+
+    :param gene_models: tuple of the genes and transcripts from
+    parse_gene_models().
+    :param proteins: dictionary from protein_motif_hits().
+    :return: list of dictionaries, one per gene with at least one
+    transcript, in the order of the gff3 file.
+    """
+    genes, transcripts = gene_models
+    table = {}
+    for transcript, feature in transcripts.items():
+        row = table.get(feature["gene"])
+        if row is None:
+            gene = genes.get(feature["gene"], {})
+            row = table[feature["gene"]] = {
+                "gene": feature["gene"],
+                "name": gene.get("name") or "",
+                "seqid": gene.get("seqid", feature["seqid"]),
+                "start": gene.get("start", feature["start"]),
+                "end": gene.get("end", feature["end"]),
+                "strand": gene.get("strand", feature["strand"]),
+                "transcripts": 0,
+                "proteins": 0,
+                "exons": 0,
+                "max_exons": 0,
+                "cds_length": 0,
+                "protein_length": 0,
+                "motif_hits": 0,
+                "motif_proteins": 0,
+                "motifs": set()}
+        row["transcripts"] += 1
+        row["exons"] += feature["exons"]
+        row["max_exons"] = max(row["max_exons"], feature["exons"])
+        row["cds_length"] = max(row["cds_length"], feature["cds_length"])
+        protein = proteins.get(transcript)
+        if protein is None:
+            continue
+        row["proteins"] += 1
+        row["protein_length"] = max(row["protein_length"],
+                                    protein["length"])
+        row["motif_hits"] += protein["hits"]
+        if protein["hits"]:
+            row["motif_proteins"] += 1
+            row["motifs"].update(protein["motifs"])
+    rows = list(table.values())
+    for row in rows:
+        row["motifs"] = ",".join(sorted(row["motifs"]))
+    return rows
+
+
+def write_gene_table(rows, filename):
+    """ Writes the per-gene table as a TSV file.
+
+    :param rows: list of dictionaries from gene_table().
+    :param filename: name of the TSV file.
+    :return: nothing
+    """
+    columns = ["gene", "name", "seqid", "start", "end", "strand",
+               "transcripts", "proteins", "exons", "max_exons",
+               "cds_length", "protein_length", "motif_hits",
+               "motif_proteins", "motifs"]
+    with open(filename, "w") as output:
+        output.write("\t".join(columns) + "\n")
+        for row in rows:
+            output.write("\t".join(str(row[column])
+                                   for column in columns) + "\n")
+
+
+@instrumented("parse_cds_segments", len)
+def parse_cds_segments(filename=GFF3_FILE):
+    """ Reads the CDS parts of every transcript from the gff3 file in
+    one pass, in the order of translation: from low to high positions
+    on the + strand and from high to low on the - strand.
+
+    :param filename: name of the gff3 file, may be compressed.
+    :return: dictionary with the transcript ID as key and a dictionary
+    with "seqid", "strand", "phase" (of the first part) and "segments",
+    a list of (start, end) tuples, as value. None when the file is not
+    found.
+    """
+    transcripts = {}
+    try:
+        with open_input(filename) as gff3:
+            for line in gff3:
+                if line.startswith("#"):
+                    continue
+                columns = line.rstrip("\r\n").split("\t")
+                if len(columns) < 9 or columns[2] != "CDS":
+                    continue
+                parent = _attribute(columns[8], "Parent")
+                if parent is None:
+                    continue
+                for transcript in parent.split(","):
+                    transcript = _strip_prefix(transcript)
+                    if transcript not in transcripts:
+                        transcripts[transcript] = {"seqid": columns[0],
+                                                   "strand": columns[6],
+                                                   "phases": [],
+                                                   "segments": []}
+                    transcripts[transcript]["segments"].append(
+                        (int(columns[3]), int(columns[4])))
+                    transcripts[transcript]["phases"].append(
+                        0 if columns[7] == "." else int(columns[7]))
+    except FileNotFoundError:
+        print("The gff3 file was not found in parse_cds_segments().")
+        return None
+    for transcript in transcripts.values():
+        order = sorted(range(len(transcript["segments"])),
+                       key=lambda number: transcript["segments"][number],
+                       reverse=transcript["strand"] == "-")
+        transcript["segments"] = [transcript["segments"][number]
+                                  for number in order]
+        transcript["phase"] = transcript.pop("phases")[order[0]]
+    return transcripts
+
+
+@instrumented("map_motif_hits", len)
+def map_motif_hits(store, transcripts, scanner=None):
+    """ Finds the motifs in every protein of a SequenceStore and maps
+    every hit to the genome through the CDS parts of its transcript. All
+    hits are mapped at once with NumPy: the CDS parts of all transcripts
+    are put one after another in one coordinate, the CDS part of the
+    first and the last codon of every hit is found with searchsorted and
+    a hit which crosses an intron gets a genomic block per CDS part.
+
+    :param store: a SequenceStore object.
+    :param transcripts: dictionary from parse_cds_segments().
+    :param scanner: a MotifScanner object, default scans for the
+    ZINC_FINGER_MOTIFS.
+    :return: list of GenomicHit objects, or None when NumPy is not
+    installed.
+    """
+    try:
+        import numpy
+    except ModuleNotFoundError:
+        print("The numpy-module could not be found in map_motif_hits()")
+        return None
+    if scanner is None:
+        scanner = MotifScanner()
+    found = []
+    used = {}
+    for record in store:
+        hits = scanner.scan(str(record))
+        if not hits:
+            continue
+        fields = record.fields
+        transcript = fields.get("transcript", fields.get("id"))
+        if transcript not in transcripts:
+            continue
+        used.setdefault(transcript, len(used))
+        for hit in hits:
+            found.append((record.id, transcript, hit))
+    if not found:
+        return []
+    # The CDS parts of the used transcripts one after another
+    names = list(used)
+    part_starts = []
+    part_ends = []
+    part_offsets = []
+    transcript_offsets = []
+    offset = 0
+    for transcript in names:
+        transcript_offsets.append(offset)
+        for start, end in transcripts[transcript]["segments"]:
+            part_starts.append(start)
+            part_ends.append(end)
+            part_offsets.append(offset)
+            offset += end - start + 1
+    transcript_offsets.append(offset)
+    part_starts = numpy.array(part_starts, dtype=numpy.int64)
+    part_ends = numpy.array(part_ends, dtype=numpy.int64)
+    part_offsets = numpy.array(part_offsets, dtype=numpy.int64)
+    transcript_offsets = numpy.array(transcript_offsets,
+                                     dtype=numpy.int64)
+    minus = numpy.array([transcripts[transcript]["strand"] == "-"
+                         for _, transcript, _ in found])
+    owners = numpy.array([used[transcript]
+                          for _, transcript, _ in found])
+    phases = numpy.array([transcripts[transcript]["phase"]
+                          for _, transcript, _ in found])
+    # The nucleotides of the hits in the joined CDS coordinate, the end
+    # is exclusive
+    first = transcript_offsets[owners] + phases + 3 * numpy.array(
+        [hit.start for _, _, hit in found])
+    last = transcript_offsets[owners] + phases + 3 * numpy.array(
+        [hit.end for _, _, hit in found])
+    inside = last <= transcript_offsets[owners + 1]
+    first_part = numpy.searchsorted(part_offsets, first, "right") - 1
+    last_part = numpy.searchsorted(part_offsets, last - 1, "right") - 1
+    pieces = numpy.where(inside, last_part - first_part + 1, 0)
+    # One row per genomic block of every hit
+    rows = numpy.repeat(numpy.arange(len(found)), pieces)
+    parts = first_part[rows] + numpy.arange(len(rows)) - numpy.repeat(
+        numpy.cumsum(pieces) - pieces, pieces)
+    low = numpy.maximum(first[rows], part_offsets[parts]) - \
+        part_offsets[parts]
+    high = numpy.minimum(last[rows], part_offsets[parts] + part_ends[
+        parts] - part_starts[parts] + 1) - part_offsets[parts]
+    block_starts = numpy.where(minus[rows], part_ends[parts] - high + 1,
+                               part_starts[parts] + low)
+    block_ends = numpy.where(minus[rows], part_ends[parts] - low,
+                             part_starts[parts] + high - 1)
+    mapped = []
+    blocks = collections.defaultdict(list)
+    for row, start, end in zip(rows.tolist(), block_starts.tolist(),
+                               block_ends.tolist()):
+        blocks[row].append((start, end))
+    for row, (protein, transcript, hit) in enumerate(found):
+        if row not in blocks:
+            continue
+        mapped.append(GenomicHit(protein, hit.name, hit.start, hit.end,
+                                 hit.peptide,
+                                 transcripts[transcript]["seqid"],
+                                 transcripts[transcript]["strand"],
+                                 sorted(blocks[row])))
+    return mapped
+
+
+def write_motif_bed(hits, filename):
+    """ Writes the mapped motif hits as BED12, one line per hit with a
+    block per CDS part.
+
+    :param hits: list of GenomicHit objects from map_motif_hits().
+    :param filename: name of the BED file.
+    :return: nothing
+    """
+    lines = []
+    for hit in hits:
+        start = hit.blocks[0][0] - 1
+        end = hit.blocks[-1][1]
+        lines.append("\t".join([
+            hit.seqid, str(start), str(end),
+            "%s:%s:%d-%d" % (hit.protein, hit.motif, hit.start + 1,
+                             hit.end),
+            "0", hit.strand, str(start), str(end), "0",
+            str(len(hit.blocks)),
+            ",".join(str(block_end - block_start + 1)
+                     for block_start, block_end in hit.blocks) + ",",
+            ",".join(str(block_start - 1 - start)
+                     for block_start, _ in hit.blocks) + ","]) + "\n")
+    with open(filename, "w") as output:
+        output.writelines(lines)
+
+
+def write_motif_gff3(hits, filename):
+    """ Writes the mapped motif hits as gff3, one line per CDS part of a
+    hit, the parts of one hit share the same ID.
+
+    :param hits: list of GenomicHit objects from map_motif_hits().
+    :param filename: name of the gff3 file.
+    :return: nothing
+    """
+    lines = ["##gff-version 3\n"]
+    for number, hit in enumerate(hits, 1):
+        attributes = "ID=motif:%d;Name=%s;protein_id=%s;" \
+                     "protein_range=%d-%d;peptide=%s" % (
+                         number, hit.motif, hit.protein, hit.start + 1,
+                         hit.end, hit.peptide)
+        for start, end in hit.blocks:
+            lines.append("\t".join([hit.seqid, "motif_scan",
+                                    "polypeptide_motif", str(start),
+                                    str(end), ".", hit.strand, ".",
+                                    attributes]) + "\n")
+    with open(filename, "w") as output:
+        output.writelines(lines)
+
+
+@instrumented("counting_exons", int)
+def counting_exons(gff3_list):
+    """Counts the frequency of exons from the gff3 list.
+
+    :param gff3_list: list of lines from the gff3 file.
+    :return: An integer which is the frequency of exons in the gff3 file
+    """
+    return tally_feature_types(gff3_list)["exon"]
+
+
+@instrumented("counting_cds", int)
+def counting_cds(gff3_list):
+    """Counts the frequency CDS from the gff3 list.
+
+    :param gff3_list: list of lines from the gff3 file.
+    :return: An integer which is the frequency of CDS in the gff3 file.
+    """
+    return tally_feature_types(gff3_list)["CDS"]
+
+
+@instrumented("counting_mrna", int)
+def counting_mrna(gff3_list):
+    """Counts the frequency of mRNA from the gff3 list.
+
+    :param gff3_list: list of lines from the gff3 file.
+    :return: An integer which is the frequency of mRNA in the gff3 file.
+    """
+    return tally_feature_types(gff3_list)["mRNA"]
+
+
+@instrumented("counting_total", int)
+def counting_total(gff3_list):
+    """Counts the total of features from the gff3 list.
+
+    :param gff3_list: list of lines from the gff3 file.
+    :return: An integer which is the total of features in the gff3 file.
+    """
+    return sum(tally_feature_types(gff3_list).values())
+
+
+def calculating_other(exon_count, cds_count, mrna_count, total_count):
+    """ Calculates the frequency of other items than exons, CDS & mRNA
+    in the gff3 file.
+
+    :param exon_count: An integer which is the frequency of exons in
+    the gff3 file.
+    :param cds_count: An integer which is the frequency of CDS in
+    the gff3 file.
+    :param mrna_count: An integer which is the frequency of mRNA in
+    the gff3 file.
+    :param total_count: An integer which is the total of lines in
+    the gff3 file.
+    :return: An integer which is the frequency of other items than exons
+    , CDS & mRNA in the gff3 file.
+    """
+    try:
+        other_count = total_count - exon_count - cds_count - mrna_count
+        return other_count
+    except TypeError:
+        print("There was a Type Error in calculating_other()")
+
+
+def _scan_consensus_batch(sequences):
+    """ Searches for the zinc finger consensus in a batch of amino acid
+    sequences. Runs in a worker process, or in this process when there
+    is only one worker.
+
+    :param sequences: iterable of amino acid sequences, as strings or
+    as bytes-like objects like the memoryviews from a SequenceStore.
+    :return: tuple of the list of found consensus sequences, the number
+    of sequences without the consensus and the list of the numbers of
+    the sequences with the consensus.
+    """
+    cssl = []
+    ncss = 0
+    css_numbers = []
+    for number, aa_seq in enumerate(sequences):
+        if isinstance(aa_seq, str):
+            css = ZINC_FINGER_PATTERN.search(aa_seq)
+        else:
+            css = ZINC_FINGER_PATTERN_BYTES.search(aa_seq)
+        if css:
+            if isinstance(aa_seq, str):
+                cssl.append(css.group())
+            else:
+                cssl.append(css.group().decode())
+            css_numbers.append(number)
+        else:
+            ncss += 1
+    return cssl, ncss, css_numbers
+
+
+def scan_consensus(sequences, workers=1,
+                   batch_size=CONSENSUS_BATCH_SIZE):
+    """ Searches for the zinc finger consensus in the amino acid
+    sequences. With more than one worker the sequences are split into
+    batches which are scanned in a process pool. Only a few batches
+    are sent out at the same time, so a stream of sequences is never
+    read into memory at once, and the results are merged in the
+    original order of the sequences.
+
+    :param sequences: iterable of amino acid sequences.
+    :param workers: the number of worker processes, 1 scans in this
+    process.
+    :param batch_size: the number of sequences in one batch.
+    :return: tuple of the list of found consensus sequences, the number
+    of sequences without the consensus and the list of the numbers of
+    the sequences with the consensus.
+    """
+    if workers <= 1:
+        return _scan_consensus_batch(sequences)
+    cssl = []
+    ncss = 0
+    css_numbers = []
+    scanned = 0
+    sequences = iter(sequences)
+    with concurrent.futures.ProcessPoolExecutor(
+            workers, mp_context=process_context()) as pool:
+        pending = collections.deque()
+        while True:
+            # Memoryviews can not be sent to another process
+            batch = [bytes(aa_seq) if isinstance(aa_seq, memoryview)
+                     else aa_seq
+                     for aa_seq in itertools.islice(sequences, batch_size)]
+            if batch:
+                pending.append(pool.submit(_scan_consensus_batch, batch))
+            if pending and (not batch or len(pending) >= workers * 2):
+                batch_cssl, batch_ncss, batch_numbers = \
+                    pending.popleft().result()
+                cssl.extend(batch_cssl)
+                css_numbers.extend(scanned + number
+                                   for number in batch_numbers)
+                scanned += len(batch_cssl) + batch_ncss
+                ncss += batch_ncss
+            elif not batch:
+                break
+    return cssl, ncss, css_numbers
+
+
+def sequence_digest(aa_seq):
+    """ Makes the key of an amino acid sequence for the ScanMemo.
+
+    :param aa_seq: an amino acid sequence, as string or bytes-like.
+    :return: the 16 byte blake2b digest of the sequence.
+    """
+    if isinstance(aa_seq, str):
+        aa_seq = aa_seq.encode()
+    return hashlib.blake2b(aa_seq, digest_size=16).digest()
+
+
+class ScanMemo:
+    """Remembers the consensus scan result of every sequence by the
+    digest of the sequence, so identical sequences, like the isoforms of
+    a gene, are only scanned once. The memo keeps at most max_size
+    sequences, the sequences which were not used for the longest time
+    are forgotten first, and it can be saved in the parse cache for the
+    next run on the same fasta file. Every fasta file has its own memo,
+    so runs on other files, like the workers of run_batch(), never
+    overwrite it.
+
+    """
+
+    def __init__(self, max_size=SCAN_MEMO_SIZE):
+        """ Makes an empty memo.
+
+        :param max_size: the highest number of sequences in the memo.
+        """
+        self.max_size = max_size
+        self.results = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, filename, max_size=SCAN_MEMO_SIZE):
+        """ Loads the memo of the last run on a fasta file from the
+        parse cache. The memo is empty when it was made with another
+        consensus pattern.
+
+        :param filename: name of the fasta file.
+        :param max_size: the highest number of sequences in the memo.
+        :return: a ScanMemo object.
+        """
+        memo = cls(max_size)
+        try:
+            entry = _read_cache_file(_cache_path(filename, "scan-memo"))
+            if entry["version"] == CACHE_VERSION and \
+                    entry["pattern"] == ZINC_FINGER_PATTERN.pattern:
+                digests = entry["digests"].tobytes()
+                size = len(sequence_digest(b""))
+                if len(digests) != size * len(entry["consensus"]):
+                    raise ValueError("the scan memo is damaged")
+                results = [(digests[index * size:(index + 1) * size], css)
+                           for index, css in enumerate(entry["consensus"])]
+                for digest, css in results[-max_size:]:
+                    memo.results[digest] = css
+        except (OSError, KeyError, TypeError, ValueError, struct.error):
+            memo.results.clear()
+        return memo
+
+    def save(self, filename):
+        """ Saves the memo of a fasta file in the parse cache. The file
+        is written under a name of its own next to the old one and then
+        renamed, so runs at the same time never write in the same file.
+
+        :param filename: name of the fasta file.
+        :return: nothing
+        """
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            _write_cache_file(_cache_path(filename, "scan-memo"),
+                              {"version": CACHE_VERSION,
+                               "pattern": ZINC_FINGER_PATTERN.pattern,
+                               "digests": array.array(
+                                   "B", b"".join(self.results)),
+                               "consensus": list(self.results.values())})
+        except OSError:
+            print("The scan memo could not be written in "
+                  "ScanMemo.save().")
+
+    def __len__(self):
+        return len(self.results)
+
+    def __contains__(self, digest):
+        return digest in self.results
+
+    def get(self, digest):
+        """ Returns the remembered result of a sequence and marks it as
+        used.
+
+        :param digest: the sequence_digest() of the sequence.
+        :return: the found consensus, or None when the sequence has no
+        consensus.
+        """
+        self.results.move_to_end(digest)
+        return self.results[digest]
+
+    def put(self, digest, css):
+        """ Remembers the result of a sequence, and forgets the least
+        recently used sequence when the memo is full.
+
+        :param digest: the sequence_digest() of the sequence.
+        :param css: the found consensus, or None.
+        :return: nothing
+        """
+        self.results[digest] = css
+        self.results.move_to_end(digest)
+        if len(self.results) > self.max_size:
+            self.results.popitem(last=False)
+
+
+def scan_consensus_memoized(sequences, memo, workers=1,
+                            batch_size=CONSENSUS_BATCH_SIZE):
+    """ Searches for the zinc finger consensus like scan_consensus(),
+    but only scans the sequences which are not in the memo, and every
+    unique sequence only once. The results of the scanned sequences are
+    then copied to every sequence with the same digest.
+
+    :param sequences: iterable of amino acid sequences.
+    :param memo: a ScanMemo object, the results of the new sequences
+    are added to it.
+    :param workers: the number of worker processes, 1 scans in this
+    process.
+    :param batch_size: the number of sequences in one batch.
+    :return: tuple of the list of found consensus sequences, the number
+    of sequences without the consensus and the list of the numbers of
+    the sequences with the consensus.
+    """
+    digests = []
+    results = {}
+    new_digests = []
+
+    def new_sequences():
+        for aa_seq in sequences:
+            digest = sequence_digest(aa_seq)
+            digests.append(digest)
+            if digest in results:
+                continue
+            if digest in memo:
+                memo.hits += 1
+                results[digest] = memo.get(digest)
+            else:
+                memo.misses += 1
+                results[digest] = None
+                new_digests.append(digest)
+                yield aa_seq
+
+    new_cssl, _, new_numbers = scan_consensus(new_sequences(), workers,
+                                              batch_size)
+    for css, number in zip(new_cssl, new_numbers):
+        results[new_digests[number]] = css
+    for digest in new_digests:
+        memo.put(digest, results[digest])
+    cssl = []
+    css_numbers = []
+    for number, digest in enumerate(digests):
+        css = results[digest]
+        if css is not None:
+            cssl.append(css)
+            css_numbers.append(number)
+    return cssl, len(digests) - len(cssl), css_numbers
+
+
+def prosite_to_regex(prosite):
+    """ Converts a PROSITE pattern into a regular expression, for
+    example C-x(2,4)-C-x(3)-[LIVMFYWC]-x(8)-H-x(3,5)-H.
+
+    :param prosite: the PROSITE pattern.
+    :return: the regular expression as a string.
+    """
+    prosite = prosite.strip().rstrip(".")
+    regex = ""
+    if prosite.startswith("<"):
+        regex += "^"
+        prosite = prosite[1:]
+    c_terminal = prosite.endswith(">")
+    if c_terminal:
+        prosite = prosite[:-1]
+    for element in prosite.split("-"):
+        found = PROSITE_ELEMENT.match(element)
+        if found is None:
+            raise ValueError("Unknown PROSITE element: " + element)
+        residues, minimum, maximum = found.groups()
+        if residues == "x":
+            residues = "."
+        elif residues.startswith("{"):
+            residues = "[^" + residues[1:-1] + "]"
+        regex += residues
+        if maximum is not None:
+            regex += "{" + minimum + "," + maximum + "}"
+        elif minimum is not None:
+            regex += "{" + minimum + "}"
+    if c_terminal:
+        regex += "$"
+    return regex
+
+
+# The motifs MotifScanner uses when no other motifs are given.
+ZINC_FINGER_MOTIFS = {
+    "zinc_finger": ZINC_FINGER_PATTERN.pattern,
+    "C2H2": prosite_to_regex("C-x(2,4)-C-x(3)-[LIVMFYWC]-x(8)-H-x(3,5)-H"),
+}
+
+
+class MotifScanner:
+    """Scans amino acid sequences for a set of named motifs at the same
+    time and reports every occurrence of every motif.
+
+    """
+
+    def __init__(self, motifs=None):
+        """ Converting the motifs into one combined pattern, so every
+        sequence only has to be scanned once for all motifs.
+
+        :param motifs: dictionary with the name of the motif as key and
+        the regular expression of the motif as value, default are the
+        ZINC_FINGER_MOTIFS.
+        """
+        if motifs is None:
+            motifs = ZINC_FINGER_MOTIFS
+        self.set_motifs(motifs)
+
+    def set_motifs(self, motifs):
+        """ Converting the motifs into an object and combining them into
+        one pattern. The combined pattern is a lookahead over all
+        motifs, so it finds every position where at least one motif
+        starts, overlapping occurrences included. Only at those
+        positions the separate motifs are matched.
+
+        :param motifs: dictionary with the name of the motif as key and
+        the regular expression of the motif as value.
+        :return: nothing
+        """
+        self.motifs = dict(motifs)
+        self.compiled = [(name, re.compile(pattern))
+                         for name, pattern in self.motifs.items()]
+        self.pattern = re.compile("(?=" + "|".join(
+            "(?:" + pattern + ")" for pattern in self.motifs.values()) +
+            ")")
+
+    def get_motifs(self):
+        """ Returns the motifs dictionary object.
+
+        :return: dictionary with the name of the motif as key and the
+        regular expression of the motif as value.
+        """
+        return self.motifs
+
+    def scan(self, aa_seq):
+        """ Searches for every occurrence of every motif in one amino
+        acid sequence.
+
+        :param aa_seq: an amino acid sequence.
+        :return: list of MotifHit objects, ordered by position.
+        """
+        hits = []
+        for found in self.pattern.finditer(aa_seq):
+            start = found.start()
+            for name, motif in self.compiled:
+                hit = motif.match(aa_seq, start)
+                if hit:
+                    hits.append(MotifHit(name, start, hit.end(),
+                                         hit.group()))
+        return hits
+
+    def scan_records(self, records):
+        """ Searches for every occurrence of every motif in a stream of
+        (header, sequence) records, like the ones from iter_fasta().
+
+        :param records: iterable of (header, sequence) tuples.
+        :return: generator of (header, hits) tuples for the records
+        which contain at least one motif.
+        """
+        for header, aa_seq in records:
+            hits = self.scan(aa_seq)
+            if hits:
+                yield header, hits
+
+    def count(self, records):
+        """ Counts the occurrences of every motif in a stream of
+        (header, sequence) records.
+
+        :param records: iterable of (header, sequence) tuples.
+        :return: Counter with the name of the motif as key and the
+        number of occurrences as value.
+        """
+        motif_counts = collections.Counter()
+        for _, hits in self.scan_records(records):
+            for hit in hits:
+                motif_counts[hit.name] += 1
+        return motif_counts
+
+
+class ConsensusCheck:
+    """Checks if the is a consensus pattern in the amino acids sequences
+
+    """
+
+    def __init__(self, headers, seq, workers=1, memo=None):
+        """ Converting the parameters into an object.
+        Checking with the given parameters if there is a concencus
+        pattern in the amino acids sequences.
+
+        :param headers: list of headers of amino acids.
+        :param seq: list of amino acids sequences.
+        :param workers: the number of worker processes for the scan.
+        :param memo: a ScanMemo object with the results of earlier
+        scans, default is to scan every sequence.
+        """
+        try:
+            self.set_headers(headers)
+            self.set_aa_seq(seq)
+            self.set_workers(workers)
+            self.set_memo(memo)
+            self.set_consensus()
+        except AttributeError:
+            print("There was an Attribute Error in Class ConsensusCheck"
+                  " in the init()")
+
+    @classmethod
+    def from_records(cls, records, workers=1, memo=None):
+        """ Makes a ConsensusCheck from a stream of (header, sequence)
+        records, like the ones from iter_fasta(). The sequences are
+        checked while they are read, so they are never all in memory
+        at the same time.
+
+        :param records: iterable of (header, sequence) tuples.
+        :param workers: the number of worker processes for the scan.
+        :param memo: a ScanMemo object, default is no memo.
+        :return: a ConsensusCheck object.
+        """
+        headers = []
+
+        def sequences():
+            for header, seq in records:
+                headers.append(header)
+                yield seq
+
+        return cls(headers, sequences(), workers, memo)
+
+    @classmethod
+    def from_store(cls, store, workers=1, memo=None):
+        """ Makes a ConsensusCheck from a SequenceStore. The sequences
+        are scanned as memoryviews of the store, so they are not copied.
+
+        :param store: a SequenceStore object.
+        :param workers: the number of worker processes for the scan.
+        :param memo: a ScanMemo object, default is no memo.
+        :return: a ConsensusCheck object.
+        """
+        return cls(store.headers, store.iter_sequences(), workers, memo)
+
+    @classmethod
+    def from_pssm(cls, store, pssm=None, threshold=PSSM_THRESHOLD):
+        """ Makes a ConsensusCheck with the scoring matrix of
+        scan_pssm() instead of the regular expression, so zinc fingers
+        with a substitution are also found.
+
+        :param store: a SequenceStore object.
+        :param pssm: the scoring matrix, default is the zinc finger
+        consensus.
+        :param threshold: the lowest score of a hit.
+        :return: a ConsensusCheck object, or None when NumPy is not
+        installed.
+        """
+        results = pssm_consensus(store, pssm, threshold)
+        if results is None:
+            return None
+        cssl, ncss, css_numbers = results
+        return cls.from_results(store.headers, cssl, ncss, css_numbers)
+
+    @classmethod
+    def from_results(cls, headers, consensus, ncss, consensus_index):
+        """ Makes a ConsensusCheck from earlier results, like the ones
+        from the parse cache, without scanning the sequences again.
+
+        :param headers: list of headers of amino acids.
+        :param consensus: list of found zinc finger consensus sequences.
+        :param ncss: the number of sequences without the consensus.
+        :param consensus_index: list of the numbers of the sequences
+        with the consensus.
+        :return: a ConsensusCheck object.
+        """
+        consensus_check = cls.__new__(cls)
+        consensus_check.set_headers(headers)
+        consensus_check.set_aa_seq(None)
+        consensus_check.set_workers(1)
+        consensus_check.set_memo(None)
+        consensus_check.consensus = consensus
+        consensus_check.ncss = ncss
+        consensus_check.consensus_index = consensus_index
+        return consensus_check
+
+    def set_headers(self, headers):
+        """ Converting the headers list into an object.
+
+        :param headers: list of headers of amino acids.
+        :return: nothing
+        """
+        try:
+            self.headers = headers
+        except AttributeError:
+            print("There was an Attribute Error in Class ConsensusCheck"
+                  " set_headers()")
+
+    def get_headers(self):
+        """ Returns the headers list object.
+
+        :return: An headers list object
+        """
+        try:
+            return self.headers
+        except AttributeError:
+            print("There was an Attribute Error in Class ConsensusCheck"
+                  " in get_headers()")
+
+    def set_aa_seq(self, seq):
+        """ Converting the amino acid sequences list into an
+        object.
+
+        :param seq: an amino acid sequences list object
+        :return: nothing
+        """
+        try:
+            self.aa_seq = seq
+        except AttributeError:
+            print("There was an Attribute Error in Class ConsensusCheck"
+                  " in set_aa_seq()")
+
+    def get_aa_seq(self):
         """ Returns the amino acid sequences list object.
 
         :return:
@@ -230,87 +2907,792 @@ class ConsensusCheck:
             print("There was an Attribute Error in Class ConsensusCheck"
                   " in get_aa_seq()")
 
+    def set_workers(self, workers):
+        """ Converting the number of worker processes into an object.
+
+        :param workers: the number of worker processes, 1 scans the
+        sequences without a process pool.
+        :return: nothing
+        """
+        try:
+            self.workers = max(1, workers)
+        except TypeError:
+            print("There was a Type Error in Class ConsensusCheck"
+                  " in set_workers()")
+
+    def get_workers(self):
+        """ Returns the number of worker processes object.
+
+        :return: An integer object which is the number of worker
+        processes.
+        """
+        try:
+            return self.workers
+        except AttributeError:
+            print("There was an Attribute Error in Class ConsensusCheck"
+                  " in get_workers()")
+
+    def set_memo(self, memo):
+        """ Converting the memo of the scan results into an object.
+
+        :param memo: a ScanMemo object, or None to scan every sequence.
+        :return: nothing
+        """
+        try:
+            self.memo = memo
+        except AttributeError:
+            print("There was an Attribute Error in Class ConsensusCheck"
+                  " in set_memo()")
+
+    def get_memo(self):
+        """ Returns the memo of the scan results object.
+
+        :return: a ScanMemo object, or None.
+        """
+        try:
+            return self.memo
+        except AttributeError:
+            print("There was an Attribute Error in Class ConsensusCheck"
+                  " in get_memo()")
+
     def set_consensus(self):
         """ Searches for the zinc finger consensus and puts the
         sequences which contain the consensus in a list and then into a
         object.
 
-        :return: nothing
-        """
-        try:
-            ncss = 0
-            cssl = []
-            for aa_seq in self.get_aa_seq():
-                css = re.search(r"C[A-Z]{2}C[A-Z]{2}C[A-Z]{5}C[A-Z]{2}"
-                                r"C[A-Z]{2}C", aa_seq)
-                if css:
-                    cssl.append(css.group())
-                    self.consensus = cssl
-                else:
-                    ncss += 1
-            self.ncss = ncss
-        except AttributeError:
-            print("There was an Attribute Error in Class ConsensusCheck"
-                  " in set_consensus()")
-        except ModuleNotFoundError:
-            print("The re-module could not be found in Class "
-                  "ConsensusCheck in set_consensus()")
+        :return: nothing
+        """
+        try:
+            with stage("ConsensusCheck.set_consensus") as record:
+                if self.get_memo() is None:
+                    cssl, ncss, css_numbers = scan_consensus(
+                        self.get_aa_seq(), self.get_workers())
+                else:
+                    cssl, ncss, css_numbers = scan_consensus_memoized(
+                        self.get_aa_seq(), self.get_memo(),
+                        self.get_workers())
+                record.items = len(cssl) + ncss
+            self.consensus = cssl
+            self.consensus_index = css_numbers
+            self.ncss = ncss
+        except AttributeError:
+            print("There was an Attribute Error in Class ConsensusCheck"
+                  " in set_consensus()")
+        except ModuleNotFoundError:
+            print("The re-module could not be found in Class "
+                  "ConsensusCheck in set_consensus()")
+
+    def get_consensus(self):
+        """ Returns the zinc finger consensus list object
+
+        :return: an zinc finger consensus list object
+        """
+        try:
+            return self.consensus
+        except AttributeError:
+            print("There was an Attribute Error in Class ConsensusCheck"
+                  " in get_consensus()")
+
+    def get_consensus_headers(self):
+        """ Returns the headers of the amino acid sequences which
+        contain the zinc finger consensus, in the same order as the
+        consensus list.
+
+        :return: list of headers.
+        """
+        try:
+            return [self.headers[number]
+                    for number in self.consensus_index]
+        except AttributeError:
+            print("There was an Attribute Error in Class ConsensusCheck"
+                  " in get_consensus_headers()")
+
+    def get_non_consensus(self):
+        """ Returns an integer object which is the number of amino acid
+        sequences which do not contain the zinc finger consensus.
+
+        :return: An integer object which is the number of amino acid
+        sequences which do not contain the zinc finger consensus.
+        """
+        try:
+            return self.ncss
+        except AttributeError:
+            print("There was an Attribute Error in Class ConsensusCheck"
+                  " in get_non_consensus()")
+
+
+def file_fingerprint(filename):
+    """ Makes the key of a file for the parse cache from the path, size,
+    modification time and a hash of the content. Only the start, the
+    middle and the end of the file are hashed, so the key of a large
+    file is made without reading the whole file. The hash is partial:
+    a change outside those blocks which keeps the size and the
+    modification time of the file is not noticed.
+
+    :param filename: name of the file.
+    :return: tuple of the absolute path, the size, the modification
+    time in nanoseconds and the hexadecimal content hash.
+    """
+    status = os.stat(filename)
+    content_hash = hashlib.blake2b(digest_size=16)
+    with open(filename, "rb") as handle:
+        for position in (0, status.st_size // 2,
+                         status.st_size - FINGERPRINT_BLOCK_SIZE):
+            handle.seek(max(0, position))
+            content_hash.update(handle.read(FINGERPRINT_BLOCK_SIZE))
+    return (os.path.abspath(filename), status.st_size,
+            status.st_mtime_ns, content_hash.hexdigest())
+
+
+def _cache_path(filename, kind):
+    """ Returns the name of the cache file of an input file.
+
+    :param filename: name of the input file.
+    :param kind: the kind of parse results, like "fasta" or "gff3".
+    :return: name of the cache file.
+    """
+    name = hashlib.blake2b(os.path.abspath(filename).encode(),
+                           digest_size=16).hexdigest()
+    return os.path.join(CACHE_DIR, kind + "-" + name + ".cache")
+
+
+def _write_cache_file(path, entry):
+    """ Writes an entry to a cache file: the magic bytes, the length of
+    the header, the header as JSON and then the bytes of every array of
+    the entry. Unlike a pickle, reading the file back never runs code
+    from the file. The file is written under a name of its own next to
+    the old one and then renamed.
+
+    :param path: name of the cache file.
+    :param entry: dictionary with array.array objects and values which
+    can be written as JSON.
+    :return: nothing
+    """
+    header = {"byteorder": sys.byteorder, "fields": {}, "arrays": {}}
+    position = 0
+    for name, value in entry.items():
+        if isinstance(value, array.array):
+            size = len(value) * value.itemsize
+            header["arrays"][name] = [value.typecode, position, size]
+            position += size
+        else:
+            header["fields"][name] = value
+    encoded = json.dumps(header).encode()
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path),
+                                     suffix=".tmp", delete=False) as cache:
+        cache.write(CACHE_MAGIC)
+        cache.write(struct.pack("<Q", len(encoded)))
+        cache.write(encoded)
+        for name in header["arrays"]:
+            cache.write(memoryview(entry[name]).cast("B"))
+    os.replace(cache.name, path)
+
+
+def _read_cache_file(path):
+    """ Reads an entry from a cache file of _write_cache_file().
+
+    :param path: name of the cache file.
+    :return: dictionary with the entry.
+    :raises ValueError: when the file is no cache file, or was written
+    on a computer with another byte order.
+    """
+    with open(path, "rb") as cache:
+        content = cache.read()
+    if content[:len(CACHE_MAGIC)] != CACHE_MAGIC:
+        raise ValueError("no cache file")
+    size = struct.unpack_from("<Q", content, len(CACHE_MAGIC))[0]
+    start = len(CACHE_MAGIC) + 8 + size
+    header = json.loads(content[len(CACHE_MAGIC) + 8:start])
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError("the cache file has another byte order")
+    entry = header["fields"]
+    for name, (typecode, offset, size) in header["arrays"].items():
+        values = array.array(typecode)
+        values.frombytes(content[start + offset:start + offset + size])
+        entry[name] = values
+    return entry
+
+
+def load_cached(filename, kind):
+    """ Loads the parse results of a file from the parse cache. The
+    results are only used when the file_fingerprint() of the file is the
+    same, which hashes only part of the content, see there.
+
+    :param filename: name of the input file.
+    :param kind: the kind of parse results, like "fasta" or "gff3".
+    :return: the cached parse results, or None when there are no
+    cached results for the current content of the file.
+    """
+    try:
+        entry = _read_cache_file(_cache_path(filename, kind))
+        if entry.pop("version") != CACHE_VERSION or \
+                entry.pop("key") != list(file_fingerprint(filename)):
+            return None
+        return entry
+    except (OSError, KeyError, TypeError, ValueError, struct.error):
+        return None
+
+
+def save_cached(filename, kind, data):
+    """ Saves the parse results of a file in the parse cache. The cache
+    file is written next to the old one and then renamed, so a broken
+    run never leaves half a cache file behind.
+
+    :param filename: name of the input file.
+    :param kind: the kind of parse results, like "fasta" or "gff3".
+    :param data: dictionary with the parse results, the values are
+    array.array objects or values which can be written as JSON.
+    :return: nothing
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        entry = dict(data)
+        entry["version"] = CACHE_VERSION
+        entry["key"] = list(file_fingerprint(filename))
+        _write_cache_file(_cache_path(filename, kind), entry)
+    except OSError:
+        print("The parse cache could not be written in save_cached().")
+
+
+@instrumented("cached_feature_counts",
+              lambda counts: sum(counts.values()))
+def cached_feature_counts(filename=GFF3_FILE, workers=None,
+                          progress=None):
+    """ Returns the feature type table of the gff3 file from the parse
+    cache, and only counts the feature types when the file changed.
+
+    :param filename: name of the gff3 file.
+    :param workers: the number of worker processes for the counting.
+    :param progress: function which is called with how far the
+    counting is, see count_feature_types_parallel().
+    :return: Counter with the feature type as key and the frequency of
+    that feature type in the gff3 file as value.
+    """
+    try:
+        # Checks first if the file is there at all
+        os.stat(filename)
+        data = load_cached(filename, "gff3")
+        if data is not None:
+            return collections.Counter(data["feature_counts"])
+        feature_counts = count_feature_types_parallel(filename, workers,
+                                                      progress)
+        if feature_counts is not None:
+            save_cached(filename, "gff3",
+                        {"feature_counts": dict(feature_counts)})
+        return feature_counts
+    except FileNotFoundError:
+        print("The gff3 file was not found in cached_feature_counts().")
+
+
+@instrumented("cached_consensus_check",
+              lambda check: len(check.get_headers()))
+def cached_consensus_check(filename=FASTA_FILE, workers=1,
+                           progress=None):
+    """ Returns the ConsensusCheck of the fasta file from the parse
+    cache, and only reads and scans the file when it changed. The
+    cache also keeps the byte offset of every record. When the file
+    changed, only the sequences which are not in the ScanMemo of the
+    last runs are scanned.
+
+    :param filename: name of the fasta file.
+    :param workers: the number of worker processes for the scan.
+    :param progress: function which is called with the number of bytes
+    and sequences read, see iter_fasta_offsets().
+    :return: a ConsensusCheck object.
+    """
+    try:
+        # Checks first if the file is there at all
+        os.stat(filename)
+        data = load_cached(filename, "fasta")
+        if data is not None:
+            return ConsensusCheck.from_results(data["headers"],
+                                               data["consensus"],
+                                               data["ncss"],
+                                               data["consensus_index"])
+        offsets = array.array("Q")
+
+        def records():
+            for offset, header, seq in iter_fasta_offsets(filename,
+                                                          progress):
+                offsets.append(offset)
+                yield header, seq
+
+        memo = ScanMemo.load(filename)
+        consensus_check = ConsensusCheck.from_records(records(), workers,
+                                                      memo)
+        memo.save(filename)
+        save_cached(filename, "fasta",
+                    {"headers": consensus_check.get_headers(),
+                     "offsets": offsets,
+                     "consensus": consensus_check.get_consensus(),
+                     "ncss": consensus_check.get_non_consensus(),
+                     "consensus_index": consensus_check.consensus_index})
+        return consensus_check
+    except FileNotFoundError:
+        print("The fasta file was not found in "
+              "cached_consensus_check().")
+
+
+class Gff3Columns:
+    """Keeps the gff3 file as columns in a binary file, which is opened
+    with mmap. The seqids, sources and feature types are numbers in a
+    dictionary, the positions are integer arrays and the attributes are
+    one block of bytes with an offset per feature. Opening the file
+    parses nothing, the columns are memoryviews of the mapped file.
+    select(), lengths() and length_distribution() need NumPy.
+
+    """
+
+    # The columns with their array typecode, the attributes are stored
+    # as offsets and one block of bytes.
+    COLUMNS = [("seqid", "I"), ("source", "I"), ("type", "I"),
+               ("start", "q"), ("end", "q"), ("score", "d"),
+               ("strand", "B"), ("phase", "b"),
+               ("attribute_offsets", "Q"), ("attributes", "B")]
+
+    def __init__(self, header, columns, mapped=None):
+        """ Converting the header and the columns into an object.
+
+        :param header: dictionary with the number of rows and the
+        names of the seqids, sources and feature types.
+        :param columns: dictionary with the name of the column as key
+        and an array or memoryview as value.
+        :param mapped: the mmap object of the file, if there is one.
+        """
+        self.header = header
+        self.columns = columns
+        self.mapped = mapped
+        self.seqids = header["seqids"]
+        self.sources = header["sources"]
+        self.types = header["types"]
+
+    @classmethod
+    def from_gff3(cls, filename=GFF3_FILE):
+        """ Reads the gff3 file once into columns.
+
+        :param filename: name of the gff3 file, may be compressed.
+        :return: a Gff3Columns object with arrays as columns.
+        """
+        columns = {name: array.array(typecode)
+                   for name, typecode in cls.COLUMNS}
+        codes = {"seqid": {}, "source": {}, "type": {}}
+        attributes = bytearray()
+        columns["attribute_offsets"].append(0)
+        with open_input(filename, "rb") as gff3:
+            for line in gff3:
+                if line.startswith(b"#"):
+                    continue
+                fields = line.rstrip(b"\r\n").split(b"\t", 8)
+                if len(fields) < 9:
+                    continue
+                for name, field in (("seqid", fields[0]),
+                                    ("source", fields[1]),
+                                    ("type", fields[2])):
+                    code = codes[name].get(field)
+                    if code is None:
+                        code = codes[name][field] = len(codes[name])
+                    columns[name].append(code)
+                columns["start"].append(int(fields[3]))
+                columns["end"].append(int(fields[4]))
+                columns["score"].append(
+                    float("nan") if fields[5] == b"." else float(fields[5]))
+                columns["strand"].append(fields[6][0] if fields[6]
+                                         else ord("."))
+                columns["phase"].append(
+                    -1 if fields[7] == b"." else int(fields[7]))
+                attributes += fields[8]
+                columns["attribute_offsets"].append(len(attributes))
+        columns["attributes"] = array.array("B", attributes)
+        header = {"rows": len(columns["start"])}
+        for name in ("seqid", "source", "type"):
+            header[name + "s"] = [value.decode() for value in codes[name]]
+        return cls(header, columns)
+
+    def write(self, path, key=None):
+        """ Writes the columns to a binary file: the magic bytes, the
+        length of the header, the header as JSON and then every column,
+        starting at a multiple of 8 bytes. The file is written next to
+        the old one and then renamed.
+
+        :param path: name of the binary file.
+        :param key: the file_fingerprint() of the gff3 file.
+        :return: nothing
+        """
+        header = dict(self.header)
+        header["version"] = CACHE_VERSION
+        header["byteorder"] = sys.byteorder
+        header["key"] = list(key) if key is not None else None
+        header["columns"] = {}
+        position = 0
+        for name, typecode in self.COLUMNS:
+            size = len(self.columns[name]) * \
+                array.array(typecode).itemsize
+            header["columns"][name] = [typecode, position, size]
+            position += -(-size // 8) * 8
+        encoded = json.dumps(header).encode()
+        start = -(-(len(COLUMNS_MAGIC) + 8 + len(encoded)) // 8) * 8
+        with open(path + ".tmp", "wb") as output:
+            output.write(COLUMNS_MAGIC)
+            output.write(struct.pack("<Q", len(encoded)))
+            output.write(encoded)
+            for name, _ in self.COLUMNS:
+                output.seek(start + header["columns"][name][1])
+                output.write(memoryview(self.columns[name]).cast("B"))
+            output.truncate(start + position)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path, key=None):
+        """ Opens a binary file of write() with mmap, the columns are
+        memoryviews of the mapped file, so nothing is parsed or copied.
+
+        :param path: name of the binary file.
+        :param key: the file_fingerprint() the file must have been made
+        from, default is any.
+        :return: a Gff3Columns object, or None when the file is not
+        there, is of another version or was made from another file.
+        """
+        try:
+            with open(path, "rb") as handle:
+                mapped = mmap.mmap(handle.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        view = memoryview(mapped)
+        columns = {}
+        try:
+            size = struct.unpack_from("<Q", view, len(COLUMNS_MAGIC))[0]
+            if bytes(view[:len(COLUMNS_MAGIC)]) != COLUMNS_MAGIC:
+                raise ValueError("no columns file")
+            end = len(COLUMNS_MAGIC) + 8 + size
+            header = json.loads(bytes(view[len(COLUMNS_MAGIC) + 8:end]))
+            if header["version"] != CACHE_VERSION or \
+                    header["byteorder"] != sys.byteorder or \
+                    (key is not None and header["key"] != list(key)):
+                raise ValueError("columns file is out of date")
+            start = -(-end // 8) * 8
+            for name, (typecode, offset, size) in \
+                    header["columns"].items():
+                columns[name] = view[start + offset:
+                                     start + offset + size].cast(typecode)
+        except (KeyError, TypeError, ValueError, struct.error):
+            columns.clear()
+            view.release()
+            mapped.close()
+            return None
+        return cls(header, columns, mapped)
+
+    @classmethod
+    def cached(cls, filename=GFF3_FILE):
+        """ Returns the columns of the gff3 file from the parse cache,
+        and only converts the gff3 file when it changed.
+
+        :param filename: name of the gff3 file.
+        :return: a Gff3Columns object, or None when the file is not
+        found.
+        """
+        try:
+            key = file_fingerprint(filename)
+            path = _cache_path(filename, "columns")
+            columns = cls.load(path, key)
+            if columns is not None:
+                return columns
+            columns = cls.from_gff3(filename)
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                columns.write(path, key)
+            except OSError:
+                print("The parse cache could not be written in "
+                      "Gff3Columns.cached().")
+                return columns
+            return cls.load(path, key) or columns
+        except FileNotFoundError:
+            print("The gff3 file was not found in Gff3Columns.cached().")
+
+    def __len__(self):
+        return self.header["rows"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """ Closes the mapped file. When NumPy arrays of the columns
+        still exist the file stays open until they are gone.
+
+        :return: nothing
+        """
+        if self.mapped is not None:
+            for column in self.columns.values():
+                try:
+                    column.release()
+                except BufferError:
+                    pass
+            self.columns = {}
+            try:
+                self.mapped.close()
+            except BufferError:
+                pass
+            self.mapped = None
+
+    def get_attributes(self, row):
+        """ Returns the attributes column of one feature.
+
+        :param row: the number of the feature.
+        :return: the attributes as a string.
+        """
+        offsets = self.columns["attribute_offsets"]
+        return bytes(self.columns["attributes"][
+            offsets[row]:offsets[row + 1]]).decode()
+
+    def column(self, name):
+        """ Returns one column as a NumPy array without copying it.
+
+        :param name: the name of the column, like "start".
+        :return: a NumPy array.
+        """
+        import numpy
+        return numpy.asarray(self.columns[name])
+
+    def feature_counts(self):
+        """ Counts the features of every type with one bincount over the
+        type column, or without NumPy by counting the type numbers.
+
+        :return: Counter with the feature type as key and the frequency
+        of that feature type as value.
+        """
+        try:
+            import numpy
+            counts = numpy.bincount(self.column("type"),
+                                    minlength=len(self.types)).tolist()
+        except ModuleNotFoundError:
+            numbers = collections.Counter(self.columns["type"])
+            counts = [numbers[code] for code in range(len(self.types))]
+        return collections.Counter({feature_type: count
+                                    for feature_type, count
+                                    in zip(self.types, counts) if count})
+
+    def select(self, feature_type=None, seqid=None, strand=None,
+               start=None, end=None):
+        """ Finds the features which match all given filters, with one
+        vectorized comparison per filter.
+
+        :param feature_type: only features of this type.
+        :param seqid: only features on this seqid.
+        :param strand: only features on this strand, "+" or "-".
+        :param start: only features which end at or after this position.
+        :param end: only features which start at or before this
+        position.
+        :return: NumPy array with the numbers of the features.
+        """
+        import numpy
+        mask = numpy.ones(len(self), dtype=bool)
+        for name, names, value in (("type", self.types, feature_type),
+                                   ("seqid", self.seqids, seqid)):
+            if value is not None:
+                if value not in names:
+                    return numpy.zeros(0, dtype=numpy.int64)
+                mask &= self.column(name) == names.index(value)
+        if strand is not None:
+            mask &= self.column("strand") == ord(strand)
+        if start is not None:
+            mask &= self.column("end") >= start
+        if end is not None:
+            mask &= self.column("start") <= end
+        return numpy.flatnonzero(mask)
+
+    def lengths(self, feature_type=None, **filters):
+        """ Returns the lengths of the features.
+
+        :param feature_type: only features of this type, default is
+        every feature.
+        :param filters: other filters of select().
+        :return: NumPy array with the length of every selected feature.
+        """
+        rows = self.select(feature_type, **filters)
+        return self.column("end")[rows] - self.column("start")[rows] + 1
+
+    def length_distribution(self, feature_type=None, bins=20,
+                            **filters):
+        """ Describes the lengths of the features of one type.
+
+        :param feature_type: only features of this type, default is
+        every feature.
+        :param bins: the number of bins of the histogram.
+        :param filters: other filters of select().
+        :return: dictionary with the count, minimum, median, mean and
+        maximum length and a histogram as lists of counts and bin edges.
+        """
+        import numpy
+        lengths = self.lengths(feature_type, **filters)
+        if not len(lengths):
+            return {"count": 0}
+        counts, edges = numpy.histogram(lengths, bins=bins)
+        return {"count": int(len(lengths)),
+                "min": int(lengths.min()),
+                "median": float(numpy.median(lengths)),
+                "mean": float(lengths.mean()),
+                "max": int(lengths.max()),
+                "histogram": counts.tolist(),
+                "edges": edges.tolist()}
+
+
+# The queue for the progress of the gff3 process of load_genome(), it is
+# only set in that process.
+_gff3_progress_queue = None
+
+
+def _init_gff3_process(progress_queue):
+    """ Remembers the progress queue in the gff3 process of
+    load_genome(). A multiprocessing queue can only be given to a
+    process when it starts, not with every task.
+
+    :param progress_queue: multiprocessing queue, or None.
+    :return: nothing
+    """
+    global _gff3_progress_queue
+    _gff3_progress_queue = progress_queue
+
+
+def _load_feature_counts(gff3_name, workers, instrument=None):
+    """ Counts the feature types in the gff3 process of load_genome(),
+    and sends the progress back over the progress queue. The stages of
+    this process are recorded in an instrumentation of its own, which is
+    sent back with the counts.
+
+    :param gff3_name: name of the gff3 file.
+    :param workers: the number of worker processes for the counting.
+    :param instrument: tuple of the profile and the memory stage of the
+    instrumentation, or None when the instrumentation is disabled.
+    :return: tuple of the Counter with the frequency of every feature
+    type and the report() of the instrumentation, or None.
+    """
+    progress = None
+    if _gff3_progress_queue is not None:
+        def progress(done, items):
+            _gff3_progress_queue.put((done, items))
+    if instrument is not None:
+        enable_instrumentation(*instrument)
+    try:
+        feature_counts = cached_feature_counts(gff3_name, workers,
+                                               progress)
+    finally:
+        instrumentation = disable_instrumentation()
+    if instrumentation is None:
+        return feature_counts, None
+    return feature_counts, instrumentation.report()
+
+
+@instrumented("load_genome")
+def load_genome(fasta_name=FASTA_FILE, gff3_name=GFF3_FILE, workers=None,
+                fasta_progress=None, gff3_progress=None, gff3_ready=None):
+    """ Loads the fasta and the gff3 file at the same time. The gff3 file
+    is counted in a separate process while this process reads and scans
+    the fasta file, so the waiting for one file overlaps with the work
+    on the other one and the total time is about the time of the slower
+    file. The workers are divided over the two files.
+
+    :param fasta_name: name of the fasta file.
+    :param gff3_name: name of the gff3 file.
+    :param workers: the number of worker processes, default is the
+    number of CPUs.
+    :param fasta_progress: function which is called with the number of
+    bytes and sequences read, see iter_fasta_offsets().
+    :param gff3_progress: function which is called with how far the
+    counting is, see count_feature_types_parallel().
+    :param gff3_ready: function which is called with the feature counts
+    as soon as they are ready, before the fasta file is done.
+    :return: tuple of the feature counts and the ConsensusCheck, each
+    None when its file could not be read.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    gff3_workers = max(1, workers // 2)
+    fasta_workers = max(1, workers - gff3_workers)
+    context = process_context()
+    progress_queue = None
+    forwarder = None
+    if gff3_progress is not None:
+        progress_queue = context.Queue()
+
+        def forward():
+            for done, items in iter(progress_queue.get, None):
+                gff3_progress(done, items)
+
+        forwarder = threading.Thread(target=forward, daemon=True)
+        forwarder.start()
+
+    def counted(future):
+        if future.exception() is None:
+            gff3_ready(future.result()[0])
+
+    instrument = None
+    if _instrumentation is not None:
+        instrument = (_instrumentation.profile_stage,
+                      _instrumentation.memory_stage)
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+                1, mp_context=context, initializer=_init_gff3_process,
+                initargs=(progress_queue,)) as pool:
+            future = pool.submit(_load_feature_counts, gff3_name,
+                                 gff3_workers, instrument)
+            if gff3_ready is not None:
+                future.add_done_callback(counted)
+            consensus_check = cached_consensus_check(fasta_name,
+                                                     fasta_workers,
+                                                     fasta_progress)
+            feature_counts, report = future.result()
+            if report is not None and _instrumentation is not None:
+                _instrumentation.merge(report)
+    finally:
+        if progress_queue is not None:
+            progress_queue.put(None)
+            forwarder.join()
+    return feature_counts, consensus_check
+
 
-    def get_consensus(self):
-        """ Returns the zinc finger consensus list object
+def _import_tkinter():
+    """ Imports tkinter and its messagebox the first time the GUI is
+    used.
 
-        :return: an zinc finger consensus list object
-        """
-        try:
-            return self.consensus
-        except AttributeError:
-            print("There was an Attribute Error in Class ConsensusCheck"
-                  " in get_consensus()")
+    :return: nothing
+    """
+    global tkinter
+    if tkinter is None:
+        import tkinter
+        import tkinter.messagebox
+        import tkinter.ttk
 
-    def get_non_consensus(self):
-        """ Returns an integer object which is the number of amino acid
-        sequences which do not contain the zinc finger consensus.
 
-        :return: An integer object which is the number of amino acid
-        sequences which do not contain the zinc finger consensus.
-        """
-        try:
-            return self.ncss
-        except AttributeError:
-            print("There was an Attribute Error in Class ConsensusCheck"
-                  " in get_non_consensus()")
+def _import_pyplot():
+    """ Imports matplotlib the first time a diagram is made.
+
+    :return: nothing
+    """
+    global plt
+    if plt is None:
+        import matplotlib.pyplot as plt
 
 
 class GUI:
-    def __init__(self, exon_count, cds_count, mrna_count, total_count,
-                 other_count):
-        try:
-            # Converting the given parameters into a object
-            self.exons_count = exon_count
-            self.cds_count = cds_count
-            self.mrna_count = mrna_count
-            self.total_count = total_count
-            self.other_count = other_count
-
-            # Transferring the zinc finger consensus list object and an
-            # integer object which is the number of amino acid sequences
-            # which do not contain the zinc finger consensus to this
-            # class and making it a new variable and putting it in a new
-            # object
-            fasta_list = read_fasta()
-            headers = fasta_header(fasta_list)
-            seq = fasta_seq(fasta_list)
-            zfcs = ConsensusCheck(headers, seq).get_consensus()
-            ncss = ConsensusCheck(headers, seq).get_non_consensus()
-            self.ncss = ncss
-            self.zfcs = zfcs
+    def __init__(self, feature_counts=None, consensus_check=None,
+                 fasta_name=FASTA_FILE, gff3_name=GFF3_FILE, workers=1):
+        try:
+            setup = stage("GUI setup")
+            setup.start()
+            _import_tkinter()
 
-            # Making a integer object of the number of zinc finger
-            # consensus there are
-            zinc_finger_count = 0
-            for _ in self.zfcs:
-                zinc_finger_count += 1
-            self.zfct = zinc_finger_count
+            # Converting the given parameters into a object. The
+            # feature counts and the ConsensusCheck which are not given
+            # are made by a worker thread after the window is shown.
+            self.fasta_name = fasta_name
+            self.gff3_name = gff3_name
+            self.workers = workers
+            self.progress_queue = queue.Queue()
+            self.statistics = None
 
             # Makes the main window
             self.main_window = tkinter.Tk()
@@ -349,6 +3731,11 @@ class GUI:
                                                text="Total of items "
                                                     "Info",
                                                command=self.total)
+            self.types_button = tkinter.Button(self.info_buttons_frame,
+                                               text="All feature types "
+                                                    "Info",
+                                               command=self.
+                                               feature_types)
 
             # Places the buttons for info
             self.exon_button.pack(side="left")
@@ -356,6 +3743,7 @@ class GUI:
             self.mrna_button.pack(side="left")
             self.other_button.pack(side="left")
             self.total_button.pack(side="left")
+            self.types_button.pack(side="left")
 
             # Makes the graph buttons
             self.seq_pie_button = tkinter.Button(self.
@@ -376,6 +3764,16 @@ class GUI:
                                                     command=self.
                                                     stacked_bar_graph)
 
+            # The buttons which need the feature counts, they are
+            # disabled until the feature counts are ready
+            self.feature_buttons = [self.exon_button, self.cds_button,
+                                    self.mrna_button, self.other_button,
+                                    self.total_button, self.types_button,
+                                    self.seq_pie_button, self.bar_button,
+                                    self.stacked_bar_buton]
+            for button in self.feature_buttons:
+                button.config(state="disabled")
+
             # Places the graph buttons
             self.seq_pie_button.pack(side="left")
             self.bar_button.pack(side="left")
@@ -394,10 +3792,42 @@ class GUI:
                                           text="Show Consensus Pie "
                                                "Diagram",
                                           command=self.pie_diagram_css)
+            self.statistics_button = tkinter.Button(self.
+                                                    css_buttons_frame,
+                                                    text="Show Protein "
+                                                         "Statistics "
+                                                         "Diagram",
+                                                    command=self.
+                                                    statistics_diagram)
+
+            # The buttons which need the consensus, they are disabled
+            # until the consensus check is ready. The statistics button
+            # waits for the statistics of the worker thread.
+            self.consensus_buttons = [self.consensus_button, self.css_pie]
+            for button in self.consensus_buttons + [self.statistics_button]:
+                button.config(state="disabled")
 
             # Places the consensus buttons
             self.consensus_button.pack(side="left")
             self.css_pie.pack(side="left")
+            self.statistics_button.pack(side="left")
+
+            # Makes the progress bars and labels of the files
+            self.progress_frame = tkinter.Frame(self.main_window)
+            self.gff3_label = tkinter.Label(self.progress_frame,
+                                            text="Gff3 file: waiting")
+            self.gff3_bar = tkinter.ttk.Progressbar(self.progress_frame,
+                                                    length=300)
+            self.fasta_label = tkinter.Label(self.progress_frame,
+                                             text="Fasta file: waiting")
+            self.fasta_bar = tkinter.ttk.Progressbar(self.progress_frame,
+                                                     length=300)
+
+            # Places the progress bars and labels
+            self.gff3_label.pack()
+            self.gff3_bar.pack()
+            self.fasta_label.pack()
+            self.fasta_bar.pack()
 
             # Make Hello Button
             self.hello_button = tkinter.Button(self.hello_button_frame,
@@ -422,8 +3852,23 @@ class GUI:
             self.info_buttons_frame.pack()
             self.graph_buttons_frame.pack()
             self.css_buttons_frame.pack()
+            self.progress_frame.pack()
             self.quit_frame.pack()
 
+            # Uses the given results, and starts the worker thread for
+            # the results which are not given and the statistics
+            if feature_counts is not None:
+                self.set_feature_counts(feature_counts)
+            if consensus_check is not None:
+                self.set_consensus_check(consensus_check)
+            threading.Thread(target=self.analyse,
+                             args=(feature_counts is None,
+                                   consensus_check is None),
+                             daemon=True).start()
+            self.main_window.after(PROGRESS_INTERVAL,
+                                   self.check_progress)
+            setup.stop()
+
             # Makes the main window visible.
             tkinter.mainloop()
         except TypeError:
@@ -440,6 +3885,195 @@ class GUI:
             print("The tkinter-module could not be found in Class GUI "
                   "in the init()")
 
+    def set_feature_counts(self, feature_counts):
+        """ Converting the feature type table into a object, reading
+        the counts for the info buttons from it and enabling the buttons
+        which need them.
+
+        :param feature_counts: Counter with the frequency of every
+        feature type in the gff3 file.
+        :return: nothing
+        """
+        self.feature_counts = feature_counts
+        self.exons_count = feature_counts.get("exon", 0)
+        self.cds_count = feature_counts.get("CDS", 0)
+        self.mrna_count = feature_counts.get("mRNA", 0)
+        self.total_count = sum(feature_counts.values())
+        self.other_count = calculating_other(self.exons_count,
+                                             self.cds_count,
+                                             self.mrna_count,
+                                             self.total_count)
+        self.gff3_bar.config(mode="determinate", value=100)
+        self.gff3_bar.stop()
+        self.gff3_label.config(text="Gff3 file: ready, " +
+                               str(self.total_count) + " features")
+        for button in self.feature_buttons:
+            button.config(state="normal")
+
+    def set_consensus_check(self, consensus_check):
+        """ Transferring the zinc finger consensus list object and an
+        integer object which is the number of amino acid sequences
+        which do not contain the zinc finger consensus to this class
+        and enabling the buttons which need them.
+
+        :param consensus_check: a ConsensusCheck object.
+        :return: nothing
+        """
+        self.zfcs = consensus_check.get_consensus()
+        self.ncss = consensus_check.get_non_consensus()
+        self.zfct = len(self.zfcs)
+        self.fasta_bar.config(mode="determinate", value=100)
+        self.fasta_bar.stop()
+        self.fasta_label.config(text="Fasta file: ready, " +
+                                str(self.zfct + self.ncss) +
+                                " sequences")
+        for button in self.consensus_buttons:
+            button.config(state="normal")
+
+    def analyse(self, count_features, check_consensus):
+        """ Counts the feature types and checks the consensus in a
+        worker thread, both files at the same time when both are needed,
+        and then calculates the protein statistics. The thread does not
+        touch the window itself, it puts the progress and the results in
+        the progress queue.
+
+        :param count_features: True when the gff3 file has to be read.
+        :param check_consensus: True when the fasta file has to be read.
+        :return: nothing
+        """
+        progress = self.progress_queue
+        try:
+            if count_features and check_consensus:
+                progress.put(("gff3", 0, 0))
+                progress.put(("fasta", 0, 0))
+                consensus_check = load_genome(
+                    self.fasta_name, self.gff3_name, self.workers,
+                    lambda done, items: progress.put(("fasta", done,
+                                                      items)),
+                    lambda done, items: progress.put(("gff3", done,
+                                                      items)),
+                    lambda counts: progress.put(("gff3 ready",
+                                                 counts)))[1]
+                progress.put(("fasta ready", consensus_check))
+            else:
+                if count_features:
+                    progress.put(("gff3", 0, 0))
+                    feature_counts = cached_feature_counts(
+                        self.gff3_name, self.workers,
+                        lambda done, items: progress.put(("gff3", done,
+                                                          items)))
+                    progress.put(("gff3 ready", feature_counts))
+                if check_consensus:
+                    progress.put(("fasta", 0, 0))
+                    consensus_check = cached_consensus_check(
+                        self.fasta_name, self.workers,
+                        lambda done, items: progress.put(("fasta", done,
+                                                          items)))
+                    progress.put(("fasta ready", consensus_check))
+            store = SequenceStore.from_fasta(self.fasta_name)
+            progress.put(("statistics ready",
+                          sequence_statistics(store) if len(store)
+                          else None))
+        except (OSError, ValueError) as error:
+            progress.put(("error", str(error)))
+        finally:
+            progress.put(("done",))
+
+    def _file_size(self, filename):
+        """ Returns the size of an uncompressed input file, for the
+        progress bars.
+
+        :param filename: name of the file.
+        :return: the size in bytes, or None when the file is missing or
+        compressed, because then the size of the content is unknown.
+        """
+        try:
+            if is_compressed(filename):
+                return None
+            return os.path.getsize(filename)
+        except OSError:
+            return None
+
+    def _show_progress(self, bar, label, name, size, done, items,
+                       unit):
+        """ Shows how far the reading of one file is.
+
+        :param bar: the progress bar of the file.
+        :param label: the label of the file.
+        :param name: the name of the file in the label.
+        :param size: the size of the file, None when it is unknown.
+        :param done: the number of bytes read.
+        :param items: the number of lines or sequences read.
+        :param unit: the name of the items.
+        :return: nothing
+        """
+        text = name + ": %.1f MB read" % (done / 1e6)
+        if size:
+            bar.config(mode="determinate", value=min(100.0,
+                                                     100.0 * done / size))
+            text += " of %.1f MB" % (size / 1e6)
+        elif str(bar.cget("mode")) != "indeterminate":
+            bar.config(mode="indeterminate")
+            bar.start()
+        if items:
+            text += ", " + str(items) + " " + unit
+        label.config(text=text)
+
+    def check_progress(self):
+        """ Takes the messages of the worker thread out of the progress
+        queue and shows them in the window, and enables the buttons of
+        the results which are ready.
+
+        :return: nothing
+        """
+        try:
+            finished = False
+            while True:
+                try:
+                    message = self.progress_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if message[0] == "gff3" and \
+                        not hasattr(self, "feature_counts"):
+                    self._show_progress(self.gff3_bar, self.gff3_label,
+                                        "Gff3 file",
+                                        self._file_size(self.gff3_name),
+                                        message[1], message[2], "lines")
+                elif message[0] == "fasta" and \
+                        not hasattr(self, "zfcs"):
+                    self._show_progress(self.fasta_bar, self.fasta_label,
+                                        "Fasta file",
+                                        self._file_size(self.fasta_name),
+                                        message[1], message[2],
+                                        "sequences")
+                elif message[0] == "gff3 ready":
+                    if message[1] is None:
+                        self.gff3_label.config(text="The gff3 file could "
+                                                    "not be read.")
+                    else:
+                        self.set_feature_counts(message[1])
+                elif message[0] == "fasta ready":
+                    if message[1] is None:
+                        self.fasta_label.config(text="The fasta file "
+                                                     "could not be read.")
+                    else:
+                        self.set_consensus_check(message[1])
+                elif message[0] == "statistics ready":
+                    if message[1] is not None:
+                        self.statistics = message[1]
+                        self.statistics_button.config(state="normal")
+                elif message[0] == "error":
+                    self.intro_label.config(text="The analysis stopped: "
+                                                 + message[1])
+                elif message[0] == "done":
+                    finished = True
+            if not finished:
+                self.main_window.after(PROGRESS_INTERVAL,
+                                       self.check_progress)
+        except tkinter.TclError:
+            # The window was closed while the analysis was running
+            pass
+
     def exons(self):
         """ Shows the information over the exons sequences in a
         messagebox.
@@ -535,6 +4169,27 @@ class GUI:
             print("The tkinter messagebox-module could not be found in "
                   "Class GUI in the total()")
 
+    def feature_types(self):
+        """ Shows the frequency of every feature type in the gff3 file
+        in a messagebox.
+
+        :return: nothing
+        """
+        try:
+            lines = []
+            for feature_type, count in sorted(
+                    self.feature_counts.items(),
+                    key=lambda item: item[1], reverse=True):
+                lines.append(feature_type + ": " + str(count))
+            tkinter.messagebox.showinfo("All feature types Info",
+                                        "\n".join(lines))
+        except AttributeError:
+            print("There was an Attribute Error in Class GUI "
+                  "in feature_types()")
+        except ModuleNotFoundError:
+            print("The tkinter messagebox-module could not be found in "
+                  "Class GUI in the feature_types()")
+
     def consensus(self):
         """ Shows the information over the zinc finger consensus in a
         messagebox.
@@ -560,6 +4215,7 @@ class GUI:
         :return: nothing
         """
         try:
+            _import_pyplot()
             values = [self.exons_count, self.cds_count, self.mrna_count,
                       self.other_count]
             labels = ["Exon", "CDS", "mRNA", "Other"]
@@ -583,6 +4239,7 @@ class GUI:
         :return: nothing
         """
         try:
+            _import_pyplot()
             x = ["Exon", "CDS", "mRNA", "Other"]
             y = [self.exons_count, self.cds_count, self.mrna_count,
                  self.other_count]
@@ -606,6 +4263,7 @@ class GUI:
         :return: nothing
         """
         try:
+            _import_pyplot()
             x = ["Exons, CDS & mRNA sequences", "Other sequences"]
             e = [self.exons_count, 0]
             c = [self.cds_count, 0]
@@ -641,6 +4299,7 @@ class GUI:
         :return: nothing
         """
         try:
+            _import_pyplot()
             values = [self.zfct, self.ncss]
             labels = ["Zinc finger consensus sequences frequency",
                       "Non zinc finger consensus sequences frequency"]
@@ -657,6 +4316,36 @@ class GUI:
             print("The matplotlib-module could not be found in "
                   "Class GUI in the pie_diagram_css()")
 
+    def statistics_diagram(self):
+        """ Makes histograms of the length and of the cysteine and
+        histidine density of the proteins, from the statistics of the
+        worker thread.
+
+        :return: nothing
+        """
+        try:
+            _import_pyplot()
+            if self.statistics is None:
+                return
+            figure, (length_axes, density_axes) = plt.subplots(1, 2)
+            length_axes.hist(self.statistics["length"], bins=50,
+                             color="b")
+            length_axes.set_xlabel("Length of the protein")
+            length_axes.set_ylabel("Number of proteins")
+            density_axes.hist(self.statistics["ch_density"], bins=50,
+                              color="y")
+            density_axes.set_xlabel("Cysteines and histidines per 100 "
+                                    "amino acids")
+            density_axes.set_ylabel("Number of proteins")
+            figure.suptitle("The proteins of the C. Elegans")
+            plt.show()
+        except AttributeError:
+            print("There was an Attribute Error in Class GUI "
+                  "in statistics_diagram()")
+        except ModuleNotFoundError:
+            print("The matplotlib-module could not be found in "
+                  "Class GUI in the statistics_diagram()")
+
     def hello(self):
         """ Shows hello in the messagebox.
 
@@ -670,20 +4359,1381 @@ class GUI:
                   "Class GUI in the total()")
 
 
-def main():
-    fasta_list = read_fasta()
-    gff3_list = read_gff3()
-    headers = fasta_header(fasta_list)
-    d_seq = fasta_seq(fasta_list)
-    ConsensusCheck(headers, d_seq)
-    exon_count = counting_exons(gff3_list)
-    cds_count = counting_cds(gff3_list)
-    mrna_count = counting_mrna(gff3_list)
-    total_count = counting_total(gff3_list)
-    other_count = calculating_other(exon_count, cds_count, mrna_count,
-                                    total_count)
-    GUI(exon_count, cds_count, mrna_count, total_count,
-        other_count)
+def _synthetic_zinc_finger(rng):
+    """ Makes a random peptide which contains the zinc finger consensus.
+
+    :param rng: a random.Random object.
+    :return: the peptide as a string.
+    """
+    peptide = ""
+    for gap in (2, 2, 5, 2, 2, 0):
+        peptide += "C" + "".join(rng.choices(AMINO_ACIDS, k=gap))
+    return peptide
+
+
+def generate_synthetic_genome(directory, genes, seed=0,
+                              zinc_finger_rate=0.05, line_width=60):
+    """ Writes a reproducible synthetic proteome (fasta) and annotation
+    (gff3) in the style of the Ensembl files. Both files come from the
+    same gene models, so the proteins have the length of their CDS and
+    the headers point to the transcripts in the gff3 file. About one in
+    ten genes is a ncRNA gene, and about a third of the coding genes
+    has a second isoform which skips one exon.
+
+    :param directory: the directory to write the files in.
+    :param genes: the number of genes.
+    :param seed: the seed of the random generator, the same seed gives
+    the same files.
+    :param zinc_finger_rate: the part of the proteins which gets a zinc
+    finger consensus.
+    :param line_width: the number of amino acids per fasta line.
+    :return: tuple of the names of the fasta and the gff3 file.
+    """
+    rng = random.Random(seed)
+    fasta_name = os.path.join(directory, "synthetic.pep.all.fa")
+    gff3_name = os.path.join(directory, "synthetic.gff3")
+    positions = dict.fromkeys(CHROMOSOMES, 1000)
+    with open(fasta_name, "w") as fasta, open(gff3_name, "w") as gff3:
+        gff3.write("##gff-version 3\n")
+        for number in range(genes):
+            chromosome = rng.choice(CHROMOSOMES)
+            strand = rng.choice("+-")
+            gene_id = "WBGene%08d" % number
+            name = "syn-%d" % number
+            start = positions[chromosome]
+            if rng.random() < 0.1:
+                end = start + rng.randint(50, 500)
+                gff3.write("\t".join([
+                    chromosome, "synthetic", "ncRNA_gene", str(start),
+                    str(end), ".", strand, ".",
+                    "ID=gene:" + gene_id + ";Name=" + name +
+                    ";biotype=ncRNA"]) + "\n")
+                gff3.write("\t".join([
+                    chromosome, "synthetic", "ncRNA", str(start),
+                    str(end), ".", strand, ".",
+                    "ID=transcript:SYN" + str(number) + ".1;Parent=gene:"
+                    + gene_id + ";biotype=ncRNA"]) + "\n")
+                gff3.write("\t".join([
+                    chromosome, "synthetic", "exon", str(start),
+                    str(end), ".", strand, ".",
+                    "Parent=transcript:SYN" + str(number) + ".1"]) +
+                    "\n###\n")
+                positions[chromosome] = end + rng.randint(100, 5000)
+                continue
+
+            # The coding exons in transcription order, every exon a
+            # multiple of 3 long so isoforms keep the reading frame
+            exon_lengths = [rng.randint(20, 100) * 3
+                            for _ in range(rng.randint(2, 9))]
+            intron_lengths = [rng.randint(50, 2000)
+                              for _ in exon_lengths[1:]]
+            utr5 = rng.choice([0, 0, rng.randint(10, 200)])
+            utr3 = rng.choice([0, 0, rng.randint(10, 300)])
+            span = utr5 + sum(exon_lengths) + sum(intron_lengths) + utr3
+            end = start + span - 1
+            exons = []
+            cursor = utr5
+            for index, length in enumerate(exon_lengths):
+                exons.append((cursor, cursor + length - 1))
+                if index < len(intron_lengths):
+                    cursor += length + intron_lengths[index]
+
+            def genomic(first, last):
+                # Converts transcript positions to genome positions
+                if strand == "+":
+                    return start + first, start + last
+                return end - last, end - first
+
+            protein = "M" + "".join(rng.choices(
+                AMINO_ACIDS, k=sum(exon_lengths) // 3 - 2))
+            if rng.random() < zinc_finger_rate and len(protein) > 40:
+                motif = _synthetic_zinc_finger(rng)
+                at = rng.randint(1, len(protein) - len(motif))
+                protein = protein[:at] + motif + protein[at + len(motif):]
+            isoforms = [list(range(len(exons)))]
+            if len(exons) >= 3 and rng.random() < 0.33:
+                skipped = rng.randint(1, len(exons) - 2)
+                isoforms.append([index for index in range(len(exons))
+                                 if index != skipped])
+
+            gff3.write("\t".join([
+                chromosome, "synthetic", "gene", str(start), str(end),
+                ".", strand, ".", "ID=gene:" + gene_id + ";Name=" + name +
+                ";biotype=protein_coding"]) + "\n")
+            for isoform, exon_numbers in enumerate(isoforms, 1):
+                transcript_id = "SYN%d.%d" % (number, isoform)
+                gff3.write("\t".join([
+                    chromosome, "synthetic", "mRNA", str(start), str(end),
+                    ".", strand, ".", "ID=transcript:" + transcript_id +
+                    ";Parent=gene:" + gene_id +
+                    ";biotype=protein_coding"]) + "\n")
+                if utr5:
+                    first, last = genomic(0, utr5 - 1)
+                    gff3.write("\t".join([
+                        chromosome, "synthetic", "five_prime_UTR",
+                        str(first), str(last), ".", strand, ".",
+                        "Parent=transcript:" + transcript_id]) + "\n")
+                isoform_protein = ""
+                for rank, index in enumerate(exon_numbers, 1):
+                    exon_first, exon_last = exons[index]
+                    if index == 0:
+                        exon_first -= utr5
+                    if index == len(exons) - 1:
+                        exon_last += utr3
+                    first, last = genomic(exon_first, exon_last)
+                    gff3.write("\t".join([
+                        chromosome, "synthetic", "exon", str(first),
+                        str(last), ".", strand, ".",
+                        "Parent=transcript:" + transcript_id +
+                        ";Name=" + transcript_id + ".e" + str(rank) +
+                        ";rank=" + str(rank)]) + "\n")
+                    first, last = genomic(*exons[index])
+                    gff3.write("\t".join([
+                        chromosome, "synthetic", "CDS", str(first),
+                        str(last), ".", strand, "0",
+                        "ID=CDS:" + transcript_id + ";Parent=transcript:" +
+                        transcript_id + ";protein_id=" + transcript_id]) +
+                        "\n")
+                    # The amino acids of this exon, the last codon of
+                    # the last exon is the stop codon
+                    aa_first = sum(exon_lengths[:index]) // 3
+                    aa_last = aa_first + exon_lengths[index] // 3
+                    isoform_protein += protein[aa_first:aa_last]
+                if utr3:
+                    first, last = genomic(span - utr3, span - 1)
+                    gff3.write("\t".join([
+                        chromosome, "synthetic", "three_prime_UTR",
+                        str(first), str(last), ".", strand, ".",
+                        "Parent=transcript:" + transcript_id]) + "\n")
+                fasta.write(">" + transcript_id + " pep chromosome:"
+                            "synthetic:" + chromosome + ":" + str(start) +
+                            ":" + str(end) + ":" +
+                            ("1" if strand == "+" else "-1") + " gene:" +
+                            gene_id + " transcript:" + transcript_id +
+                            " gene_biotype:protein_coding"
+                            " transcript_biotype:protein_coding"
+                            " gene_symbol:" + name + "\n")
+                for position in range(0, len(isoform_protein),
+                                      line_width):
+                    fasta.write(isoform_protein[position:position +
+                                                line_width] + "\n")
+            gff3.write("###\n")
+            positions[chromosome] = end + rng.randint(100, 5000)
+    return fasta_name, gff3_name
+
+
+def _benchmark_stages(fasta_name, gff3_name):
+    """ Returns the stages of the benchmark. Every stage has a setup,
+    which is not measured, and a run, which gets the result of the
+    setup and returns the number of items it handled.
+
+    :param fasta_name: name of the fasta file.
+    :param gff3_name: name of the gff3 file.
+    :return: list of (name, setup, run) tuples.
+    """
+
+    def fasta_lists():
+        fasta_list = read_fasta(fasta_name)
+        return fasta_header(fasta_list), fasta_seq(fasta_list)
+
+    return [
+        ("read_fasta", lambda: None,
+         lambda _: len(read_fasta(fasta_name))),
+        ("fasta_header", lambda: read_fasta(fasta_name),
+         lambda fasta_list: len(fasta_header(fasta_list))),
+        ("fasta_seq", lambda: read_fasta(fasta_name),
+         lambda fasta_list: len(fasta_seq(fasta_list))),
+        ("iter_fasta", lambda: None,
+         lambda _: sum(1 for _ in iter_fasta(fasta_name))),
+        ("SequenceStore.from_fasta", lambda: None,
+         lambda _: len(SequenceStore.from_fasta(fasta_name))),
+        ("ConsensusCheck", fasta_lists,
+         lambda lists: len(ConsensusCheck(*lists).get_headers())),
+        ("ConsensusCheck.from_records", lambda: None,
+         lambda _: len(ConsensusCheck.from_records(
+             iter_fasta(fasta_name)).get_headers())),
+        ("ConsensusCheck.from_store",
+         lambda: SequenceStore.from_fasta(fasta_name),
+         lambda store: len(ConsensusCheck.from_store(
+             store).get_headers())),
+        ("MotifScanner.count",
+         lambda: SequenceStore.from_fasta(fasta_name),
+         lambda store: sum(MotifScanner().count(
+             (record.header, str(record)) for record in store).values())),
+        ("read_gff3", lambda: None,
+         lambda _: len(read_gff3(gff3_name))),
+        ("counting_exons", lambda: read_gff3(gff3_name), counting_exons),
+        ("counting_cds", lambda: read_gff3(gff3_name), counting_cds),
+        ("counting_mrna", lambda: read_gff3(gff3_name), counting_mrna),
+        ("counting_total", lambda: read_gff3(gff3_name), counting_total),
+        ("count_feature_types", lambda: None,
+         lambda _: sum(count_feature_types(gff3_name).values())),
+        ("count_feature_types_parallel", lambda: None,
+         lambda _: sum(count_feature_types_parallel(
+             gff3_name).values())),
+    ]
+
+
+def run_benchmark(scale="tiny", genes=None, seed=0, repeat=3,
+                  directory=None, stages=None):
+    """ Generates a synthetic genome and measures the time and the peak
+    memory of every stage of the analysis on it. The time is the best
+    of the repeats, the peak memory is measured in an extra run with
+    tracemalloc, because tracemalloc slows the code down. Only memory
+    which the run itself allocates is counted, not the setup.
+
+    :param scale: one of the BENCHMARK_SCALES.
+    :param genes: the number of genes, overrides the scale.
+    :param seed: the seed of the synthetic genome.
+    :param repeat: the number of timed runs of every stage.
+    :param directory: the directory for the synthetic files, default is
+    a temporary directory which is removed afterwards.
+    :param stages: list of stage names to run, default is all stages.
+    :return: dictionary with the settings and a list of results per
+    stage, which can be written as JSON.
+    """
+    if genes is None:
+        genes = BENCHMARK_SCALES[scale]
+    temporary = directory is None
+    if temporary:
+        directory = tempfile.mkdtemp(prefix="benchmark-")
+    try:
+        started = time.perf_counter()
+        fasta_name, gff3_name = generate_synthetic_genome(directory,
+                                                          genes, seed)
+        results = {"version": VERSION,
+                   "python": platform.python_version(),
+                   "platform": platform.platform(),
+                   "cpus": os.cpu_count(),
+                   "scale": scale,
+                   "genes": genes,
+                   "seed": seed,
+                   "fasta_bytes": os.path.getsize(fasta_name),
+                   "gff3_bytes": os.path.getsize(gff3_name),
+                   "generate_seconds": time.perf_counter() - started,
+                   "stages": []}
+        for name, setup, run in _benchmark_stages(fasta_name, gff3_name):
+            if stages is not None and name not in stages:
+                continue
+            data = setup()
+            seconds = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                items = run(data)
+                seconds.append(time.perf_counter() - started)
+            tracemalloc.start()
+            try:
+                run(data)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            results["stages"].append({"stage": name,
+                                      "seconds": min(seconds),
+                                      "peak_bytes": peak,
+                                      "items": items})
+            del data
+        return results
+    finally:
+        if temporary:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def compare_benchmarks(old_results, new_results, tolerance=1.2):
+    """ Compares two benchmark results, like two versions of this
+    program on the same scale, and returns the stages which got slower.
+
+    :param old_results: benchmark results of the old version.
+    :param new_results: benchmark results of the new version.
+    :param tolerance: how many times slower a stage may get before it
+    counts as a regression.
+    :return: list of (stage, old seconds, new seconds) tuples of the
+    stages which got slower than the tolerance.
+    """
+    old_seconds = {stage["stage"]: stage["seconds"]
+                   for stage in old_results["stages"]}
+    regressions = []
+    for stage in new_results["stages"]:
+        old = old_seconds.get(stage["stage"])
+        if old and stage["seconds"] > old * tolerance:
+            regressions.append((stage["stage"], old, stage["seconds"]))
+    return regressions
+
+
+def print_benchmark(results):
+    """ Prints the benchmark results as a table.
+
+    :param results: benchmark results from run_benchmark().
+    :return: nothing
+    """
+    print("Benchmark of version " + results["version"] + ", " +
+          str(results["genes"]) + " genes (" + results["scale"] + "), " +
+          str(results["fasta_bytes"]) + " fasta bytes, " +
+          str(results["gff3_bytes"]) + " gff3 bytes")
+    for stage in results["stages"]:
+        print("%-30s %10.4f s %12d bytes %10d items"
+              % (stage["stage"], stage["seconds"], stage["peak_bytes"],
+                 stage["items"]))
+
+
+def analysis_summary(feature_counts, consensus_check):
+    """ Puts the results of the analysis in one dictionary, which can be
+    written as JSON.
+
+    :param feature_counts: Counter with the frequency of every feature
+    type in the gff3 file.
+    :param consensus_check: a ConsensusCheck object.
+    :return: dictionary with the feature counts and consensus results.
+    """
+    exon_count = feature_counts.get("exon", 0)
+    cds_count = feature_counts.get("CDS", 0)
+    mrna_count = feature_counts.get("mRNA", 0)
+    total_count = sum(feature_counts.values())
+    consensus = []
+    for header, css in zip(consensus_check.get_consensus_headers(),
+                           consensus_check.get_consensus()):
+        consensus.append({"id": header.split(None, 1)[0],
+                          "consensus": css,
+                          "header": header})
+    return {"feature_counts": dict(feature_counts),
+            "exon_count": exon_count,
+            "cds_count": cds_count,
+            "mrna_count": mrna_count,
+            "total_count": total_count,
+            "other_count": calculating_other(exon_count, cds_count,
+                                             mrna_count, total_count),
+            "consensus_count": len(consensus),
+            "non_consensus_count": consensus_check.get_non_consensus(),
+            "consensus": consensus}
+
+
+@instrumented("write_results", len)
+def write_results(summary, output_dir=".", output_format="both"):
+    """ Writes the results of the analysis as JSON and/or TSV files:
+    summary.json, feature_counts.tsv and consensus.tsv.
+
+    :param summary: dictionary from analysis_summary().
+    :param output_dir: the directory to write the files in.
+    :param output_format: "json", "tsv" or "both".
+    :return: list of the names of the written files.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    if output_format in ("json", "both"):
+        name = os.path.join(output_dir, "summary.json")
+        with open(name, "w") as output:
+            json.dump(summary, output, indent=2)
+        written.append(name)
+    if output_format in ("tsv", "both"):
+        name = os.path.join(output_dir, "feature_counts.tsv")
+        with open(name, "w") as output:
+            output.write("feature_type\tcount\n")
+            for feature_type, count in sorted(
+                    summary["feature_counts"].items(),
+                    key=lambda item: item[1], reverse=True):
+                output.write(feature_type + "\t" + str(count) + "\n")
+        written.append(name)
+        name = os.path.join(output_dir, "consensus.tsv")
+        with open(name, "w") as output:
+            output.write("id\tconsensus\theader\n")
+            for hit in summary["consensus"]:
+                output.write(hit["id"] + "\t" + hit["consensus"] + "\t" +
+                             hit["header"] + "\n")
+        written.append(name)
+    return written
+
+
+def run_headless(fasta_name=FASTA_FILE, gff3_name=GFF3_FILE,
+                 output_dir=".", output_format="both", workers=None):
+    """ Runs the whole analysis without the GUI and writes the results
+    to files, for computers without a display. tkinter and matplotlib
+    are not imported.
+
+    :param fasta_name: name of the fasta file.
+    :param gff3_name: name of the gff3 file.
+    :param output_dir: the directory to write the files in.
+    :param output_format: "json", "tsv" or "both".
+    :param workers: the number of worker processes, default is the
+    number of CPUs.
+    :return: list of the names of the written files, or None when an
+    input file is missing.
+    """
+    feature_counts, consensus_check = load_genome(fasta_name, gff3_name,
+                                                  workers)
+    if feature_counts is None or consensus_check is None:
+        return None
+    return write_results(analysis_summary(feature_counts,
+                                          consensus_check),
+                         output_dir, output_format)
+
+
+def _block_lines(handle, start, end):
+    """ Reads the lines of a file which start in a byte range, so every
+    line of the file belongs to exactly one range. The last line may end
+    after the range.
+
+    :param handle: the file opened in binary mode.
+    :param start: the first byte of the range.
+    :param end: the byte after the range.
+    :return: list of (offset, line) tuples.
+    """
+    handle.seek(max(start - 1, 0))
+    if start > 0 and handle.read(1) != b"\n":
+        # The line which started before the range
+        handle.readline()
+    position = handle.tell()
+    lines = []
+    while position < end:
+        line = handle.readline()
+        if not line:
+            break
+        lines.append((position, line))
+        position += len(line)
+    return lines
+
+
+def _block_records(handle, start, end):
+    """ Reads the fasta records whose header starts in a byte range, the
+    sequence of the last record is read on after the range.
+
+    :param handle: the fasta file opened in binary mode.
+    :param start: the first byte of the range.
+    :param end: the byte after the range.
+    :return: list of amino acid sequences as bytes.
+    """
+    sequences = []
+    t_seq = None
+    for _, line in _block_lines(handle, start, end):
+        if line.startswith(b">"):
+            if t_seq is not None:
+                sequences.append(b"".join(t_seq))
+            t_seq = []
+        elif t_seq is not None:
+            t_seq.append(line.strip())
+    if t_seq is not None:
+        for line in handle:
+            if line.startswith(b">"):
+                break
+            t_seq.append(line.strip())
+        sequences.append(b"".join(t_seq))
+    return sequences
+
+
+def _interval(estimate, variance):
+    """ Makes a confidence interval of SAMPLE_Z standard errors.
+
+    :param estimate: the estimated value.
+    :param variance: the variance of the estimate, None when it can not
+    be estimated yet.
+    :return: dictionary with "estimate", "low" and "high".
+    """
+    if variance is None:
+        return {"estimate": estimate, "low": None, "high": None}
+    margin = SAMPLE_Z * max(variance, 0.0) ** 0.5
+    return {"estimate": estimate, "low": max(estimate - margin, 0.0),
+            "high": estimate + margin}
+
+
+def _cluster_total(values, blocks):
+    """ Estimates the total of a value over all blocks of a file from
+    the values of randomly chosen blocks, with the variance for
+    sampling without replacement.
+
+    :param values: list of the value in every sampled block.
+    :param blocks: the number of blocks in the file.
+    :return: dictionary from _interval().
+    """
+    sampled = len(values)
+    mean = sum(values) / sampled
+    if sampled < 2:
+        return _interval(blocks * mean, None)
+    spread = sum((value - mean) ** 2 for value in values) / (sampled - 1)
+    return _interval(blocks * mean, blocks ** 2 *
+                     (1 - sampled / blocks) * spread / sampled)
+
+
+def _sample_points(blocks, first=SAMPLE_REPORT_BLOCKS):
+    """ Returns after how many blocks an estimate is given, every time
+    twice as many blocks as the last time, and at the end.
+
+    :param blocks: the number of blocks in the file.
+    :param first: the number of blocks of the first estimate.
+    :return: set of numbers of blocks.
+    """
+    points = {blocks}
+    point = first
+    while point < blocks:
+        points.add(point)
+        point *= 2
+    return points
+
+
+def _reservoir(items, size, rng):
+    """ Keeps a uniform random sample of a stream of unknown length
+    (reservoir sampling).
+
+    :param items: iterable of items.
+    :param size: the number of items of the sample.
+    :param rng: a random.Random object.
+    :return: tuple of the list of sampled items and the number of items
+    in the stream.
+    """
+    sample = []
+    seen = 0
+    for seen, item in enumerate(items, 1):
+        if seen <= size:
+            sample.append(item)
+        else:
+            place = rng.randrange(seen)
+            if place < size:
+                sample[place] = item
+    return sample, seen
+
+
+def _proportion(count, sampled, seen):
+    """ Estimates the fraction of a kind of item in a stream from its
+    count in a reservoir sample.
+
+    :param count: the number of items of the kind in the sample.
+    :param sampled: the size of the sample, at least 1.
+    :param seen: the number of items in the stream.
+    :return: tuple of the fraction and its variance.
+    """
+    proportion = count / sampled
+    return proportion, proportion * (1 - proportion) / sampled * \
+        (1 - sampled / seen)
+
+
+def sample_feature_counts(filename=GFF3_FILE, block_size=SAMPLE_BLOCK_SIZE,
+                          seed=0, reservoir_size=SAMPLE_RESERVOIR_SIZE):
+    """ Estimates the feature counts of a gff3 file from random blocks of
+    the file, and gives a better estimate every time twice as many
+    blocks are read, until the whole file is read and the counts are
+    exact. A compressed file can not be read at random places, from it
+    a reservoir sample of the lines is counted.
+
+    :param filename: name of the gff3 file.
+    :param block_size: the size of the blocks in bytes.
+    :param seed: the seed of the random order of the blocks.
+    :param reservoir_size: the number of lines of the reservoir sample
+    of a compressed file.
+    :return: generator of dictionaries with the fraction of the file
+    which was read and an estimate with confidence interval per feature
+    type.
+    """
+    rng = random.Random(seed)
+    try:
+        if is_compressed(filename):
+            with open_input(filename) as gff3:
+                lines, seen = _reservoir(
+                    (line for line in gff3 if not line.startswith("#")),
+                    reservoir_size, rng)
+            estimates = {}
+            for feature_type, count in \
+                    tally_feature_types(lines).most_common():
+                proportion, variance = _proportion(count, len(lines),
+                                                   seen)
+                estimates[feature_type] = _interval(seen * proportion,
+                                                    seen ** 2 * variance)
+            yield {"fraction": 1.0,
+                   "sampled_lines": len(lines),
+                   "estimates": estimates}
+            return
+        size = os.path.getsize(filename)
+        blocks = max(1, -(-size // block_size))
+        order = list(range(blocks))
+        rng.shuffle(order)
+        points = _sample_points(blocks)
+        per_block = []
+        with open(filename, "rb") as gff3:
+            for number, block in enumerate(order, 1):
+                lines = _block_lines(gff3, block * block_size,
+                                     (block + 1) * block_size)
+                per_block.append(tally_feature_types(
+                    line.decode() for _, line in lines))
+                if number not in points:
+                    continue
+                feature_types = collections.Counter()
+                for counts in per_block:
+                    feature_types.update(counts)
+                yield {"fraction": number / blocks,
+                       "blocks": number,
+                       "total_blocks": blocks,
+                       "estimates": {feature_type: _cluster_total(
+                           [counts[feature_type] for counts in per_block],
+                           blocks)
+                           for feature_type, _
+                           in feature_types.most_common()}}
+    except FileNotFoundError:
+        print("The gff3 file was not found in sample_feature_counts().")
+
+
+def sample_consensus(filename=FASTA_FILE, block_size=SAMPLE_BLOCK_SIZE,
+                     seed=0, reservoir_size=SAMPLE_RESERVOIR_SIZE):
+    """ Estimates the number of proteins and the fraction of proteins
+    with the zinc finger consensus from random blocks of the fasta file,
+    and gives a better estimate every time twice as many blocks are
+    read. The fraction is a ratio estimate over the blocks. From a
+    compressed file a reservoir sample of the records is scanned.
+
+    :param filename: name of the fasta file.
+    :param block_size: the size of the blocks in bytes.
+    :param seed: the seed of the random order of the blocks.
+    :param reservoir_size: the number of records of the reservoir sample
+    of a compressed file.
+    :return: generator of dictionaries with the fraction of the file
+    which was read and estimates with confidence intervals of
+    "proteins", "zinc_finger_proteins" and "zinc_finger_fraction".
+    """
+    rng = random.Random(seed)
+    try:
+        if is_compressed(filename):
+            sample, seen = _reservoir(
+                (aa_seq for _, aa_seq in iter_fasta(filename)),
+                reservoir_size, rng)
+            cssl, _, _ = _scan_consensus_batch(sample)
+            proportion, variance = 0.0, 0.0
+            if sample:
+                proportion, variance = _proportion(len(cssl), len(sample),
+                                                   seen)
+            yield {"fraction": 1.0,
+                   "sampled_proteins": len(sample),
+                   "proteins": _interval(seen, 0.0),
+                   "zinc_finger_proteins": _interval(seen * proportion,
+                                                     seen ** 2 * variance),
+                   "zinc_finger_fraction": _interval(proportion,
+                                                     variance)}
+            return
+        size = os.path.getsize(filename)
+        blocks = max(1, -(-size // block_size))
+        order = list(range(blocks))
+        rng.shuffle(order)
+        points = _sample_points(blocks)
+        proteins = []
+        found = []
+        with open(filename, "rb") as fasta:
+            for number, block in enumerate(order, 1):
+                sequences = _block_records(fasta, block * block_size,
+                                           (block + 1) * block_size)
+                cssl, _, _ = _scan_consensus_batch(sequences)
+                proteins.append(len(sequences))
+                found.append(len(cssl))
+                if number not in points:
+                    continue
+                fraction = sum(found) / sum(proteins) if sum(proteins) \
+                    else 0.0
+                variance = None
+                if number > 1 and sum(proteins):
+                    mean = sum(proteins) / number
+                    spread = sum((hits - fraction * count) ** 2
+                                 for hits, count
+                                 in zip(found, proteins)) / (number - 1)
+                    variance = (1 - number / blocks) * spread / \
+                        (number * mean ** 2)
+                yield {"fraction": number / blocks,
+                       "blocks": number,
+                       "total_blocks": blocks,
+                       "proteins": _cluster_total(proteins, blocks),
+                       "zinc_finger_proteins": _cluster_total(found,
+                                                              blocks),
+                       "zinc_finger_fraction": _interval(fraction,
+                                                         variance)}
+    except FileNotFoundError:
+        print("The fasta file was not found in sample_consensus().")
+
+
+def _format_interval(interval, percent=False):
+    """ Writes an estimate with its confidence interval as text.
+
+    :param interval: dictionary from _interval().
+    :param percent: True to write a fraction as a percentage.
+    :return: the text, like "1200 (1150-1250)".
+    """
+    form = "%.2f%%" if percent else "%.0f"
+    scale = 100 if percent else 1
+    text = form % (interval["estimate"] * scale)
+    if interval["low"] is not None:
+        text += " (" + form % (interval["low"] * scale) + " - " + \
+            form % (interval["high"] * scale) + ")"
+    return text
+
+
+class GenomeServer:
+    """Keeps the parsed fasta and gff3 file in memory and answers
+    queries about them over a Unix socket or a localhost TCP port, so a
+    question does not have to read the files again. Every request is
+    one line of JSON like {"query": "protein", "id": "T19C3.1.1"} and
+    gets one line of JSON back with "ok" and "result" or "error".
+
+    """
+
+    def __init__(self, fasta_name=FASTA_FILE, gff3_name=GFF3_FILE,
+                 workers=None):
+        """ Reads each file once, the feature counts are taken from the
+        interval index and the consensus is scanned in the store.
+
+        :param fasta_name: name of the fasta file.
+        :param gff3_name: name of the gff3 file.
+        :param workers: the number of worker processes for the scan,
+        default is the number of CPUs.
+        """
+        self.store = SequenceStore.from_fasta(fasta_name)
+        self.interval_index = FeatureIntervalIndex.from_gff3(gff3_name)
+        self.feature_counts = None
+        self.consensus_check = None
+        if os.path.exists(gff3_name):
+            self.feature_counts = self.interval_index.count_types()
+        if os.path.exists(fasta_name):
+            memo = ScanMemo.load(fasta_name)
+            self.consensus_check = ConsensusCheck.from_store(
+                self.store, workers or os.cpu_count() or 1, memo)
+            memo.save(fasta_name)
+        self.proteins = {}
+        for number, header in enumerate(self.store.headers):
+            fields = parse_header(header)
+            self.proteins[fields.get("id")] = number
+            if "transcript" in fields:
+                self.proteins.setdefault(fields["transcript"], number)
+        self.consensus = {}
+        if self.consensus_check is not None:
+            self.consensus = dict(zip(
+                self.consensus_check.consensus_index,
+                self.consensus_check.get_consensus()))
+        self.queries = {"ping": self.query_ping,
+                        "counts": self.query_counts,
+                        "summary": self.query_summary,
+                        "consensus": self.query_consensus,
+                        "protein": self.query_protein,
+                        "region": self.query_region}
+        self.served = 0
+
+    def is_loaded(self):
+        """ Checks if both files could be read.
+
+        :return: True when the files are loaded, otherwise False.
+        """
+        return self.feature_counts is not None and \
+            self.consensus_check is not None
+
+    def query_ping(self, request):
+        """ Answers {"query": "ping"}, to check if the server is up.
+
+        :param request: dictionary with the request.
+        :return: "pong"
+        """
+        return "pong"
+
+    def query_counts(self, request):
+        """ Answers {"query": "counts"} with the feature type table.
+
+        :param request: dictionary with the request.
+        :return: dictionary with the frequency of every feature type.
+        """
+        return dict(self.feature_counts)
+
+    def query_summary(self, request):
+        """ Answers {"query": "summary"} with the analysis_summary()
+        without the list of consensus hits.
+
+        :param request: dictionary with the request.
+        :return: dictionary with the counts of the analysis.
+        """
+        summary = analysis_summary(self.feature_counts,
+                                   self.consensus_check)
+        del summary["consensus"]
+        return summary
+
+    def query_consensus(self, request):
+        """ Answers {"query": "consensus", "limit": 10} with the
+        proteins with the zinc finger consensus.
+
+        :param request: dictionary with the request, "limit" is the
+        highest number of proteins, default is all.
+        :return: list of dictionaries with the id and the consensus.
+        """
+        limit = request.get("limit")
+        hits = []
+        for number, css in self.consensus.items():
+            if limit is not None and len(hits) >= limit:
+                break
+            hits.append({"id": self.store.headers[number].split(
+                None, 1)[0], "consensus": css})
+        return hits
+
+    def query_protein(self, request):
+        """ Answers {"query": "protein", "id": "T19C3.1.1"} with one
+        protein, found by its id or transcript.
+
+        :param request: dictionary with the request.
+        :return: dictionary with the id, header, sequence and found
+        consensus of the protein.
+        """
+        number = self.proteins.get(request.get("id"))
+        if number is None:
+            raise KeyError("The protein " + str(request.get("id")) +
+                           " is not in the fasta file.")
+        record = self.store[number]
+        return {"id": record.id,
+                "header": record.header,
+                "sequence": str(record),
+                "consensus": self.consensus.get(number)}
+
+    def query_region(self, request):
+        """ Answers {"query": "region", "region": "III:1-50000"} with
+        the feature counts of a region, and the features themselves
+        when "features" is true.
+
+        :param request: dictionary with the request.
+        :return: dictionary with the counts and maybe the features.
+        """
+        if "region" not in request:
+            raise ValueError("The request has no \"region\" key, like "
+                             "\"III:1-50000\".")
+        if not isinstance(request["region"], str):
+            raise TypeError("The region must be a string like "
+                            "seqid:start-end.")
+        seqid, start, end = parse_region(request["region"])
+        result = {"counts": dict(self.interval_index.count_by_type(
+            seqid, start, end))}
+        if request.get("features"):
+            result["features"] = [
+                feature._asdict()
+                for feature in self.interval_index.query(seqid, start,
+                                                         end)]
+        return result
+
+    def answer(self, request):
+        """ Answers one request.
+
+        :param request: dictionary with the "query" and its options.
+        :return: dictionary with "ok" and "result" or "error".
+        """
+        self.served += 1
+        query = self.queries.get(request.get("query"))
+        if query is None:
+            return {"ok": False,
+                    "error": "Unknown query, known are " +
+                             ", ".join(self.queries) + "."}
+        try:
+            return {"ok": True, "result": query(request)}
+        except KeyError as error:
+            return {"ok": False, "error": str(error).strip("'\"")}
+        except (ValueError, TypeError) as error:
+            return {"ok": False, "error": str(error)}
+        except Exception as error:
+            # Any other fault of one request must not close the
+            # connection of the client
+            return {"ok": False, "error": "The query failed with " +
+                                          type(error).__name__ + ": " +
+                                          str(error)}
+
+    async def handle(self, reader, writer):
+        """ Answers the requests of one connection, one line of JSON
+        per request, until the client closes the connection.
+
+        :param reader: the asyncio.StreamReader of the connection.
+        :param writer: the asyncio.StreamWriter of the connection.
+        :return: nothing
+        """
+        import asyncio
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("no object")
+                    response = self.answer(request)
+                except ValueError:
+                    response = {"ok": False,
+                                "error": "The request is not a JSON "
+                                         "object."}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            # The client left, or the server stops with the connection
+            # still open
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path=None, host="127.0.0.1",
+                    port=SERVER_PORT, started=None):
+        """ Serves the queries until the task is cancelled or the
+        process gets SIGTERM.
+
+        :param socket_path: name of a Unix socket, default is TCP.
+        :param host: the host of the TCP port.
+        :param port: the TCP port.
+        :param started: function which is called when the server
+        listens.
+        :return: nothing
+        """
+        # asyncio is only imported by the server, it makes the start of
+        # every other run slower
+        import asyncio
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            server = await asyncio.start_unix_server(self.handle,
+                                                     socket_path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        try:
+            # SIGTERM closes the server, not on Windows and not when the
+            # server runs in a thread
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM,
+                                                          server.close)
+        except (NotImplementedError, AttributeError, RuntimeError):
+            pass
+        try:
+            async with server:
+                if started is not None:
+                    started()
+                await server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if socket_path is not None and os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+    def run(self, socket_path=None, host="127.0.0.1", port=SERVER_PORT):
+        """ Serves the queries until the program is stopped with
+        Ctrl+C.
+
+        :param socket_path: name of a Unix socket, default is TCP.
+        :param host: the host of the TCP port.
+        :param port: the TCP port.
+        :return: nothing
+        """
+        import asyncio
+        where = socket_path or host + ":" + str(port)
+        try:
+            asyncio.run(self.serve(socket_path, host, port,
+                                   lambda: print("Listening on " + where)))
+        except KeyboardInterrupt:
+            pass
+        print("Stopped after " + str(self.served) + " queries")
+
+
+def query_server(request, socket_path=None, host="127.0.0.1",
+                 port=SERVER_PORT):
+    """ Sends one request to a running GenomeServer.
+
+    :param request: dictionary with the "query" and its options.
+    :param socket_path: name of the Unix socket, default is TCP.
+    :param host: the host of the TCP port.
+    :param port: the TCP port.
+    :return: the response as a dictionary, with "ok" false when the
+    server closed the connection without an answer.
+    """
+    if socket_path is not None:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(socket_path)
+    else:
+        connection = socket.create_connection((host, port))
+    with connection, connection.makefile("rwb") as stream:
+        stream.write(json.dumps(request).encode() + b"\n")
+        stream.flush()
+        line = stream.readline()
+    if not line:
+        return {"ok": False,
+                "error": "The server closed the connection without an "
+                         "answer."}
+    return json.loads(line)
+
+
+def read_manifest(filename):
+    """ Reads a manifest of genomes: a TSV file with the name, the fasta
+    file and the gff3 file of one genome per line. Empty lines, lines
+    starting with "#" and a header line starting with "name" are
+    skipped. Relative file names are relative to the manifest.
+
+    :param filename: name of the manifest.
+    :return: list of (name, fasta file, gff3 file) tuples.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    genomes = []
+    with open(filename, "r") as manifest:
+        for number, line in enumerate(manifest, 1):
+            if not line.strip() or line.startswith("#"):
+                continue
+            columns = line.rstrip("\r\n").split("\t")
+            if number == 1 and columns[0].lower() == "name":
+                continue
+            if len(columns) < 3:
+                raise ValueError("Line " + str(number) + " of the "
+                                 "manifest does not have a name, a fasta "
+                                 "and a gff3 file.")
+            genomes.append((columns[0],
+                            os.path.join(directory, columns[1]),
+                            os.path.join(directory, columns[2])))
+    return genomes
+
+
+def _analyse_genome(name, fasta_name, gff3_name):
+    """ Analyses one genome of the batch in a worker process, with the
+    parse cache.
+
+    :param name: the name of the genome.
+    :param fasta_name: name of the fasta file.
+    :param gff3_name: name of the gff3 file.
+    :return: dictionary with the results of the genome.
+    """
+    row = {"genome": name, "fasta": fasta_name, "gff3": gff3_name}
+    feature_counts = cached_feature_counts(gff3_name, 1)
+    consensus_check = cached_consensus_check(fasta_name, 1)
+    if feature_counts is None or consensus_check is None:
+        row["error"] = "file not found"
+        return row
+    proteins = len(consensus_check.get_headers())
+    zinc_fingers = len(consensus_check.get_consensus())
+    row.update({"proteins": proteins,
+                "zinc_finger_proteins": zinc_fingers,
+                "zinc_finger_frequency":
+                    zinc_fingers / proteins if proteins else 0.0,
+                "feature_counts": dict(feature_counts)})
+    return row
+
+
+def run_batch(genomes, workers=None, in_flight=None, progress=None):
+    """ Analyses many genomes at the same time in a process pool, one
+    genome per worker process. At most in_flight genomes are submitted
+    at once, so the memory of the waiting genomes is never used before
+    a worker is free.
+
+    :param genomes: list of (name, fasta file, gff3 file) tuples, like
+    from read_manifest().
+    :param workers: the number of worker processes, default is the
+    number of CPUs.
+    :param in_flight: the highest number of genomes which are analysed
+    or waiting at the same time, default is the number of workers.
+    :param progress: function which is called with the result of every
+    finished genome.
+    :return: list of dictionaries with the results of every genome, in
+    the order of the genomes.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if in_flight is None:
+        in_flight = workers
+    if in_flight < 1:
+        raise ValueError("At least one genome must be in flight.")
+    rows = [None] * len(genomes)
+    waiting = iter(enumerate(genomes))
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        pending = {}
+        while True:
+            for number, genome in itertools.islice(
+                    waiting, in_flight - len(pending)):
+                pending[pool.submit(_analyse_genome, *genome)] = number
+            if not pending:
+                break
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                number = pending.pop(future)
+                if future.exception() is not None:
+                    name, fasta_name, gff3_name = genomes[number]
+                    rows[number] = {"genome": name, "fasta": fasta_name,
+                                    "gff3": gff3_name,
+                                    "error": repr(future.exception())}
+                else:
+                    rows[number] = future.result()
+                if progress is not None:
+                    progress(rows[number])
+    return rows
+
+
+def write_comparison(rows, filename):
+    """ Writes the results of the batch as one TSV table with a line per
+    genome. Every feature type of any genome gets a column, genomes
+    without that feature type get 0.
+
+    :param rows: list of dictionaries from run_batch().
+    :param filename: name of the TSV file.
+    :return: nothing
+    """
+    totals = collections.Counter()
+    for row in rows:
+        totals.update(row.get("feature_counts", {}))
+    feature_types = [feature_type
+                     for feature_type, _ in totals.most_common()]
+    with open(filename, "w") as output:
+        output.write("\t".join(["genome", "proteins",
+                                "zinc_finger_proteins",
+                                "zinc_finger_frequency"] +
+                               feature_types + ["error"]) + "\n")
+        for row in rows:
+            if "error" in row:
+                output.write(row["genome"] + "\t" * (
+                    len(feature_types) + 3) + "\t" + row["error"] + "\n")
+                continue
+            values = [row["genome"], str(row["proteins"]),
+                      str(row["zinc_finger_proteins"]),
+                      "%.6f" % row["zinc_finger_frequency"]]
+            values += [str(row["feature_counts"].get(feature_type, 0))
+                       for feature_type in feature_types]
+            output.write("\t".join(values) + "\t\n")
+
+
+def parse_arguments(argv=None):
+    """ Reads the command line options.
+
+    :param argv: list of command line arguments, default is sys.argv.
+    :return: argparse.Namespace with the options.
+    """
+    parser = argparse.ArgumentParser(
+        description="Information over the C. Elegans sequences.")
+    parser.add_argument("--fasta", default=FASTA_FILE,
+                        help="the fasta file, may be gzip or bgzip")
+    parser.add_argument("--gff3", default=GFF3_FILE,
+                        help="the gff3 file, may be gzip or bgzip")
+    parser.add_argument("--workers", type=int,
+                        help="number of worker processes, default is the "
+                             "number of CPUs")
+    parser.add_argument("--headless", action="store_true",
+                        help="write the results to files instead of "
+                             "showing the GUI")
+    parser.add_argument("--output-dir", default=".",
+                        help="directory for the files of --headless")
+    parser.add_argument("--format", choices=["json", "tsv", "both"],
+                        default="both",
+                        help="file format of --headless")
+    parser.add_argument("--region", metavar="SEQID:START-END",
+                        help="print the feature counts of a region of the "
+                             "gff3 file instead of showing the GUI")
+    parser.add_argument("--gene-table", metavar="FILE",
+                        help="write the exons, CDS length and motif hits "
+                             "per gene as TSV instead of showing the GUI")
+    parser.add_argument("--statistics", metavar="FILE",
+                        help="write the length and composition of every "
+                             "protein as TSV instead of showing the GUI")
+    parser.add_argument("--lengths", metavar="TYPE",
+                        help="print the length distribution of a feature "
+                             "type from the columns of the gff3 file")
+    parser.add_argument("--manifest", metavar="FILE",
+                        help="analyse every genome of a TSV file with a "
+                             "name, fasta and gff3 file per line")
+    parser.add_argument("--in-flight", type=int,
+                        help="highest number of genomes of --manifest in "
+                             "memory at once, default is --workers")
+    parser.add_argument("--comparison", metavar="FILE",
+                        default="comparison.tsv",
+                        help="the table of --manifest")
+    parser.add_argument("--pssm-hits", metavar="FILE",
+                        help="write the zinc finger windows which score "
+                             "at least --pssm-threshold as TSV")
+    parser.add_argument("--pssm-threshold", type=float,
+                        default=PSSM_THRESHOLD,
+                        help="lowest score of --pssm-hits, 5 allows one "
+                             "substitution")
+    parser.add_argument("--kmers", metavar="FILE",
+                        help="write the peptide k-mer spectra as TSV")
+    parser.add_argument("--k", default="2,3,4,5",
+                        help="comma separated lengths of --kmers")
+    parser.add_argument("--top", type=int,
+                        help="only write the most frequent k-mers of "
+                             "every length")
+    parser.add_argument("--serve", action="store_true",
+                        help="keep the files in memory and answer "
+                             "queries instead of showing the GUI")
+    parser.add_argument("--query", metavar="JSON",
+                        help="send a query like '{\"query\": \"counts\"}' "
+                             "to a running --serve")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="Unix socket of --serve and --query, default "
+                             "is a localhost TCP port")
+    parser.add_argument("--port", type=int, default=SERVER_PORT,
+                        help="TCP port of --serve and --query")
+    parser.add_argument("--sample", type=float, metavar="FRACTION",
+                        help="estimate the counts from random blocks of "
+                             "the files, refining until this fraction "
+                             "is read")
+    parser.add_argument("--motif-bed", metavar="FILE",
+                        help="write the genomic positions of the motif "
+                             "hits as BED12")
+    parser.add_argument("--motif-gff3", metavar="FILE",
+                        help="write the genomic positions of the motif "
+                             "hits as gff3")
+    parser.add_argument("--benchmark", metavar="SCALE",
+                        choices=list(BENCHMARK_SCALES),
+                        help="run the benchmark on a synthetic genome of "
+                             "this scale instead of the GUI")
+    parser.add_argument("--genes", type=int,
+                        help="number of genes of the synthetic genome")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the synthetic genome")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of timed runs of every stage")
+    parser.add_argument("--benchmark-output", metavar="FILE",
+                        help="write the benchmark results as JSON")
+    parser.add_argument("--compare", metavar="FILE",
+                        help="compare the benchmark with earlier JSON "
+                             "results")
+    parser.add_argument("--instrument", metavar="FILE",
+                        help="write the time, memory and items of every "
+                             "stage as JSON")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write the stages as a Chrome trace file")
+    parser.add_argument("--profile-stage", metavar="STAGE",
+                        help="run this stage with cProfile, for "
+                             "--instrument")
+    parser.add_argument("--memory-stage", metavar="STAGE",
+                        help="run this stage with tracemalloc, for "
+                             "--instrument")
+    args = parser.parse_args(argv)
+    if args.in_flight is not None and args.in_flight < 1:
+        parser.error("--in-flight must be at least 1")
+    try:
+        args.k = [int(k) for k in args.k.split(",")]
+    except ValueError:
+        parser.error("--k must be comma separated numbers, like 2,3")
+    if min(args.k) < 1 or max(args.k) > KMER_MAX_K:
+        parser.error("--k must be from 1 to " + str(KMER_MAX_K))
+    if args.sample is not None and not 0 < args.sample <= 1:
+        parser.error("--sample must be more than 0 and at most 1")
+    return args
+
+
+def run_command(args):
+    """ Runs what the command line options ask for.
+
+    :param args: argparse.Namespace from parse_arguments().
+    :return: nothing
+    """
+    if args.benchmark:
+        results = run_benchmark(args.benchmark, args.genes, args.seed,
+                                args.repeat)
+        print_benchmark(results)
+        if args.benchmark_output:
+            with open(args.benchmark_output, "w") as output:
+                json.dump(results, output, indent=2)
+        if args.compare:
+            with open(args.compare, "r") as old:
+                for stage, old_seconds, new_seconds in \
+                        compare_benchmarks(json.load(old), results):
+                    print("Regression in " + stage + ": " +
+                          "%.4f s -> %.4f s" % (old_seconds, new_seconds))
+        return
+    if args.region:
+        seqid, start, end = parse_region(args.region)
+        index = FeatureIntervalIndex.from_gff3(args.gff3)
+        for feature_type, count in index.count_by_type(seqid, start,
+                                                       end).most_common():
+            print(feature_type + "\t" + str(count))
+        return
+    if args.motif_bed or args.motif_gff3:
+        transcripts = parse_cds_segments(args.gff3)
+        hits = None
+        if transcripts is not None:
+            hits = map_motif_hits(SequenceStore.from_fasta(args.fasta),
+                                  transcripts)
+        if hits is not None:
+            for name, write in ((args.motif_bed, write_motif_bed),
+                                (args.motif_gff3, write_motif_gff3)):
+                if name:
+                    write(hits, name)
+                    print("Written " + name)
+        return
+    if args.gene_table:
+        gene_models = parse_gene_models(args.gff3)
+        proteins = protein_motif_hits(args.fasta)
+        if gene_models is not None and proteins is not None:
+            write_gene_table(gene_table(gene_models, proteins),
+                             args.gene_table)
+            print("Written " + args.gene_table)
+        return
+    if args.query:
+        print(json.dumps(query_server(json.loads(args.query), args.socket,
+                                      port=args.port), indent=2))
+        return
+    if args.serve:
+        server = GenomeServer(args.fasta, args.gff3, args.workers)
+        if server.is_loaded():
+            server.run(args.socket, port=args.port)
+        return
+    if args.sample is not None:
+        for estimate in sample_feature_counts(args.gff3, seed=args.seed):
+            print("gff3 %.1f%%: " % (estimate["fraction"] * 100) +
+                  ", ".join(feature_type + " " + _format_interval(interval)
+                            for feature_type, interval
+                            in estimate["estimates"].items()))
+            if estimate["fraction"] >= args.sample:
+                break
+        for estimate in sample_consensus(args.fasta, seed=args.seed):
+            print("fasta %.1f%%: " % (estimate["fraction"] * 100) +
+                  "proteins " + _format_interval(estimate["proteins"]) +
+                  ", zinc finger " + _format_interval(
+                      estimate["zinc_finger_fraction"], True))
+            if estimate["fraction"] >= args.sample:
+                break
+        return
+    if args.manifest:
+        rows = run_batch(read_manifest(args.manifest), args.workers,
+                         args.in_flight,
+                         lambda row: print("Done " + row["genome"]))
+        write_comparison(rows, args.comparison)
+        print("Written " + args.comparison)
+        return
+    if args.pssm_hits:
+        store = SequenceStore.from_fasta(args.fasta)
+        hits = scan_pssm(store, threshold=args.pssm_threshold)
+        if hits is not None:
+            with open(args.pssm_hits, "w") as output:
+                output.write("id\tstart\tscore\tpeptide\n")
+                for hit in hits:
+                    output.write("%s\t%d\t%g\t%s\n" % (
+                        store.headers[hit.record].split(None, 1)[0],
+                        hit.start + 1, hit.score, hit.peptide))
+            print("Written " + args.pssm_hits)
+        return
+    if args.kmers:
+        spectrum = count_kmers(SequenceStore.from_fasta(args.fasta),
+                               args.k,
+                               args.workers or os.cpu_count() or 1)
+        if spectrum is not None:
+            spectrum.write(args.kmers, args.top)
+            print("Written " + args.kmers)
+        return
+    if args.lengths:
+        columns = Gff3Columns.cached(args.gff3)
+        if columns is not None:
+            with columns:
+                print(json.dumps(columns.length_distribution(args.lengths),
+                                 indent=2))
+        return
+    if args.statistics:
+        table = sequence_statistics(SequenceStore.from_fasta(args.fasta))
+        if table is not None:
+            write_statistics(table, args.statistics)
+            print("Written " + args.statistics)
+        return
+    if args.headless:
+        written = run_headless(args.fasta, args.gff3, args.output_dir,
+                               args.format, args.workers)
+        for name in written or []:
+            print("Written " + name)
+        return
+    GUI(fasta_name=args.fasta, gff3_name=args.gff3,
+        workers=args.workers or os.cpu_count() or 1)
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    if args.instrument or args.trace:
+        enable_instrumentation(args.profile_stage, args.memory_stage)
+    try:
+        run_command(args)
+    finally:
+        instrumentation = disable_instrumentation()
+        if instrumentation is not None:
+            if args.instrument:
+                instrumentation.write_report(args.instrument)
+            if args.trace:
+                instrumentation.write_trace(args.trace)
 
 
-main()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,623 @@
+# Tests of Blok 2 Praktijktoets - Frank Lochtenberg.py
+# Run with: python -m pytest -q
+
+import collections
+import os
+import pickle
+import random
+import subprocess
+import sys
+
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      "Blok 2 Praktijktoets - Frank Lochtenberg.py")
+
+
+@pytest.fixture(scope="session")
+def blok(tmp_path_factory):
+    """ Imports the script as the module praktijktoets. The name of the
+    script has spaces, so a small module which runs the script is put
+    on the path; worker processes which are started with spawn or
+    forkserver import it by that name too.
+    """
+    directory = tmp_path_factory.mktemp("module")
+    with open(directory / "praktijktoets.py", "w") as module:
+        module.write("exec(compile(open(%r).read(), %r, 'exec'))\n"
+                     % (SCRIPT, SCRIPT))
+    sys.path.insert(0, str(directory))
+    import praktijktoets
+    return praktijktoets
+
+
+@pytest.fixture(scope="session")
+def genome(blok, tmp_path_factory):
+    """ A synthetic genome of 300 genes, as (fasta file, gff3 file). """
+    return blok.generate_synthetic_genome(
+        str(tmp_path_factory.mktemp("genome")), 300, seed=0)
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(monkeypatch, tmp_path):
+    """ Runs every test in its own directory, so the parse cache of one
+    test is never used by another.
+    """
+    monkeypatch.chdir(tmp_path)
+
+
+def gff3_features(filename):
+    """ Reads the features of a gff3 file the slow way.
+
+    :param filename: name of the gff3 file.
+    :return: list of (seqid, start, end, type) tuples.
+    """
+    features = []
+    with open(filename) as gff3:
+        for line in gff3:
+            columns = line.rstrip("\n").split("\t")
+            if line.startswith("#") or len(columns) < 9:
+                continue
+            features.append((columns[0], int(columns[3]), int(columns[4]),
+                             columns[2]))
+    return features
+
+
+def random_regions(index, number=200, seed=0):
+    """ Makes random regions of up to 50 kb on the seqids of an index.
+
+    :param index: a FeatureIntervalIndex.
+    :param number: the number of regions.
+    :param seed: the seed of the random regions.
+    :return: list of (seqid, start, end) tuples.
+    """
+    rng = random.Random(seed)
+    regions = []
+    for _ in range(number):
+        seqid = rng.choice(sorted(index.get_seqids()))
+        start = rng.randint(1, index.get_length(seqid))
+        regions.append((seqid, start, start + rng.randint(0, 50000)))
+    return regions
+
+
+def overlapping(features, seqid, start, end):
+    return sorted((first, last, feature_type)
+                  for name, first, last, feature_type in features
+                  if name == seqid and first <= end and last >= start)
+
+
+def test_interval_counts_match_scan(blok, genome):
+    features = gff3_features(genome[1])
+    index = blok.FeatureIntervalIndex.from_gff3(genome[1])
+    for seqid, start, end in random_regions(index):
+        expected = collections.Counter(
+            feature[2] for feature in overlapping(features, seqid, start,
+                                                  end))
+        assert index.count_by_type(seqid, start, end) == expected
+
+
+def test_interval_query_matches_scan(blok, genome):
+    features = gff3_features(genome[1])
+    index = blok.FeatureIntervalIndex.from_gff3(genome[1])
+    for seqid, start, end in random_regions(index):
+        assert sorted((feature.start, feature.end, feature.type)
+                      for feature in index.query(seqid, start, end)) == \
+            overlapping(features, seqid, start, end)
+
+
+def window_scores(proteins, rows):
+    """ Scores every window of every protein with a scoring matrix in
+    plain Python.
+
+    :param proteins: list of amino acid sequences.
+    :param rows: the scoring matrix as a list of rows.
+    :return: dictionary with (protein, start) as key and the score as
+    value.
+    """
+    amino_acids = "ACDEFGHIKLMNPQRSTVWY"
+    scores = {}
+    for record, aa_seq in enumerate(proteins):
+        for start in range(len(aa_seq) - len(rows) + 1):
+            scores[record, start] = sum(
+                row[amino_acids.find(aa_seq[start + position])]
+                for position, row in enumerate(rows))
+    return scores
+
+
+def assert_pssm_matches(blok, store, pssm, threshold):
+    found = {(hit.record, hit.start): hit.score
+             for hit in blok.scan_pssm(store, pssm, threshold)}
+    proteins = [str(record) for record in store]
+    for window, score in window_scores(proteins, pssm.tolist()).items():
+        # Windows on the threshold may differ by rounding
+        if abs(score - threshold) < 1e-3:
+            continue
+        assert (score >= threshold) == (window in found), window
+        if window in found:
+            assert found[window] == pytest.approx(score, abs=1e-3)
+
+
+def test_pssm_consensus_matches_window_scores(blok, genome):
+    pytest.importorskip("numpy")
+    store = blok.SequenceStore.from_fasta(genome[0])
+    assert_pssm_matches(blok, store, blok.pssm_from_consensus(),
+                        blok.PSSM_THRESHOLD)
+
+
+def test_pssm_float_matrix_matches_window_scores(blok, genome):
+    numpy = pytest.importorskip("numpy")
+    rng = random.Random(0)
+    pssm = numpy.array([[rng.uniform(-1, 2) for _ in range(21)]
+                        for _ in range(4)], dtype=numpy.float32)
+    assert_pssm_matches(blok, blok.SequenceStore.from_fasta(genome[0]),
+                        pssm, 5.0)
+
+
+def test_pssm_threshold_6_equals_regex(blok, genome):
+    pytest.importorskip("numpy")
+    store = blok.SequenceStore.from_fasta(genome[0])
+    regex = blok.re.compile("(?=" + blok.ZINC_FINGER_PATTERN.pattern + ")")
+    expected = {(record, found.start())
+                for record, aa_seq in enumerate(map(str, store))
+                for found in regex.finditer(aa_seq)}
+    assert expected
+    assert {(hit.record, hit.start)
+            for hit in blok.scan_pssm(store, threshold=6)} == expected
+
+
+def kmer_counter(proteins, k):
+    """ Counts the k-mers of the 20 amino acids with a Counter. """
+    return collections.Counter(
+        aa_seq[start:start + k]
+        for aa_seq in proteins
+        for start in range(len(aa_seq) - k + 1)
+        if all(amino_acid in "ACDEFGHIKLMNPQRSTVWY"
+               for amino_acid in aa_seq[start:start + k]))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_kmer_spectrum_matches_counter(blok, genome, workers):
+    pytest.importorskip("numpy")
+    store = blok.SequenceStore.from_fasta(genome[0])
+    proteins = [str(record) for record in store]
+    spectrum = blok.count_kmers(store, (1, 2, 3, 5), workers)
+    for k in (1, 2, 3, 5):
+        expected = kmer_counter(proteins, k)
+        assert dict(spectrum.spectrum(k)) == expected
+        assert spectrum.total(k) == sum(expected.values())
+
+
+def test_kmer_lengths_are_checked(blok, genome):
+    pytest.importorskip("numpy")
+    store = blok.SequenceStore.from_fasta(genome[0])
+    with pytest.raises(ValueError):
+        blok.count_kmers(store, (blok.KMER_MAX_K + 1,))
+
+
+@pytest.mark.parametrize("k", ["0", "7", "2,x", ""])
+def test_kmer_lengths_are_checked_on_the_command_line(blok, k):
+    with pytest.raises(SystemExit):
+        blok.parse_arguments(["--kmers", "kmers.tsv", "--k", k])
+    assert blok.parse_arguments(["--k", "3,2"]).k == [3, 2]
+
+
+def gzip_copy(filename, tmp_path):
+    """ Writes a gzip copy of a file and returns its name. """
+    import gzip
+    import shutil
+    name = str(tmp_path / (os.path.basename(filename) + ".gz"))
+    with open(filename, "rb") as source, gzip.open(name, "wb") as target:
+        shutil.copyfileobj(source, target)
+    return name
+
+
+def assert_exact(interval, exact):
+    for key in ("estimate", "low", "high"):
+        assert interval[key] == pytest.approx(exact), key
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_full_sample_of_gff3_is_exact(blok, genome, tmp_path, compressed):
+    filename = gzip_copy(genome[1], tmp_path) if compressed else genome[1]
+    expected = collections.Counter(
+        feature[3] for feature in gff3_features(genome[1]))
+    last = list(blok.sample_feature_counts(filename, 4096, seed=1))[-1]
+    assert last["fraction"] == 1.0
+    assert set(last["estimates"]) == set(expected)
+    for feature_type, count in expected.items():
+        assert_exact(last["estimates"][feature_type], count)
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_full_sample_of_fasta_is_exact(blok, genome, tmp_path, compressed):
+    filename = gzip_copy(genome[0], tmp_path) if compressed else genome[0]
+    proteins = [aa_seq for _, aa_seq in blok.iter_fasta(genome[0])]
+    zinc_fingers = sum(1 for aa_seq in proteins
+                       if blok.ZINC_FINGER_PATTERN.search(aa_seq))
+    last = list(blok.sample_consensus(filename, 4096, seed=1))[-1]
+    assert last["fraction"] == 1.0
+    assert_exact(last["proteins"], len(proteins))
+    assert_exact(last["zinc_finger_proteins"], zinc_fingers)
+    assert_exact(last["zinc_finger_fraction"], zinc_fingers / len(proteins))
+
+
+@pytest.mark.parametrize("fraction", ["0", "-0.5", "1.5", "nan"])
+def test_sample_fraction_is_checked(blok, fraction):
+    with pytest.raises(SystemExit):
+        blok.parse_arguments(["--sample", fraction])
+    assert blok.parse_arguments(["--sample", "1"]).sample == 1
+
+
+def cds_positions(transcript):
+    """ Walks the CDS of a transcript one nucleotide at a time, in the
+    order of translation, from the first complete codon.
+    """
+    positions = []
+    for start, end in transcript["segments"]:
+        if transcript["strand"] == "-":
+            positions.extend(range(end, start - 1, -1))
+        else:
+            positions.extend(range(start, end + 1))
+    return positions[transcript["phase"]:]
+
+
+def test_motif_blocks_match_cds_walk(blok, genome):
+    pytest.importorskip("numpy")
+    store = blok.SequenceStore.from_fasta(genome[0])
+    transcripts = blok.parse_cds_segments(genome[1])
+    hits = blok.map_motif_hits(store, transcripts)
+    proteins = {record.id: record.fields for record in store}
+    # The synthetic genome has hits on both strands and over introns
+    assert {hit.strand for hit in hits} == {"+", "-"}
+    assert any(len(hit.blocks) > 1 for hit in hits)
+    for hit in hits:
+        fields = proteins[hit.protein]
+        positions = cds_positions(
+            transcripts[fields.get("transcript", fields.get("id"))])
+        assert [position for start, end in hit.blocks
+                for position in range(start, end + 1)] == \
+            sorted(positions[3 * hit.start:3 * hit.end])
+
+
+def test_motif_bed_blocks(blok, genome, tmp_path):
+    pytest.importorskip("numpy")
+    hits = blok.map_motif_hits(blok.SequenceStore.from_fasta(genome[0]),
+                               blok.parse_cds_segments(genome[1]))
+    blok.write_motif_bed(hits, str(tmp_path / "hits.bed"))
+    with open(tmp_path / "hits.bed") as bed:
+        lines = [line.rstrip("\n").split("\t") for line in bed]
+    assert len(lines) == len(hits)
+    for columns, hit in zip(lines, hits):
+        sizes = [int(size) for size in columns[10].rstrip(",").split(",")]
+        starts = [int(start) for start in columns[11].rstrip(",").split(",")]
+        assert sum(sizes) == 3 * (hit.end - hit.start)
+        assert [(int(columns[1]) + start + 1,
+                 int(columns[1]) + start + size)
+                for start, size in zip(starts, sizes)] == hit.blocks
+
+
+def test_motif_mapping_with_instrumentation(blok, genome):
+    pytest.importorskip("numpy")
+    blok.enable_instrumentation()
+    try:
+        transcripts = blok.parse_cds_segments(genome[1])
+        hits = blok.map_motif_hits(
+            blok.SequenceStore.from_fasta(genome[0]), transcripts)
+    finally:
+        report = blok.disable_instrumentation().report()
+    items = {stage["stage"]: stage["items"] for stage in report["stages"]}
+    assert items["parse_cds_segments"] == len(transcripts)
+    assert items["map_motif_hits"] == len(hits)
+
+
+class CountingList(list):
+    """ A list which counts how often an item is read. """
+
+    reads = 0
+
+    def __getitem__(self, item):
+        CountingList.reads += 1
+        return list.__getitem__(self, item)
+
+
+def test_interval_query_with_chromosome_rows(blok, genome, tmp_path):
+    # Ensembl gff3 files have a chromosome feature over every seqid
+    features = gff3_features(genome[1])
+    name = str(tmp_path / "chromosomes.gff3")
+    with open(name, "w") as gff3, open(genome[1]) as original:
+        for seqid in sorted({feature[0] for feature in features}):
+            end = max(feature[2] for feature in features
+                      if feature[0] == seqid) + 1000
+            gff3.write("%s\tEnsembl\tchromosome\t1\t%d\t.\t.\t.\t"
+                       "ID=chromosome:%s\n" % (seqid, end, seqid))
+            features.append((seqid, 1, end, "chromosome"))
+        gff3.write(original.read())
+    index = blok.FeatureIntervalIndex.from_gff3(name)
+    for seqid, start, end in random_regions(index):
+        assert sorted((feature.start, feature.end, feature.type)
+                      for feature in index.query(seqid, start, end)) == \
+            overlapping(features, seqid, start, end)
+    # A 1 kb query only looks at the features near the region
+    data = index.seqids["III"]
+    data["ends"] = CountingList(data["ends"])
+    CountingList.reads = 0
+    found = index.query("III", 100000, 101000)
+    assert CountingList.reads <= len(found) + 50
+    assert len(data["ends"]) > 500
+
+
+def test_fasta_index_fetch_equals_records(blok, genome, tmp_path):
+    index = blok.FastaIndex(genome[0], str(tmp_path / "genome.fai"))
+    records = list(blok.iter_fasta(genome[0]))
+    assert len(index) == len(records)
+    for header, aa_seq in records:
+        assert index.fetch(header.split(None, 1)[0]) == aa_seq
+        assert index.fetch(header.split(None, 1)[0], 55, 130) == \
+            aa_seq[55:130]
+
+
+def test_fasta_index_rejects_empty_line_in_record(blok, tmp_path):
+    name = str(tmp_path / "empty_line.fa")
+    with open(name, "w") as fasta:
+        fasta.write(">a\nACDEF\nGHIKL\n\nMNP\n")
+    with pytest.raises(ValueError):
+        blok.build_fasta_index(name)
+
+
+def test_fasta_index_allows_empty_line_after_record(blok, tmp_path):
+    name = str(tmp_path / "empty_end.fa")
+    with open(name, "w") as fasta:
+        fasta.write(">a\nACDEF\nGHIKL\nMNP\n\n>b\nWY\n\n")
+    index = blok.FastaIndex(name)
+    assert index.fetch("a") == "ACDEFGHIKLMNP"
+    assert index.fetch("b") == "WY"
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_parallel_counts_equal_serial_counts(blok, genome, monkeypatch,
+                                             workers):
+    monkeypatch.setattr(blok, "PARALLEL_MIN_SIZE", 0)
+    progress = []
+    counts = blok.count_feature_types_parallel(
+        genome[1], workers, lambda done, lines: progress.append(
+            (done, lines)))
+    assert counts == blok.count_feature_types(genome[1])
+    with open(genome[1], "rb") as gff3:
+        assert progress[-1] == (os.path.getsize(genome[1]),
+                                sum(1 for _ in gff3))
+
+
+# The empty block at the end of every BGZF file
+BGZF_EOF = bytes.fromhex("1f8b08040000000000ff0600424302001b00030000000000"
+                         "00000000")
+
+
+def bgzip(source, target, block_size=4096):
+    """ Writes a BGZF copy of a file, with small blocks so the file has
+    many of them.
+    """
+    import struct
+    import zlib
+    with open(source, "rb") as plain:
+        data = plain.read()
+    with open(target, "wb") as output:
+        for start in range(0, len(data), block_size):
+            chunk = data[start:start + block_size]
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+            deflated = compressor.compress(chunk) + compressor.flush()
+            output.write(b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff" +
+                         struct.pack("<H", 6) + b"BC" +
+                         struct.pack("<HH", 2, len(deflated) + 25) +
+                         deflated +
+                         struct.pack("<II", zlib.crc32(chunk), len(chunk)))
+        output.write(BGZF_EOF)
+    return target
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_bgzf_round_trip(blok, genome, tmp_path, workers):
+    name = bgzip(genome[1], str(tmp_path / "genome.gff3.bgz"))
+    assert blok.is_compressed(name)
+    with open(genome[1], "rb") as plain:
+        data = plain.read()
+    assert b"".join(blok.iter_bgzf_chunks(name, workers)) == data
+    with blok.open_input(name, "rb", workers) as bgzf:
+        assert bgzf.read() == data
+
+
+def test_compressed_inputs_give_the_same_counts(blok, genome, tmp_path):
+    expected = blok.count_feature_types(genome[1])
+    for name in (bgzip(genome[1], str(tmp_path / "genome.gff3.bgz")),
+                 gzip_copy(genome[1], tmp_path)):
+        assert blok.count_feature_types(name) == expected
+    name = bgzip(genome[0], str(tmp_path / "genome.fa.bgz"))
+    assert list(blok.iter_fasta(name)) == list(blok.iter_fasta(genome[0]))
+
+
+def test_broken_bgzf_is_rejected(blok, genome, tmp_path):
+    name = bgzip(genome[1], str(tmp_path / "genome.gff3.bgz"))
+    with open(name, "rb") as bgzf:
+        data = bgzf.read()
+    # Garbage after the first block, where the next block must start
+    first = int.from_bytes(data[16:18], "little") + 1
+    with open(name, "wb") as bgzf:
+        bgzf.write(data[:first] + b"garbage" + data[first:])
+    with pytest.raises(ValueError):
+        b"".join(blok.iter_bgzf_chunks(name))
+
+
+def test_memo_scans_every_unique_sequence_once(blok, genome):
+    proteins = [aa_seq for _, aa_seq in blok.iter_fasta(genome[0])]
+    unique = len(set(proteins))
+    expected = blok.scan_consensus(proteins * 2)
+    memo = blok.ScanMemo()
+    assert blok.scan_consensus_memoized(proteins * 2, memo) == expected
+    assert (memo.hits, memo.misses, len(memo)) == (0, unique, unique)
+    # A second run finds every sequence in the memo
+    assert blok.scan_consensus_memoized(proteins * 2, memo) == expected
+    assert (memo.hits, memo.misses) == (unique, unique)
+
+
+def test_memo_forgets_least_recently_used(blok):
+    memo = blok.ScanMemo(max_size=2)
+    first, second, third = (blok.sequence_digest(aa_seq)
+                            for aa_seq in ("ACD", "EFG", "HIK"))
+    memo.put(first, None)
+    memo.put(second, "CxxC")
+    assert memo.get(first) is None
+    memo.put(third, None)
+    assert first in memo and third in memo
+    assert second not in memo
+
+
+def test_memo_is_saved_per_fasta_file(blok, genome, tmp_path):
+    memo = blok.ScanMemo()
+    blok.scan_consensus_memoized(
+        (aa_seq for _, aa_seq in blok.iter_fasta(genome[0])), memo)
+    memo.save(genome[0])
+    loaded = blok.ScanMemo.load(genome[0])
+    assert list(loaded.results.items()) == list(memo.results.items())
+    assert len(blok.ScanMemo.load(str(tmp_path / "other.fa"))) == 0
+
+
+def test_parse_cache_round_trip(blok, genome):
+    check = blok.cached_consensus_check(genome[0])
+    data = blok.load_cached(genome[0], "fasta")
+    assert data["headers"] == check.get_headers()
+    assert data["consensus"] == check.get_consensus()
+    offsets = [offset for offset, _, _ in
+               blok.iter_fasta_offsets(genome[0])]
+    assert data["offsets"].typecode == "Q"
+    assert data["offsets"].tolist() == offsets
+    cached = blok.cached_consensus_check(genome[0])
+    assert cached.get_consensus() == check.get_consensus()
+    assert cached.get_non_consensus() == check.get_non_consensus()
+
+
+class Planted:
+    """ Makes a directory when it is unpickled. """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return os.mkdir, (self.path,)
+
+
+def test_parse_cache_never_unpickles(blok, genome, tmp_path):
+    os.makedirs(blok.CACHE_DIR, exist_ok=True)
+    marker = str(tmp_path / "unpickled")
+    for kind in ("fasta", "scan-memo"):
+        with open(blok._cache_path(genome[0], kind), "wb") as cache:
+            cache.write(pickle.dumps(Planted(marker)))
+    assert blok.load_cached(genome[0], "fasta") is None
+    assert len(blok.ScanMemo.load(genome[0])) == 0
+    assert not os.path.exists(marker)
+
+
+def test_load_genome_from_a_thread(blok, genome, monkeypatch):
+    # Like the worker thread of the GUI, with the parallel paths
+    monkeypatch.setattr(blok, "PARALLEL_MIN_SIZE", 0)
+    results = []
+    progress = []
+    thread = blok.threading.Thread(target=lambda: results.append(
+        blok.load_genome(genome[0], genome[1], 4,
+                         gff3_progress=lambda *done: progress.append(done))))
+    thread.start()
+    thread.join(120)
+    feature_counts, consensus_check = results[0]
+    assert feature_counts == blok.count_feature_types(genome[1])
+    assert consensus_check.get_consensus() == blok.scan_consensus(
+        aa_seq for _, aa_seq in blok.iter_fasta(genome[0]))[0]
+    assert progress
+
+
+def test_gui_worker_calculates_the_statistics(blok, genome):
+    pytest.importorskip("numpy")
+    # The worker thread of the GUI only uses the queue, not the window
+    gui = blok.GUI.__new__(blok.GUI)
+    gui.fasta_name, gui.gff3_name = genome
+    gui.workers = 1
+    gui.progress_queue = blok.queue.Queue()
+    gui.analyse(False, False)
+    messages = {}
+    while not gui.progress_queue.empty():
+        message = gui.progress_queue.get()
+        messages[message[0]] = message[1:]
+    assert "done" in messages
+    statistics = messages["statistics ready"][0]
+    assert list(statistics["length"]) == [
+        len(aa_seq) for _, aa_seq in blok.iter_fasta(genome[0])]
+
+
+@pytest.fixture
+def server(blok, genome):
+    return blok.GenomeServer(genome[0], genome[1], workers=1)
+
+
+def test_server_answers(blok, genome, server):
+    assert server.is_loaded()
+    assert server.answer({"query": "ping"}) == {"ok": True,
+                                                "result": "pong"}
+    assert server.answer({"query": "counts"})["result"] == \
+        blok.count_feature_types(genome[1])
+    consensus = blok.cached_consensus_check(genome[0])
+    assert server.consensus_check.get_consensus() == \
+        consensus.get_consensus()
+    header, aa_seq = next(blok.iter_fasta(genome[0]))
+    protein = server.answer({"query": "protein",
+                             "id": header.split()[0]})["result"]
+    assert (protein["header"], protein["sequence"]) == (header, aa_seq)
+    index = blok.FeatureIntervalIndex.from_gff3(genome[1])
+    seqid = index.get_seqids()[0]
+    assert server.answer({"query": "region",
+                          "region": seqid + ":1-50000"})["result"] == \
+        {"counts": index.count_by_type(seqid, 1, 50000)}
+
+
+def test_server_rejects_bad_requests(server):
+    for request in ({"query": "nothing"},
+                    {"query": "region", "region": 3},
+                    {"query": "region", "region": "III"},
+                    {"query": "protein", "id": "none"}):
+        response = server.answer(request)
+        assert not response["ok"] and response["error"]
+    response = server.answer({"query": "region"})
+    assert not response["ok"] and '"region"' in response["error"]
+
+
+def test_server_keeps_the_connection_open(blok, server, tmp_path):
+    import asyncio
+    path = str(tmp_path / "genome.sock")
+    ready = blok.threading.Event()
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(server.serve(path, started=ready.set))
+    thread = blok.threading.Thread(target=loop.run_until_complete,
+                                   args=(task,))
+    thread.start()
+    try:
+        assert ready.wait(30)
+        connection = blok.socket.socket(blok.socket.AF_UNIX)
+        connection.connect(path)
+        with connection, connection.makefile("rwb") as stream:
+            stream.write(b"not json\n[1]\n{\"query\": \"ping\"}\n")
+            stream.flush()
+            answers = [blok.json.loads(stream.readline())
+                       for _ in range(3)]
+        assert [answer["ok"] for answer in answers] == [False, False, True]
+        assert blok.query_server({"query": "ping"}, path)["result"] == \
+            "pong"
+    finally:
+        loop.call_soon_threadsafe(task.cancel)
+        thread.join(30)
+        loop.close()
+    assert not os.path.exists(path)
+
+
+def test_headless_start_does_not_import_asyncio(blok):
+    directory = os.path.dirname(blok.__file__)
+    imported = subprocess.run(
+        [sys.executable, "-c",
+         "import sys; sys.path.insert(0, %r); import praktijktoets; "
+         "print('asyncio' in sys.modules)" % directory],
+        capture_output=True, text=True, check=True).stdout
+    assert imported.strip() == "False"